@@ -1,13 +1,17 @@
 from .asset_admin import AssetAdmin
+from .asset_dividend_event_admin import AssetDividendEventAdmin
 from .asset_dividend_snapshot_admin import AssetDividendSnapshotAdmin
 from .asset_market_data_admin import AssetMarketDataAdmin
 from .asset_price_admin import AssetPriceAdmin
+from .asset_price_bar_admin import AssetPriceBarAdmin
 from .asset_type_admin import AssetTypeAdmin
 
 __all__ = [
     "AssetAdmin",
+    "AssetDividendEventAdmin",
     "AssetDividendSnapshotAdmin",
     "AssetMarketDataAdmin",
     "AssetPriceAdmin",
+    "AssetPriceBarAdmin",
     "AssetTypeAdmin",
 ]
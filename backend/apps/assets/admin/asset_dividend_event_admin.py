@@ -0,0 +1,12 @@
+from django.contrib import admin
+
+from apps.assets.models import AssetDividendEvent
+
+
+@admin.register(AssetDividendEvent)
+class AssetDividendEventAdmin(admin.ModelAdmin):
+    list_display = ("asset", "date", "dividend", "frequency", "payment_date")
+    list_filter = ("frequency",)
+    search_fields = ("asset__name", "asset__symbol")
+    date_hierarchy = "date"
+    readonly_fields = ("created_at",)
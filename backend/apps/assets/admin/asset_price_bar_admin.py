@@ -0,0 +1,12 @@
+from django.contrib import admin
+
+from apps.assets.models import AssetPriceBar
+
+
+@admin.register(AssetPriceBar)
+class AssetPriceBarAdmin(admin.ModelAdmin):
+    list_display = ("asset", "date", "open", "high", "low", "close", "volume", "source")
+    list_filter = ("source",)
+    search_fields = ("asset__name", "asset__symbol")
+    date_hierarchy = "date"
+    raw_id_fields = ("asset",)
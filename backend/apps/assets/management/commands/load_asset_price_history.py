@@ -0,0 +1,69 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+
+from apps.assets.models import Asset
+from apps.assets.services import AssetPriceHistoryService
+
+
+class Command(BaseCommand):
+    help = "Backfill daily price bars for tracked public assets."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--asset-type",
+            default="equity",
+            help="Asset type slug to backfill (default: equity).",
+        )
+        parser.add_argument(
+            "--symbols",
+            nargs="*",
+            default=None,
+            help="Optional explicit symbol list to backfill.",
+        )
+        parser.add_argument(
+            "--start",
+            type=datetime.date.fromisoformat,
+            default=None,
+            help="First date to load (default: the latest stored bar, which is refreshed).",
+        )
+        parser.add_argument(
+            "--end",
+            type=datetime.date.fromisoformat,
+            default=None,
+            help="Last date to load (default: today).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Bars per insert batch (default: ASSET_PRICE_HISTORY_BATCH_SIZE).",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=None,
+            help="Maximum concurrent provider requests (default: FMP_MAX_CONCURRENCY).",
+        )
+
+    def handle(self, *args, **options):
+        queryset = Asset.objects.filter(
+            owner__isnull=True,
+            asset_type__slug=options["asset_type"],
+        ).select_related("market_data")
+
+        symbols = options.get("symbols") or []
+        if symbols:
+            normalized = [symbol.strip().upper() for symbol in symbols if symbol.strip()]
+            queryset = queryset.filter(symbol__in=normalized)
+        else:
+            queryset = queryset.filter(market_data__status__in=["tracked", "stale"])
+
+        result = AssetPriceHistoryService.backfill(
+            assets=queryset,
+            start=options.get("start"),
+            end=options.get("end"),
+            max_workers=options.get("concurrency"),
+            batch_size=options.get("batch_size"),
+        )
+        self.stdout.write(self.style.SUCCESS(str(result)))
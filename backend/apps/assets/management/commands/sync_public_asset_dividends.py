@@ -14,6 +14,12 @@ class Command(BaseCommand):
             default=None,
             help="Optional explicit symbol list to refresh.",
         )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=None,
+            help="Maximum concurrent provider requests (default: FMP_MAX_CONCURRENCY).",
+        )
 
     def handle(self, *args, **options):
         queryset = Asset.objects.filter(
@@ -27,5 +33,8 @@ class Command(BaseCommand):
             normalized = [symbol.strip().upper() for symbol in symbols if symbol.strip()]
             queryset = queryset.filter(symbol__in=normalized)
 
-        result = AssetDividendService.sync_assets(assets=list(queryset))
+        result = AssetDividendService.sync_many(
+            assets=list(queryset),
+            max_workers=options.get("concurrency"),
+        )
         self.stdout.write(self.style.SUCCESS(str(result)))
@@ -19,6 +19,18 @@ class Command(BaseCommand):
             default=None,
             help="Optional explicit symbol list to refresh.",
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Symbols per batch quote request (default: FMP_QUOTE_BATCH_SIZE).",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=None,
+            help="Maximum concurrent provider requests (default: FMP_MAX_CONCURRENCY).",
+        )
 
     def handle(self, *args, **options):
         queryset = Asset.objects.filter(owner__isnull=True).select_related("market_data")
@@ -36,5 +48,9 @@ class Command(BaseCommand):
         else:
             queryset = queryset.filter(market_data__status__in=["tracked", "stale"])
 
-        result = PublicAssetSyncService.refresh_quotes_for_assets(assets=list(queryset))
+        result = PublicAssetSyncService.refresh_quotes_for_assets(
+            assets=list(queryset),
+            batch_size=options.get("batch_size"),
+            max_workers=options.get("concurrency"),
+        )
         self.stdout.write(self.style.SUCCESS(str(result)))
@@ -13,10 +13,17 @@ class Command(BaseCommand):
             default="equity",
             help="System asset type slug to use for the synced assets (default: equity).",
         )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=None,
+            help="Maximum concurrent provider requests (default: FMP_MAX_CONCURRENCY).",
+        )
 
     def handle(self, *args, **options):
         result = PublicAssetSyncService.sync_symbols(
             symbols=options["symbols"],
             asset_type_slug=options["asset_type"],
+            max_workers=options.get("concurrency"),
         )
         self.stdout.write(self.style.SUCCESS(str(result)))
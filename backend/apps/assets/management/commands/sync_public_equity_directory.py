@@ -6,6 +6,14 @@ from apps.assets.services import PublicAssetSyncService
 class Command(BaseCommand):
     help = "Sync the public equity directory from FMP stock-list and actively-trading-list."
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Rows written per transaction (default: ASSET_DIRECTORY_SYNC_BATCH_SIZE).",
+        )
+
     def handle(self, *args, **options):
-        result = PublicAssetSyncService.sync_equity_directory()
+        result = PublicAssetSyncService.sync_equity_directory(batch_size=options["batch_size"])
         self.stdout.write(self.style.SUCCESS(str(result)))
@@ -0,0 +1,38 @@
+# Generated by Django 6.0.3 on 2026-10-17 00:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0005_assetdividendsnapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assetdividendsnapshot',
+            name='history_through',
+            field=models.DateField(blank=True, help_text='Most recent dividend event date stored locally for incremental syncs.', null=True),
+        ),
+        migrations.CreateModel(
+            name='AssetDividendEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('dividend', models.DecimalField(decimal_places=6, max_digits=20)),
+                ('frequency', models.CharField(blank=True, max_length=30)),
+                ('record_date', models.DateField(blank=True, null=True)),
+                ('payment_date', models.DateField(blank=True, null=True)),
+                ('declaration_date', models.DateField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('asset', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dividend_events', to='assets.asset')),
+            ],
+            options={
+                'ordering': ['asset', '-date'],
+                'indexes': [models.Index(fields=['payment_date'], name='assets_asse_payment_cfc618_idx')],
+                'constraints': [models.UniqueConstraint(fields=('asset', 'date'), name='uniq_asset_dividend_event_date')],
+            },
+        ),
+    ]
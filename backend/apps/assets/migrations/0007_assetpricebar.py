@@ -0,0 +1,33 @@
+# Generated by Django 6.0.3 on 2026-10-17 00:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0006_dividend_event_history'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssetPriceBar',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('open', models.DecimalField(blank=True, decimal_places=8, max_digits=24, null=True)),
+                ('high', models.DecimalField(blank=True, decimal_places=8, max_digits=24, null=True)),
+                ('low', models.DecimalField(blank=True, decimal_places=8, max_digits=24, null=True)),
+                ('close', models.DecimalField(decimal_places=8, max_digits=24)),
+                ('volume', models.BigIntegerField(blank=True, null=True)),
+                ('source', models.CharField(default='FMP', max_length=50)),
+                ('asset', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='price_bars', to='assets.asset')),
+            ],
+            options={
+                'ordering': ['asset', 'date'],
+                'indexes': [models.Index(fields=['date', 'asset'], name='assets_asse_date_00a465_idx')],
+                'constraints': [models.UniqueConstraint(fields=('asset', 'date'), name='uniq_asset_price_bar_date')],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0.3 on 2026-10-17 01:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0007_assetpricebar'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='assetdividendevent',
+            name='uniq_asset_dividend_event_date',
+        ),
+        migrations.AddConstraint(
+            model_name='assetdividendevent',
+            constraint=models.UniqueConstraint(fields=('asset', 'date', 'dividend'), name='uniq_asset_dividend_event_date_amount'),
+        ),
+    ]
@@ -1,7 +1,17 @@
 from .asset import Asset
+from .asset_dividend_event import AssetDividendEvent
 from .asset_dividend_snapshot import AssetDividendSnapshot
 from .asset_market_data import AssetMarketData
 from .asset_price import AssetPrice
+from .asset_price_bar import AssetPriceBar
 from .asset_type import AssetType
 
-__all__ = ["AssetType", "Asset", "AssetMarketData", "AssetPrice", "AssetDividendSnapshot"]
+__all__ = [
+    "AssetType",
+    "Asset",
+    "AssetMarketData",
+    "AssetPrice",
+    "AssetPriceBar",
+    "AssetDividendEvent",
+    "AssetDividendSnapshot",
+]
@@ -0,0 +1,32 @@
+from django.db import models
+
+
+class AssetDividendEvent(models.Model):
+    asset = models.ForeignKey(
+        "assets.Asset",
+        on_delete=models.CASCADE,
+        related_name="dividend_events",
+    )
+    date = models.DateField()
+    dividend = models.DecimalField(max_digits=20, decimal_places=6)
+    frequency = models.CharField(max_length=30, blank=True)
+    record_date = models.DateField(null=True, blank=True)
+    payment_date = models.DateField(null=True, blank=True)
+    declaration_date = models.DateField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["asset", "-date"]
+        constraints = [
+            # Regular and special dividends can share an ex-date.
+            models.UniqueConstraint(
+                fields=["asset", "date", "dividend"],
+                name="uniq_asset_dividend_event_date_amount",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["payment_date"]),
+        ]
+
+    def __str__(self):
+        return f"{self.asset} dividend {self.dividend} on {self.date}"
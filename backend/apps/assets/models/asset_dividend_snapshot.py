@@ -46,6 +46,12 @@ class AssetDividendSnapshot(models.Model):
         default=DividendStatus.INACTIVE,
     )
 
+    history_through = models.DateField(
+        null=True,
+        blank=True,
+        help_text="Most recent dividend event date stored locally for incremental syncs.",
+    )
+
     last_computed_at = models.DateTimeField(auto_now=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
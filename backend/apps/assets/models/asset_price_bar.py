@@ -0,0 +1,28 @@
+from django.db import models
+
+
+class AssetPriceBar(models.Model):
+    asset = models.ForeignKey(
+        "assets.Asset",
+        on_delete=models.CASCADE,
+        related_name="price_bars",
+    )
+    date = models.DateField()
+    open = models.DecimalField(max_digits=24, decimal_places=8, null=True, blank=True)
+    high = models.DecimalField(max_digits=24, decimal_places=8, null=True, blank=True)
+    low = models.DecimalField(max_digits=24, decimal_places=8, null=True, blank=True)
+    close = models.DecimalField(max_digits=24, decimal_places=8)
+    volume = models.BigIntegerField(null=True, blank=True)
+    source = models.CharField(max_length=50, default="FMP")
+
+    class Meta:
+        ordering = ["asset", "date"]
+        constraints = [
+            models.UniqueConstraint(fields=["asset", "date"], name="uniq_asset_price_bar_date"),
+        ]
+        indexes = [
+            models.Index(fields=["date", "asset"]),
+        ]
+
+    def __str__(self):
+        return f"{self.asset} {self.date} close={self.close}"
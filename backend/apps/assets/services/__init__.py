@@ -1,4 +1,5 @@
 from .asset_dividend_service import AssetDividendService
+from .asset_price_history_service import AssetPriceHistoryService
 from .asset_price_service import AssetPriceService
 from .asset_service import AssetService
 from .asset_type_service import AssetTypeService
@@ -8,6 +9,7 @@ __all__ = [
     "AssetTypeService",
     "AssetService",
     "AssetPriceService",
+    "AssetPriceHistoryService",
     "AssetDividendService",
     "PublicAssetSyncService",
 ]
@@ -1,12 +1,14 @@
 import datetime
 from decimal import Decimal
 
-from django.db import transaction
+from django.conf import settings
+from django.db import connection, transaction
 from django.utils import timezone
 
-from apps.assets.models import Asset, AssetDividendSnapshot
+from apps.assets.models import Asset, AssetDividendEvent, AssetDividendSnapshot
 from apps.assets.services.asset_price_service import AssetPriceService
 from apps.integrations.providers.fmp import FMP_PROVIDER
+from apps.integrations.shared.concurrency import fmp_executor
 
 
 FREQUENCY_MULTIPLIER = {
@@ -37,10 +39,19 @@ def _to_decimal(value):
         return None
 
 
+def _event_amount(value: Decimal) -> Decimal:
+    # Matches AssetDividendEvent.dividend's stored precision.
+    return value.quantize(Decimal("0.000001"))
+
+
+def _event_date(event: dict):
+    return _parse_event_date(event.get("date") or event.get("recordDate") or event.get("paymentDate"))
+
+
 def _normalize_events(events: list[dict]) -> list[dict]:
     normalized: list[dict] = []
     for event in events or []:
-        date = _parse_event_date(event.get("date") or event.get("recordDate") or event.get("paymentDate"))
+        date = _event_date(event)
         amount = _to_decimal(event.get("dividend"))
         if date is None or amount is None:
             continue
@@ -49,6 +60,9 @@ def _normalize_events(events: list[dict]) -> list[dict]:
                 "date": date,
                 "dividend": amount,
                 "frequency": (event.get("frequency") or "").title(),
+                "record_date": _parse_event_date(event.get("recordDate")),
+                "payment_date": _parse_event_date(event.get("paymentDate")),
+                "declaration_date": _parse_event_date(event.get("declarationDate")),
             }
         )
     normalized.sort(key=lambda item: item["date"], reverse=True)
@@ -63,39 +77,24 @@ def _regular_dividends(events):
     ]
 
 
-def calculate_trailing_dividend(events, today):
-    if not events:
-        return Decimal("0")
-
-    cutoff = today - datetime.timedelta(days=365)
-    regular = _regular_dividends(events)
+def _cadence(regular):
     if not regular:
-        return Decimal("0")
-
+        return [], 0
     frequency = regular[0]["frequency"]
-    required = FREQUENCY_MULTIPLIER[frequency]
-    same_frequency = [event for event in regular if event["frequency"] == frequency]
+    return [event for event in regular if event["frequency"] == frequency], FREQUENCY_MULTIPLIER[frequency]
 
+
+def _trailing_dividend(same_frequency, required, cutoff):
     if len(same_frequency) >= required:
         return sum((event["dividend"] for event in same_frequency[:required]), Decimal("0"))
-
-    trailing = Decimal("0")
-    for event in same_frequency:
-        if event["date"] >= cutoff:
-            trailing += event["dividend"]
-    return trailing
+    return sum((event["dividend"] for event in same_frequency if event["date"] >= cutoff), Decimal("0"))
 
 
-def calculate_forward_dividend(events):
-    regular = _regular_dividends(events)
+def _forward_dividend(regular, same_frequency, required):
     if len(regular) < 2:
         return None
 
-    frequency = regular[0]["frequency"]
-    required = FREQUENCY_MULTIPLIER[frequency]
-    same_frequency = [event for event in regular if event["frequency"] == frequency]
     amounts = [event["dividend"] for event in same_frequency[:required]]
-
     if len(amounts) >= 2 and amounts[0] == amounts[1]:
         return amounts[0] * Decimal(required)
 
@@ -105,128 +104,301 @@ def calculate_forward_dividend(events):
     return (sum(amounts, Decimal("0")) / Decimal(len(amounts))) * Decimal(required)
 
 
+def calculate_trailing_dividend(events, today):
+    same_frequency, required = _cadence(_regular_dividends(events or []))
+    if not same_frequency:
+        return Decimal("0")
+    return _trailing_dividend(same_frequency, required, today - datetime.timedelta(days=365))
+
+
+def calculate_forward_dividend(events):
+    regular = _regular_dividends(events)
+    same_frequency, required = _cadence(regular)
+    return _forward_dividend(regular, same_frequency, required)
+
+
+SNAPSHOT_PRECISION = Decimal("0.000001")
+
+
+def _quantize(value):
+    return value.quantize(SNAPSHOT_PRECISION) if value is not None else None
+
+
+INACTIVE_SNAPSHOT_VALUES = {
+    "last_dividend_amount": None,
+    "last_dividend_date": None,
+    "last_dividend_frequency": None,
+    "last_dividend_is_special": False,
+    "regular_dividend_amount": None,
+    "regular_dividend_date": None,
+    "regular_dividend_frequency": None,
+    "trailing_12m_dividend": Decimal("0"),
+    "trailing_12m_cashflow": Decimal("0"),
+    "forward_annual_dividend": None,
+    "trailing_dividend_yield": None,
+    "forward_dividend_yield": None,
+    "status": AssetDividendSnapshot.DividendStatus.INACTIVE,
+    "cadence_status": AssetDividendSnapshot.CadenceStatus.NONE,
+    "history_through": None,
+}
+SNAPSHOT_FIELDS = [*INACTIVE_SNAPSHOT_VALUES, "last_computed_at", "updated_at"]
+
+
+def snapshot_values(*, events: list[dict], price, today) -> dict:
+    if not events:
+        return dict(INACTIVE_SNAPSHOT_VALUES)
+
+    cutoff = today - datetime.timedelta(days=365)
+    last_event = events[0]
+    regular = _regular_dividends(events)
+    same_frequency, required = _cadence(regular)
+    trailing = _trailing_dividend(same_frequency, required, cutoff) if same_frequency else Decimal("0")
+    forward = _forward_dividend(regular, same_frequency, required)
+
+    trailing_cashflow = Decimal("0")
+    for event in events:
+        if event["date"] < cutoff:
+            break
+        trailing_cashflow += event["dividend"]
+
+    trailing_yield = None
+    forward_yield = None
+    if price and price > 0:
+        trailing_yield = trailing / price
+        if forward is not None:
+            forward_yield = forward / price
+
+    return {
+        "last_dividend_amount": last_event["dividend"],
+        "last_dividend_date": last_event["date"],
+        "last_dividend_frequency": last_event.get("frequency") or None,
+        "last_dividend_is_special": last_event.get("frequency", "") not in FREQUENCY_MULTIPLIER,
+        "regular_dividend_amount": regular[0]["dividend"] if regular else None,
+        "regular_dividend_date": regular[0]["date"] if regular else None,
+        "regular_dividend_frequency": regular[0]["frequency"] if regular else None,
+        "trailing_12m_dividend": trailing,
+        "trailing_12m_cashflow": trailing_cashflow,
+        "forward_annual_dividend": _quantize(forward),
+        "trailing_dividend_yield": _quantize(trailing_yield),
+        "forward_dividend_yield": _quantize(forward_yield),
+        "status": (
+            AssetDividendSnapshot.DividendStatus.CONFIDENT
+            if forward is not None
+            else AssetDividendSnapshot.DividendStatus.UNCERTAIN
+        ),
+        "cadence_status": (
+            AssetDividendSnapshot.CadenceStatus.ACTIVE
+            if forward is not None
+            else AssetDividendSnapshot.CadenceStatus.BROKEN
+        ),
+        "history_through": last_event["date"],
+    }
+
+
 class AssetDividendService:
     @staticmethod
     def supports_dividends(*, asset: Asset) -> bool:
         return asset.owner is None and asset.asset_type.slug == "equity"
 
     @staticmethod
-    @transaction.atomic
+    def _provider_symbol(*, asset: Asset) -> str:
+        return (getattr(getattr(asset, "market_data", None), "provider_symbol", "") or asset.symbol or "").strip().upper()
+
+    @staticmethod
+    def incremental_limit() -> int:
+        return max(int(getattr(settings, "ASSET_DIVIDEND_INCREMENTAL_LIMIT", 8)), 1)
+
+    @staticmethod
+    def batch_size() -> int:
+        return max(int(getattr(settings, "ASSET_DIVIDEND_SYNC_BATCH_SIZE", 500)), 1)
+
+    @staticmethod
+    def _history_through(*, asset_ids: list) -> dict:
+        return dict(
+            AssetDividendSnapshot.objects.filter(asset_id__in=asset_ids)
+            .order_by()
+            .values_list("asset_id", "history_through")
+        )
+
+    @staticmethod
+    def fetch_new_events(*, symbol: str, history_through: datetime.date | None) -> list[dict]:
+        if history_through is None:
+            return FMP_PROVIDER.get_dividends(symbol)
+
+        limit = AssetDividendService.incremental_limit()
+        recent = FMP_PROVIDER.get_dividends(symbol, limit=limit)
+        dates = [_event_date(event) for event in recent]
+        if len(recent) >= limit and all(date and date >= history_through for date in dates):
+            # The window does not reach past the last synced date, so that
+            # date's events may be cut off; fall back to the full history.
+            recent = FMP_PROVIDER.get_dividends(symbol)
+            dates = [_event_date(event) for event in recent]
+        # The boundary date is re-read so late specials and restated amounts
+        # on it reach store_events, which treats each fetched date as complete.
+        return [event for event, date in zip(recent, dates) if date and date >= history_through]
+
+    @staticmethod
+    def store_events(*, asset_events: list[tuple[Asset, list[dict]]]) -> int:
+        asset_ids = [asset.pk for asset, events in asset_events if events]
+        if not asset_ids:
+            return 0
+
+        # The provider's events for a date replace what is stored for it: a
+        # restated amount drops the old row instead of counting alongside it.
+        fetched = {
+            (asset.pk, event["date"], _event_amount(event["dividend"]))
+            for asset, events in asset_events
+            for event in events
+        }
+        fetched_dates = {(asset_id, date) for asset_id, date, _ in fetched}
+        seen = set()
+        restated = []
+        for pk, asset_id, date, dividend in AssetDividendEvent.objects.filter(
+            asset_id__in=asset_ids,
+            date__in={date for _, date in fetched_dates},
+        ).values_list("pk", "asset_id", "date", "dividend"):
+            if (asset_id, date) not in fetched_dates:
+                continue
+            key = (asset_id, date, _event_amount(dividend))
+            if key in fetched:
+                seen.add(key)
+            else:
+                restated.append(pk)
+        if restated:
+            AssetDividendEvent.objects.filter(pk__in=restated).delete()
+
+        rows = []
+        for asset, events in asset_events:
+            for event in events:
+                key = (asset.pk, event["date"], _event_amount(event["dividend"]))
+                if key in seen:
+                    continue
+                seen.add(key)
+                rows.append(AssetDividendEvent(asset=asset, **event))
+        if rows:
+            AssetDividendEvent.objects.bulk_create(
+                rows,
+                ignore_conflicts=True,
+                batch_size=AssetDividendService.batch_size(),
+            )
+        return len(rows)
+
+    @staticmethod
+    def local_histories(*, asset_ids: list) -> dict:
+        histories = {asset_id: [] for asset_id in asset_ids}
+        for event in (
+            AssetDividendEvent.objects.filter(asset_id__in=asset_ids)
+            .order_by("asset_id", "-date")
+            .values("asset_id", "date", "dividend", "frequency")
+        ):
+            histories[event.pop("asset_id")].append(event)
+        return histories
+
+    @staticmethod
     def sync(asset: Asset) -> AssetDividendSnapshot | None:
         if not AssetDividendService.supports_dividends(asset=asset):
             return None
 
-        symbol = (getattr(getattr(asset, "market_data", None), "provider_symbol", "") or asset.symbol or "").strip().upper()
+        symbol = AssetDividendService._provider_symbol(asset=asset)
         if not symbol:
             return None
 
-        raw_events = FMP_PROVIDER.get_dividends(symbol)
-        events = _normalize_events(raw_events)
-        today = timezone.now().date()
-        cutoff = today - datetime.timedelta(days=365)
-
-        snapshot_defaults: dict = {}
-
-        if not events:
-            snapshot_defaults = {
-                "last_dividend_amount": None,
-                "last_dividend_date": None,
-                "last_dividend_frequency": None,
-                "last_dividend_is_special": False,
-                "regular_dividend_amount": None,
-                "regular_dividend_date": None,
-                "regular_dividend_frequency": None,
-                "trailing_12m_dividend": Decimal("0"),
-                "trailing_12m_cashflow": Decimal("0"),
-                "forward_annual_dividend": None,
-                "trailing_dividend_yield": None,
-                "forward_dividend_yield": None,
-                "status": AssetDividendSnapshot.DividendStatus.INACTIVE,
-                "cadence_status": AssetDividendSnapshot.CadenceStatus.NONE,
-            }
-            snapshot, _ = AssetDividendSnapshot.objects.update_or_create(
-                asset=asset,
-                defaults=snapshot_defaults,
-            )
-            return snapshot
-
-        last_event = events[0]
-        regular = _regular_dividends(events)
-        trailing = calculate_trailing_dividend(events, today)
-        forward = calculate_forward_dividend(events)
-
-        trailing_cashflow = Decimal("0")
-        for event in events:
-            if event["date"] < cutoff:
-                break
-            trailing_cashflow += event["dividend"]
+        raw_events = AssetDividendService.fetch_new_events(
+            symbol=symbol,
+            history_through=AssetDividendService._history_through(asset_ids=[asset.pk]).get(asset.pk),
+        )
+        return AssetDividendService.apply_events(asset=asset, raw_events=raw_events)
 
-        trailing_yield = None
-        forward_yield = None
+    @staticmethod
+    @transaction.atomic
+    def apply_events(*, asset: Asset, raw_events: list[dict]) -> AssetDividendSnapshot:
+        AssetDividendService.store_events(asset_events=[(asset, _normalize_events(raw_events))])
+        events = AssetDividendService.local_histories(asset_ids=[asset.pk])[asset.pk]
         price = None
-        try:
-            price = AssetPriceService.get_current_price(asset=asset).price
-        except Exception:
-            price = getattr(getattr(asset, "price", None), "price", None)
-
-        if price and price > 0:
-            trailing_yield = trailing / price
-            if forward is not None:
-                forward_yield = forward / price
-
-        last_is_special = last_event.get("frequency", "") not in FREQUENCY_MULTIPLIER
-        cadence_status = (
-            AssetDividendSnapshot.CadenceStatus.ACTIVE
-            if forward is not None
-            else AssetDividendSnapshot.CadenceStatus.BROKEN
-        )
-        status = (
-            AssetDividendSnapshot.DividendStatus.CONFIDENT
-            if forward is not None
-            else AssetDividendSnapshot.DividendStatus.UNCERTAIN
-        )
+        if events:
+            try:
+                price = AssetPriceService.get_current_price(asset=asset).price
+            except Exception:
+                price = getattr(getattr(asset, "price", None), "price", None)
 
-        snapshot_defaults = {
-            "last_dividend_amount": last_event["dividend"],
-            "last_dividend_date": last_event["date"],
-            "last_dividend_frequency": last_event.get("frequency") or None,
-            "last_dividend_is_special": last_is_special,
-            "regular_dividend_amount": regular[0]["dividend"] if regular else None,
-            "regular_dividend_date": regular[0]["date"] if regular else None,
-            "regular_dividend_frequency": regular[0]["frequency"] if regular else None,
-            "trailing_12m_dividend": trailing,
-            "trailing_12m_cashflow": trailing_cashflow,
-            "forward_annual_dividend": forward,
-            "trailing_dividend_yield": trailing_yield,
-            "forward_dividend_yield": forward_yield,
-            "status": status,
-            "cadence_status": cadence_status,
-        }
         snapshot, _ = AssetDividendSnapshot.objects.update_or_create(
             asset=asset,
-            defaults=snapshot_defaults,
+            defaults=snapshot_values(events=events, price=price, today=timezone.now().date()),
         )
         return snapshot
 
     @staticmethod
-    def sync_assets(*, assets) -> dict:
-        synced = 0
-        inactive = 0
+    def _cached_price(*, asset: Asset):
+        return getattr(getattr(asset, "price", None), "price", None)
+
+    @staticmethod
+    def _upsert_snapshots(snapshots: list[AssetDividendSnapshot]) -> None:
+        use_target = connection.features.supports_update_conflicts_with_target
+        AssetDividendSnapshot.objects.bulk_create(
+            snapshots,
+            update_conflicts=True,
+            unique_fields=["asset"] if use_target else None,
+            update_fields=SNAPSHOT_FIELDS,
+        )
+
+    @staticmethod
+    def sync_many(*, assets, max_workers: int | None = None, batch_size: int | None = None) -> dict:
+        batch_size = max(batch_size or AssetDividendService.batch_size(), 1)
+        targets = [
+            (asset, AssetDividendService._provider_symbol(asset=asset))
+            for asset in assets
+            if AssetDividendService.supports_dividends(asset=asset)
+        ]
+        targets = [(asset, symbol) for asset, symbol in targets if symbol]
+        history_through = AssetDividendService._history_through(asset_ids=[asset.pk for asset, _ in targets])
+
+        results = fmp_executor(max_workers=max_workers).map(
+            lambda target: AssetDividendService.fetch_new_events(
+                symbol=target[1],
+                history_through=history_through.get(target[0].pk),
+            ),
+            targets,
+        )
+
+        fetched: list[tuple[Asset, list[dict]]] = []
         errors = 0
-        for asset in assets:
-            try:
-                snapshot = AssetDividendService.sync(asset)
-                if snapshot is None:
-                    continue
-                if snapshot.status == AssetDividendSnapshot.DividendStatus.INACTIVE:
-                    inactive += 1
-                else:
-                    synced += 1
-            except Exception:
+        for result in results:
+            if not result.ok:
                 errors += 1
+                continue
+            asset, _ = result.item
+            fetched.append((asset, _normalize_events(result.value)))
+
+        today = timezone.now().date()
+        synced = inactive = new_events = 0
+        for start in range(0, len(fetched), batch_size):
+            chunk = fetched[start:start + batch_size]
+            with transaction.atomic():
+                new_events += AssetDividendService.store_events(asset_events=chunk)
+                histories = AssetDividendService.local_histories(asset_ids=[asset.pk for asset, _ in chunk])
+                snapshots = []
+                for asset, _ in chunk:
+                    try:
+                        values = snapshot_values(
+                            events=histories[asset.pk],
+                            price=AssetDividendService._cached_price(asset=asset),
+                            today=today,
+                        )
+                    except Exception:
+                        errors += 1
+                        continue
+                    snapshots.append(AssetDividendSnapshot(asset=asset, **values))
+                AssetDividendService._upsert_snapshots(snapshots)
+
+            chunk_inactive = sum(
+                1 for snapshot in snapshots if snapshot.status == AssetDividendSnapshot.DividendStatus.INACTIVE
+            )
+            inactive += chunk_inactive
+            synced += len(snapshots) - chunk_inactive
 
         return {
             "synced": synced,
             "inactive": inactive,
             "errors": errors,
+            "new_events": new_events,
         }
@@ -0,0 +1,184 @@
+import datetime
+from itertools import islice
+from typing import Iterable
+
+import numpy as np
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.db.models import Max, OuterRef, Subquery
+from django.utils import timezone
+
+from apps.assets.models import Asset, AssetPriceBar
+from apps.integrations.providers.fmp import FMP_PROVIDER
+from apps.integrations.shared.concurrency import fmp_executor
+
+
+PRICE_BAR_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+class AssetPriceHistoryService:
+    @staticmethod
+    def batch_size() -> int:
+        return max(int(getattr(settings, "ASSET_PRICE_HISTORY_BATCH_SIZE", 5000)), 1)
+
+    @staticmethod
+    def lookback_days() -> int:
+        return max(int(getattr(settings, "ASSET_PRICE_HISTORY_LOOKBACK_DAYS", 5 * 365)), 1)
+
+    @staticmethod
+    def _provider_symbol(*, asset: Asset) -> str:
+        return (getattr(getattr(asset, "market_data", None), "provider_symbol", "") or asset.symbol or "").strip().upper()
+
+    @staticmethod
+    def _chunks(items: Iterable, size: int):
+        iterator = iter(items)
+        while chunk := list(islice(iterator, size)):
+            yield chunk
+
+    @staticmethod
+    def latest_dates(*, asset_ids: list) -> dict:
+        return {
+            row["asset_id"]: row["latest"]
+            for row in AssetPriceBar.objects.filter(asset_id__in=asset_ids)
+            .order_by()
+            .values("asset_id")
+            .annotate(latest=Max("date"))
+        }
+
+    @staticmethod
+    def _upsert(bars: list[AssetPriceBar], *, batch_size: int) -> None:
+        use_target = connection.features.supports_update_conflicts_with_target
+        with transaction.atomic():
+            AssetPriceBar.objects.bulk_create(
+                bars,
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=["asset", "date"] if use_target else None,
+                update_fields=PRICE_BAR_FIELDS,
+            )
+
+    @staticmethod
+    def backfill(
+        *,
+        assets,
+        start: datetime.date | None = None,
+        end: datetime.date | None = None,
+        max_workers: int | None = None,
+        batch_size: int | None = None,
+    ) -> dict:
+        batch_size = max(batch_size or AssetPriceHistoryService.batch_size(), 1)
+        end = end or timezone.now().date()
+        default_start = end - datetime.timedelta(days=AssetPriceHistoryService.lookback_days())
+
+        assets = list(assets)
+        latest = AssetPriceHistoryService.latest_dates(asset_ids=[asset.pk for asset in assets])
+        targets = []
+        for asset in assets:
+            symbol = AssetPriceHistoryService._provider_symbol(asset=asset)
+            if not symbol:
+                continue
+            since = start
+            if since is None:
+                # Resume on the latest stored day rather than after it: a bar
+                # fetched during that session was partial and is overwritten.
+                since = latest.get(asset.pk, default_start)
+            if since <= end:
+                targets.append((asset, symbol, since))
+
+        executor = fmp_executor(max_workers=max_workers)
+        pending: list[AssetPriceBar] = []
+        fetched = 0
+        errors = 0
+        for group in AssetPriceHistoryService._chunks(targets, executor.max_workers * 4):
+            results = executor.map(
+                lambda target: FMP_PROVIDER.get_historical_prices(target[1], start=target[2], end=end),
+                group,
+            )
+            for result in results:
+                if not result.ok:
+                    errors += 1
+                    continue
+                asset, _, since = result.item
+                bars = {}
+                for row in result.value:
+                    day = datetime.date.fromisoformat(row["date"])
+                    if since <= day <= end:
+                        bars[day] = AssetPriceBar(
+                            asset=asset,
+                            date=day,
+                            **{field: row[field] for field in PRICE_BAR_FIELDS},
+                        )
+                pending.extend(bars.values())
+                fetched += len(bars)
+                while len(pending) >= batch_size:
+                    AssetPriceHistoryService._upsert(pending[:batch_size], batch_size=batch_size)
+                    pending = pending[batch_size:]
+
+        if pending:
+            AssetPriceHistoryService._upsert(pending, batch_size=batch_size)
+
+        return {
+            "assets": len(targets),
+            "bars": fetched,
+            "errors": errors,
+        }
+
+    @staticmethod
+    def _series_queryset(*, asset_ids: list, start: datetime.date, end: datetime.date, field: str):
+        if field not in PRICE_BAR_FIELDS:
+            raise ValidationError({"field": f"Unknown price field: {field}."})
+        return (
+            AssetPriceBar.objects.filter(asset_id__in=asset_ids, date__gte=start, date__lte=end)
+            .order_by("date", "asset_id")
+            .values_list("asset_id", "date", field)
+        )
+
+    @staticmethod
+    def load_rows(*, asset_ids: list, start: datetime.date, end: datetime.date, field: str = "close") -> list[tuple]:
+        return list(
+            AssetPriceHistoryService._series_queryset(asset_ids=asset_ids, start=start, end=end, field=field)
+        )
+
+    @staticmethod
+    def latest_before(*, asset_ids: list, before: datetime.date, field: str = "close") -> dict:
+        """Return each asset's most recent bar value dated before ``before``, however old."""
+        if field not in PRICE_BAR_FIELDS:
+            raise ValidationError({"field": f"Unknown price field: {field}."})
+        latest = AssetPriceBar.objects.filter(
+            asset_id=OuterRef("pk"),
+            date__lt=before,
+            **{f"{field}__isnull": False},
+        ).order_by("-date")
+        return {
+            asset_id: value
+            for asset_id, value in Asset.objects.filter(pk__in=asset_ids)
+            .annotate(value=Subquery(latest.values(field)[:1]))
+            .values_list("pk", "value")
+            if value is not None
+        }
+
+    @staticmethod
+    def load_matrix(*, asset_ids: list, start: datetime.date, end: datetime.date, field: str = "close"):
+        asset_ids = list(asset_ids)
+        columns = {str(asset_id): index for index, asset_id in enumerate(asset_ids)}
+        rows = AssetPriceHistoryService.load_rows(asset_ids=asset_ids, start=start, end=end, field=field)
+        if not rows:
+            return np.array([], dtype="datetime64[D]"), asset_ids, np.empty((0, len(asset_ids)))
+
+        column_index = np.fromiter(
+            (columns[str(asset_id)] for asset_id, _, _ in rows),
+            dtype=np.intp,
+            count=len(rows),
+        )
+        days = np.array([day for _, day, _ in rows], dtype="datetime64[D]")
+        values = np.fromiter(
+            (float(value) if value is not None else np.nan for _, _, value in rows),
+            dtype=np.float64,
+            count=len(rows),
+        )
+
+        dates, row_index = np.unique(days, return_inverse=True)
+        matrix = np.full((len(dates), len(asset_ids)), np.nan)
+        matrix[row_index, column_index] = values
+        return dates, asset_ids, matrix
@@ -1,12 +1,45 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 
 from django.conf import settings
+from django.db import connections
 from django.utils import timezone
 
 from apps.assets.models import Asset, AssetPrice
 from apps.assets.services.public_asset_sync_service import PublicAssetSyncService
 from apps.integrations.exceptions import EmptyProviderResult, IntegrationError
 
+logger = logging.getLogger(__name__)
+
+_REFRESH_LOCK = threading.Lock()
+_REFRESHING: set[str] = set()
+_REFRESH_EXECUTOR: ThreadPoolExecutor | None = None
+
+
+def _refresh_executor() -> ThreadPoolExecutor:
+    global _REFRESH_EXECUTOR
+    with _REFRESH_LOCK:
+        if _REFRESH_EXECUTOR is None:
+            _REFRESH_EXECUTOR = ThreadPoolExecutor(
+                max_workers=getattr(settings, "ASSET_PRICE_REFRESH_WORKERS", 4),
+                thread_name_prefix="price-refresh",
+            )
+        return _REFRESH_EXECUTOR
+
+
+def _refresh_asset(asset_id, key: str) -> None:
+    try:
+        asset = Asset.objects.select_related("price", "market_data").get(pk=asset_id)
+        PublicAssetSyncService.refresh_quote(asset=asset)
+    except Exception:
+        logger.warning("[PRICE] background refresh failed for %s", key, exc_info=True)
+    finally:
+        with _REFRESH_LOCK:
+            _REFRESHING.discard(key)
+        connections.close_all()
+
 
 class AssetPriceService:
     @staticmethod
@@ -39,3 +72,42 @@ class AssetPriceService:
             if cached_price is not None:
                 return cached_price
             raise
+
+    @staticmethod
+    def _refresh_key(*, asset: Asset) -> str:
+        market_data = getattr(asset, "market_data", None)
+        return (getattr(market_data, "provider_symbol", "") or asset.symbol or str(asset.pk)).strip().upper()
+
+    @staticmethod
+    def schedule_refresh(*, asset: Asset) -> bool:
+        key = AssetPriceService._refresh_key(asset=asset)
+        with _REFRESH_LOCK:
+            if key in _REFRESHING:
+                return False
+            _REFRESHING.add(key)
+        _refresh_executor().submit(_refresh_asset, asset.pk, key)
+        return True
+
+    @staticmethod
+    def get_price_stale_while_revalidate(
+        *,
+        asset: Asset,
+        refresh_in_background: bool | None = None,
+    ) -> AssetPrice | None:
+        if refresh_in_background is None:
+            refresh_in_background = getattr(settings, "ASSET_PRICE_BACKGROUND_REFRESH", True)
+
+        cached_price = AssetPriceService.get_cached_price(asset=asset)
+        if AssetPriceService.is_price_fresh(asset_price=cached_price):
+            return cached_price
+
+        if refresh_in_background:
+            AssetPriceService.schedule_refresh(asset=asset)
+            return cached_price
+
+        try:
+            price = AssetPriceService.get_current_price(asset=asset)
+        except (EmptyProviderResult, IntegrationError):
+            return cached_price
+        asset.price = price
+        return price
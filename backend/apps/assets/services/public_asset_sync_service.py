@@ -1,14 +1,25 @@
+import hashlib
+import json
+import time
+from itertools import islice
 from typing import Iterable
 
-from django.db import transaction
+from django.conf import settings
+from django.db import connection, transaction
 from django.utils import timezone
 
 from apps.assets.models import Asset, AssetMarketData, AssetPrice, AssetType
+from apps.assets.signals import asset_prices_changed
 from apps.integrations.exceptions import (
     EmptyProviderResult,
     IntegrationError,
 )
 from apps.integrations.providers.fmp import FMP_PROVIDER
+from apps.integrations.shared.concurrency import fmp_executor
+from apps.integrations.shared.single_flight import SingleFlight, get_lease_backend
+from apps.integrations.shared.types import CompanyProfile, QuoteSnapshot
+
+QUOTE_SINGLE_FLIGHT = SingleFlight(name="fmp-quote", backend=get_lease_backend())
 
 
 class PublicAssetSyncService:
@@ -76,13 +87,29 @@ class PublicAssetSyncService:
         return asset
 
     @staticmethod
-    @transaction.atomic
     def refresh_quote(*, asset: Asset) -> AssetPrice:
         market_data = getattr(asset, "market_data", None)
         provider_symbol = (
             getattr(market_data, "provider_symbol", "") or asset.symbol or ""
         ).strip().upper()
+        requested_at = timezone.now()
 
+        def reuse_recent_price() -> AssetPrice | None:
+            return AssetPrice.objects.filter(asset=asset, as_of__gte=requested_at).first()
+
+        return QUOTE_SINGLE_FLIGHT.do(
+            f"quote:{provider_symbol}:{asset.pk}",
+            lambda: PublicAssetSyncService._refresh_quote(
+                asset=asset,
+                market_data=market_data,
+                provider_symbol=provider_symbol,
+            ),
+            reuse=reuse_recent_price,
+        )
+
+    @staticmethod
+    @transaction.atomic
+    def _refresh_quote(*, asset: Asset, market_data: AssetMarketData | None, provider_symbol: str) -> AssetPrice:
         quote = FMP_PROVIDER.get_quote(provider_symbol)
 
         price, _ = AssetPrice.objects.update_or_create(
@@ -139,157 +166,461 @@ class PublicAssetSyncService:
         return asset
 
     @staticmethod
-    def sync_symbols(*, symbols: Iterable[str], asset_type_slug: str = "equity") -> dict:
-        created_or_updated = 0
-        unresolved = 0
-        errors = 0
+    @transaction.atomic
+    def _persist_profiles(*, profiles: dict[str, CompanyProfile], asset_type: AssetType, now) -> None:
+        if not profiles:
+            return
 
-        for symbol in symbols:
-            normalized = (symbol or "").strip().upper()
-            if not normalized:
+        existing = {
+            asset.symbol: asset
+            for asset in Asset.objects.filter(
+                owner__isnull=True,
+                asset_type=asset_type,
+                symbol__in=list(profiles),
+            )
+        }
+        to_create: list[Asset] = []
+        to_update: list[Asset] = []
+        for symbol, profile in profiles.items():
+            name = (profile.name or symbol).strip()
+            description = (profile.description or "").strip()
+            data = PublicAssetSyncService._base_asset_data_from_profile(profile)
+            asset = existing.get(symbol)
+            if asset is None:
+                to_create.append(
+                    Asset(
+                        asset_type=asset_type,
+                        owner=None,
+                        symbol=symbol,
+                        name=name,
+                        description=description,
+                        data=data,
+                        is_active=True,
+                    )
+                )
                 continue
+            asset.name = name
+            asset.description = description
+            asset.data = {**asset.data, **data}
+            asset.is_active = True
+            asset.updated_at = now
+            to_update.append(asset)
+
+        if to_create:
+            Asset.objects.bulk_create(to_create)
+        if to_update:
+            Asset.objects.bulk_update(to_update, fields=["name", "description", "data", "is_active", "updated_at"])
+
+        PublicAssetSyncService._bulk_save_market_data(
+            assets=[*to_create, *to_update],
+            now=now,
+            provider=AssetMarketData.Provider.FMP,
+            provider_symbol=lambda asset: asset.symbol,
+            status=AssetMarketData.Status.TRACKED,
+            last_successful_sync_at=now,
+            last_error="",
+        )
 
-            try:
-                PublicAssetSyncService.sync_symbol(
-                    symbol=normalized,
-                    asset_type_slug=asset_type_slug,
-                )
-                created_or_updated += 1
-            except EmptyProviderResult as exc:
-                unresolved += 1
-                existing = Asset.objects.filter(
-                    owner__isnull=True,
-                    asset_type__slug=asset_type_slug,
-                    symbol=normalized,
-                ).first()
-                if existing:
-                    PublicAssetSyncService.mark_asset_unresolved(
-                        asset=existing,
-                        error_message=str(exc),
-                    )
-            except IntegrationError:
+    @staticmethod
+    def sync_symbols(
+        *,
+        symbols: Iterable[str],
+        asset_type_slug: str = "equity",
+        max_workers: int | None = None,
+    ) -> dict:
+        normalized_symbols = list(
+            dict.fromkeys((symbol or "").strip().upper() for symbol in symbols)
+        )
+        normalized_symbols = [symbol for symbol in normalized_symbols if symbol]
+        asset_type = PublicAssetSyncService._resolve_asset_type(asset_type_slug=asset_type_slug)
+
+        results = fmp_executor(max_workers=max_workers).map(
+            FMP_PROVIDER.get_company_profile,
+            normalized_symbols,
+        )
+
+        profiles: dict[str, CompanyProfile] = {}
+        unresolved: dict[str, str] = {}
+        errors = 0
+        for result in results:
+            if result.ok:
+                profiles[result.item] = result.value
+            elif isinstance(result.error, EmptyProviderResult):
+                unresolved[result.item] = str(result.error)
+            elif isinstance(result.error, IntegrationError):
                 errors += 1
+            else:
+                raise result.error
+
+        now = timezone.now()
+        PublicAssetSyncService._persist_profiles(profiles=profiles, asset_type=asset_type, now=now)
+        if unresolved:
+            existing_unresolved = list(
+                Asset.objects.filter(
+                    owner__isnull=True,
+                    asset_type=asset_type,
+                    symbol__in=list(unresolved),
+                )
+            )
+            with transaction.atomic():
+                PublicAssetSyncService._bulk_save_market_data(
+                    assets=existing_unresolved,
+                    now=now,
+                    status=AssetMarketData.Status.UNRESOLVED,
+                    last_error=lambda asset: unresolved[asset.symbol],
+                )
 
         return {
-            "created_or_updated": created_or_updated,
-            "unresolved": unresolved,
+            "created_or_updated": len(profiles),
+            "unresolved": len(unresolved),
             "errors": errors,
         }
 
     @staticmethod
-    @transaction.atomic
-    def sync_equity_directory() -> dict:
+    def directory_batch_size() -> int:
+        return max(int(getattr(settings, "ASSET_DIRECTORY_SYNC_BATCH_SIZE", 1000)), 1)
+
+    @staticmethod
+    def _directory_entry(*, row: dict, is_active: bool) -> dict:
+        entry = {
+            "exchange": row.get("exchange") or "",
+            "currency": row.get("currency") or "",
+        }
+        fingerprint = json.dumps(
+            {"name": row["name"], "is_active": is_active, **entry},
+            sort_keys=True,
+        )
+        entry["hash"] = hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+        return entry
+
+    @staticmethod
+    def _chunks(items: Iterable, size: int):
+        iterator = iter(items)
+        while chunk := list(islice(iterator, size)):
+            yield chunk
+
+    @staticmethod
+    def _save_directory_market_data(*, assets: list[Asset], active_symbols: set[str], now) -> None:
+        active = [asset for asset in assets if asset.symbol in active_symbols]
+        inactive = [asset for asset in assets if asset.symbol not in active_symbols]
+        PublicAssetSyncService._bulk_save_market_data(
+            assets=active,
+            now=now,
+            provider=AssetMarketData.Provider.FMP,
+            provider_symbol=lambda asset: asset.symbol,
+            status=AssetMarketData.Status.TRACKED,
+            last_successful_sync_at=now,
+            last_error="",
+        )
+        PublicAssetSyncService._bulk_save_market_data(
+            assets=inactive,
+            now=now,
+            provider=AssetMarketData.Provider.FMP,
+            provider_symbol=lambda asset: asset.symbol,
+            status=AssetMarketData.Status.STALE,
+        )
+
+    @staticmethod
+    def _apply_directory_batch(
+        *,
+        incoming: dict[str, dict],
+        existing: dict,
+        asset_type: AssetType,
+        active_symbols: set[str],
+    ) -> tuple[int, int]:
+        new_symbols = [symbol for symbol in incoming if symbol not in existing]
+        # Deactivating a missing symbol leaves its stored hash untouched, so also
+        # compare is_active for symbols that come back unchanged.
+        changed_ids = [
+            existing[symbol][0]
+            for symbol, entry in incoming.items()
+            if symbol in existing
+            and (
+                existing[symbol][2] != entry["market_directory"]["hash"]
+                or existing[symbol][1] != (symbol in active_symbols)
+            )
+        ]
+
+        if new_symbols:
+            now = timezone.now()
+            with transaction.atomic():
+                created_assets = Asset.objects.bulk_create(
+                    [
+                        Asset(
+                            asset_type=asset_type,
+                            owner=None,
+                            symbol=symbol,
+                            name=incoming[symbol]["name"],
+                            description="",
+                            data={"market_directory": incoming[symbol]["market_directory"]},
+                            is_active=symbol in active_symbols,
+                        )
+                        for symbol in new_symbols
+                    ]
+                )
+                PublicAssetSyncService._save_directory_market_data(
+                    assets=created_assets,
+                    active_symbols=active_symbols,
+                    now=now,
+                )
+
+        if changed_ids:
+            now = timezone.now()
+            with transaction.atomic():
+                assets = list(Asset.objects.filter(pk__in=changed_ids).select_for_update())
+                for asset in assets:
+                    entry = incoming[asset.symbol]
+                    asset.name = entry["name"]
+                    asset.data = {**asset.data, "market_directory": entry["market_directory"]}
+                    asset.is_active = asset.symbol in active_symbols
+                    asset.updated_at = now
+                Asset.objects.bulk_update(assets, fields=["name", "data", "is_active", "updated_at"])
+                PublicAssetSyncService._save_directory_market_data(
+                    assets=assets,
+                    active_symbols=active_symbols,
+                    now=now,
+                )
+
+        return len(new_symbols), len(changed_ids)
+
+    @staticmethod
+    def sync_equity_directory(*, batch_size: int | None = None) -> dict:
+        batch_size = max(batch_size or PublicAssetSyncService.directory_batch_size(), 1)
         asset_type = PublicAssetSyncService._resolve_asset_type(asset_type_slug="equity")
-        stock_rows = FMP_PROVIDER.get_stock_list()
         active_symbols = FMP_PROVIDER.get_actively_traded_symbols()
 
-        seen_symbols: set[str] = set()
-        created = 0
-        updated = 0
-
-        existing_assets = {
-            asset.symbol: asset
-            for asset in Asset.objects.filter(
+        existing = {
+            symbol: (pk, is_active, directory_hash)
+            for pk, symbol, is_active, directory_hash in Asset.objects.filter(
                 owner__isnull=True,
                 asset_type=asset_type,
             )
-            if asset.symbol
+            .exclude(symbol="")
+            .order_by()
+            .values_list("pk", "symbol", "is_active", "data__market_directory__hash")
         }
 
-        for row in stock_rows:
-            symbol = row["symbol"]
-            seen_symbols.add(symbol)
-            is_active = symbol in active_symbols
-            defaults = {
-                "asset_type": asset_type,
-                "owner": None,
-                "name": row["name"],
-                "description": "",
-                "data": {
-                    "market_directory": {
-                        "exchange": row.get("exchange", ""),
-                        "currency": row.get("currency", ""),
-                    }
-                },
-                "is_active": is_active,
-            }
-
-            asset = existing_assets.get(symbol)
-            if asset is None:
-                asset = Asset.objects.create(symbol=symbol, **defaults)
-                created += 1
-            else:
-                asset.name = defaults["name"]
-                asset.data = {**asset.data, **defaults["data"]}
-                asset.is_active = is_active
-                asset.save()
-                updated += 1
-
-            market_data, _ = AssetMarketData.objects.get_or_create(
-                asset=asset,
-                defaults={"provider": AssetMarketData.Provider.FMP},
-            )
-            market_data.provider = AssetMarketData.Provider.FMP
-            market_data.provider_symbol = symbol
-            market_data.status = (
-                AssetMarketData.Status.TRACKED if is_active else AssetMarketData.Status.STALE
-            )
-            market_data.last_synced_at = timezone.now()
-            if is_active:
-                market_data.last_successful_sync_at = market_data.last_synced_at
-                market_data.last_error = ""
-            market_data.save()
-
-        deactivated = 0
-        for symbol, asset in existing_assets.items():
-            if symbol in seen_symbols:
-                continue
-            asset.is_active = False
-            asset.save(update_fields=["is_active", "updated_at"])
-            market_data, _ = AssetMarketData.objects.get_or_create(
-                asset=asset,
-                defaults={"provider": AssetMarketData.Provider.FMP},
+        seen: set[str] = set()
+        created = updated = 0
+        for chunk in PublicAssetSyncService._chunks(FMP_PROVIDER.iter_stock_list(), batch_size):
+            incoming: dict[str, dict] = {}
+            for row in chunk:
+                symbol = (row.get("symbol") or "").strip().upper()
+                if not symbol or symbol in seen:
+                    continue
+                seen.add(symbol)
+                name = (row.get("name") or "").strip() or symbol
+                incoming[symbol] = {
+                    "name": name,
+                    "market_directory": PublicAssetSyncService._directory_entry(
+                        row={**row, "name": name},
+                        is_active=symbol in active_symbols,
+                    ),
+                }
+            batch_created, batch_updated = PublicAssetSyncService._apply_directory_batch(
+                incoming=incoming,
+                existing=existing,
+                asset_type=asset_type,
+                active_symbols=active_symbols,
             )
-            market_data.provider_symbol = symbol
-            market_data.status = AssetMarketData.Status.STALE
-            market_data.last_synced_at = timezone.now()
-            market_data.last_error = "Symbol no longer present in FMP stock list."
-            market_data.save()
-            deactivated += 1
+            created += batch_created
+            updated += batch_updated
+
+        missing_ids = [
+            pk
+            for symbol, (pk, is_active, _) in existing.items()
+            if symbol not in seen and is_active
+        ]
+        for chunk in PublicAssetSyncService._chunks(missing_ids, batch_size):
+            now = timezone.now()
+            with transaction.atomic():
+                Asset.objects.filter(pk__in=chunk).update(is_active=False, updated_at=now)
+                PublicAssetSyncService._bulk_save_market_data(
+                    assets=list(Asset.objects.filter(pk__in=chunk).only("pk", "symbol")),
+                    now=now,
+                    provider_symbol=lambda asset: asset.symbol,
+                    status=AssetMarketData.Status.STALE,
+                    last_error="Symbol no longer present in FMP stock list.",
+                )
 
         return {
             "created": created,
             "updated": updated,
-            "deactivated": deactivated,
+            "unchanged": len(seen) - created - updated,
+            "deactivated": len(missing_ids),
             "active_symbols": len(active_symbols),
-            "directory_symbols": len(seen_symbols),
+            "directory_symbols": len(seen),
         }
 
     @staticmethod
-    def refresh_quotes_for_assets(*, assets: Iterable[Asset]) -> dict:
-        updated = 0
-        stale = 0
-        errors = 0
+    def quote_batch_size() -> int:
+        return max(int(getattr(settings, "FMP_QUOTE_BATCH_SIZE", 100)), 1)
+
+    @staticmethod
+    def _provider_symbol(*, asset: Asset) -> str:
+        market_data = getattr(asset, "market_data", None)
+        return (getattr(market_data, "provider_symbol", "") or asset.symbol or "").strip().upper()
+
+    @staticmethod
+    def _bulk_save_market_data(*, assets: list[Asset], now, **changes) -> None:
+        if not assets:
+            return
 
+        existing = {
+            market_data.asset_id: market_data
+            for market_data in AssetMarketData.objects.filter(asset_id__in=[asset.pk for asset in assets])
+        }
+        to_create: list[AssetMarketData] = []
+        to_update: list[AssetMarketData] = []
         for asset in assets:
-            try:
-                PublicAssetSyncService.refresh_quote(asset=asset)
-                updated += 1
-            except EmptyProviderResult as exc:
-                PublicAssetSyncService.mark_asset_stale(asset=asset, error_message=str(exc))
-                stale += 1
-            except IntegrationError as exc:
-                market_data, _ = AssetMarketData.objects.get_or_create(
+            market_data = existing.get(asset.pk)
+            if market_data is None:
+                market_data = AssetMarketData(asset=asset, provider=AssetMarketData.Provider.FMP)
+                to_create.append(market_data)
+            else:
+                to_update.append(market_data)
+            for field, value in changes.items():
+                setattr(market_data, field, value(asset) if callable(value) else value)
+            market_data.last_synced_at = now
+            market_data.updated_at = now
+
+        if to_create:
+            AssetMarketData.objects.bulk_create(to_create)
+        if to_update:
+            AssetMarketData.objects.bulk_update(
+                to_update,
+                fields=["last_synced_at", "updated_at", *changes.keys()],
+            )
+
+    @staticmethod
+    @transaction.atomic
+    def _apply_quotes(*, priced: list[tuple[Asset, str, QuoteSnapshot]], now) -> None:
+        if not priced:
+            return
+
+        use_target = connection.features.supports_update_conflicts_with_target
+        AssetPrice.objects.bulk_create(
+            [
+                AssetPrice(
                     asset=asset,
-                    defaults={"provider": AssetMarketData.Provider.FMP},
+                    price=quote.price,
+                    change=quote.change,
+                    volume=quote.volume,
+                    source=quote.source or "FMP",
                 )
-                market_data.last_synced_at = timezone.now()
-                market_data.last_error = str(exc)
-                market_data.save()
-                errors += 1
+                for asset, _, quote in priced
+            ],
+            update_conflicts=True,
+            unique_fields=["asset"] if use_target else None,
+            update_fields=["price", "change", "volume", "source", "as_of"],
+        )
+        asset_prices_changed.send(
+            sender=AssetPrice,
+            asset_ids=[asset.pk for asset, _, _ in priced],
+        )
 
+        symbols = {asset.pk: symbol for asset, symbol, _ in priced}
+        PublicAssetSyncService._bulk_save_market_data(
+            assets=[asset for asset, _, _ in priced],
+            now=now,
+            provider_symbol=lambda asset: symbols[asset.pk],
+            status=AssetMarketData.Status.TRACKED,
+            last_successful_sync_at=now,
+            last_error="",
+        )
+        Asset.objects.filter(pk__in=list(symbols)).update(is_active=True, updated_at=now)
+
+    @staticmethod
+    @transaction.atomic
+    def _mark_assets_stale(*, missing: list[tuple[Asset, str]], now) -> None:
+        if not missing:
+            return
+
+        errors = {asset.pk: error_message for asset, error_message in missing}
+        PublicAssetSyncService._bulk_save_market_data(
+            assets=[asset for asset, _ in missing],
+            now=now,
+            status=AssetMarketData.Status.STALE,
+            last_error=lambda asset: errors[asset.pk],
+        )
+        Asset.objects.filter(pk__in=list(errors)).update(is_active=False, updated_at=now)
+
+    @staticmethod
+    def refresh_quotes_for_assets(
+        *,
+        assets: Iterable[Asset],
+        batch_size: int | None = None,
+        max_workers: int | None = None,
+    ) -> dict:
+        started = time.monotonic()
+        batch_size = max(batch_size or PublicAssetSyncService.quote_batch_size(), 1)
+
+        assets_by_symbol: dict[str, list[Asset]] = {}
+        unsymbolled: list[Asset] = []
+        for asset in assets:
+            symbol = PublicAssetSyncService._provider_symbol(asset=asset)
+            if symbol:
+                assets_by_symbol.setdefault(symbol, []).append(asset)
+            else:
+                unsymbolled.append(asset)
+
+        updated = 0
+        stale = 0
+        errors = len(unsymbolled)
+        requests = 0
+        PublicAssetSyncService._bulk_save_market_data(
+            assets=unsymbolled,
+            now=timezone.now(),
+            last_error="Symbol is required for quote lookup.",
+        )
+
+        symbols = list(assets_by_symbol)
+        chunks = [symbols[start:start + batch_size] for start in range(0, len(symbols), batch_size)]
+        # Chunks are already batch_size long, so each one is exactly one request.
+        results = fmp_executor(max_workers=max_workers).map(
+            lambda chunk: FMP_PROVIDER.get_quotes(chunk, batch_size=batch_size),
+            chunks,
+        )
+        for result in results:
+            chunk = result.item
+            requests += 1
+            if not result.ok:
+                if not isinstance(result.error, IntegrationError):
+                    raise result.error
+                chunk_assets = [asset for symbol in chunk for asset in assets_by_symbol[symbol]]
+                PublicAssetSyncService._bulk_save_market_data(
+                    assets=chunk_assets,
+                    now=timezone.now(),
+                    last_error=str(result.error),
+                )
+                errors += len(chunk_assets)
+                continue
+            quotes = result.value
+
+            priced: list[tuple[Asset, str, QuoteSnapshot]] = []
+            missing: list[tuple[Asset, str]] = []
+            for symbol in chunk:
+                quote = quotes.get(symbol)
+                for asset in assets_by_symbol[symbol]:
+                    if quote is None or quote.price is None:
+                        missing.append((asset, f"No quote found for {symbol}."))
+                    else:
+                        priced.append((asset, symbol, quote))
+
+            now = timezone.now()
+            PublicAssetSyncService._apply_quotes(priced=priced, now=now)
+            PublicAssetSyncService._mark_assets_stale(missing=missing, now=now)
+            updated += len(priced)
+            stale += len(missing)
+
+        elapsed = time.monotonic() - started
+        processed = updated + stale + errors
         return {
             "updated": updated,
             "stale": stale,
             "errors": errors,
+            "symbols": len(symbols),
+            "requests": requests,
+            "elapsed_seconds": round(elapsed, 3),
+            "assets_per_second": round(processed / elapsed, 1) if elapsed > 0 else None,
         }
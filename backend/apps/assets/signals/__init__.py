@@ -0,0 +1,3 @@
+from .price_signals import asset_prices_changed
+
+__all__ = ["asset_prices_changed"]
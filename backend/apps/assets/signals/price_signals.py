@@ -0,0 +1,4 @@
+from django.dispatch import Signal
+
+# Sent after bulk price writes that bypass model save signals; provides ``asset_ids``.
+asset_prices_changed = Signal()
@@ -4,7 +4,7 @@ from unittest.mock import patch
 
 from django.test import TestCase
 
-from apps.assets.models import Asset, AssetDividendSnapshot, AssetMarketData, AssetPrice, AssetType
+from apps.assets.models import Asset, AssetDividendEvent, AssetDividendSnapshot, AssetMarketData, AssetPrice, AssetType
 from apps.assets.services import AssetDividendService
 
 
@@ -54,3 +54,107 @@ class AssetDividendServiceTests(TestCase):
         self.assertEqual(snapshot.forward_annual_dividend, Decimal("1.00"))
         self.assertEqual(snapshot.trailing_dividend_yield, Decimal("0.005"))
         self.assertEqual(snapshot.forward_dividend_yield, Decimal("0.005"))
+
+    @patch("apps.assets.services.asset_dividend_service.AssetPriceService.get_current_price")
+    @patch("apps.assets.services.asset_dividend_service.FMP_PROVIDER.get_dividends")
+    def test_sync_many_upserts_snapshots_using_cached_prices(self, mock_get_dividends, mock_get_current_price):
+        other = Asset.objects.create(asset_type=self.equity_type, name="Microsoft", symbol="MSFT")
+        AssetDividendSnapshot.objects.create(asset=self.asset, trailing_12m_dividend=Decimal("9"))
+        mock_get_dividends.side_effect = lambda symbol: (
+            [
+                {"date": date(2026, 3, 1), "dividend": "0.50", "frequency": "Quarterly"},
+                {"date": date(2025, 12, 1), "dividend": "0.50", "frequency": "Quarterly"},
+            ]
+            if symbol == "AAPL"
+            else []
+        )
+
+        assets = list(
+            Asset.objects.filter(pk__in=[self.asset.pk, other.pk]).select_related("market_data", "price", "asset_type")
+        )
+        result = AssetDividendService.sync_many(assets=assets, max_workers=1)
+
+        self.assertEqual(result, {"synced": 1, "inactive": 1, "errors": 0, "new_events": 2})
+        mock_get_current_price.assert_not_called()
+        snapshot = AssetDividendSnapshot.objects.get(asset=self.asset)
+        self.assertEqual(snapshot.forward_annual_dividend, Decimal("2.00"))
+        self.assertEqual(snapshot.forward_dividend_yield, Decimal("0.01"))
+        self.assertEqual(
+            AssetDividendSnapshot.objects.get(asset=other).status,
+            AssetDividendSnapshot.DividendStatus.INACTIVE,
+        )
+
+    @patch("apps.assets.services.asset_dividend_service.FMP_PROVIDER.get_dividends")
+    def test_sync_fetches_only_events_after_the_stored_high_water_mark(self, mock_get_dividends):
+        history = [
+            {"date": "2025-12-01", "dividend": "0.25", "frequency": "Quarterly", "paymentDate": "2025-12-15"},
+            {"date": "2025-09-01", "dividend": "0.25", "frequency": "Quarterly"},
+        ]
+        mock_get_dividends.return_value = history
+        AssetDividendService.sync(self.asset)
+        mock_get_dividends.assert_called_once_with("AAPL")
+
+        mock_get_dividends.reset_mock()
+        mock_get_dividends.return_value = [
+            {"date": "2026-03-01", "dividend": "0.30", "frequency": "Quarterly"},
+            *history,
+        ]
+        snapshot = AssetDividendService.sync(self.asset)
+
+        mock_get_dividends.assert_called_once_with("AAPL", limit=8)
+        self.assertEqual(AssetDividendEvent.objects.filter(asset=self.asset).count(), 3)
+        self.assertEqual(snapshot.history_through, date(2026, 3, 1))
+        self.assertEqual(snapshot.last_dividend_amount, Decimal("0.30"))
+        self.assertEqual(
+            AssetDividendEvent.objects.get(asset=self.asset, date=date(2025, 12, 1)).payment_date,
+            date(2025, 12, 15),
+        )
+
+    @patch("apps.assets.services.asset_dividend_service.FMP_PROVIDER.get_dividends")
+    def test_sync_rereads_the_last_stored_date_for_late_specials_and_restatements(self, mock_get_dividends):
+        regular = {"date": "2026-03-01", "dividend": "0.25", "frequency": "Quarterly"}
+        older = {"date": "2025-12-01", "dividend": "0.25", "frequency": "Quarterly"}
+        mock_get_dividends.return_value = [regular, older]
+        AssetDividendService.sync(self.asset)
+
+        mock_get_dividends.return_value = [
+            regular,
+            {"date": "2026-03-01", "dividend": "1.00", "frequency": ""},
+            older,
+        ]
+        snapshot = AssetDividendService.sync(self.asset)
+
+        self.assertEqual(snapshot.history_through, date(2026, 3, 1))
+        self.assertEqual(
+            sorted(
+                AssetDividendEvent.objects.filter(asset=self.asset, date=date(2026, 3, 1))
+                .values_list("dividend", flat=True)
+            ),
+            [Decimal("0.25"), Decimal("1.00")],
+        )
+
+        mock_get_dividends.return_value = [
+            {"date": "2026-03-01", "dividend": "0.26", "frequency": "Quarterly"},
+            {"date": "2026-03-01", "dividend": "1.00", "frequency": ""},
+            older,
+        ]
+        AssetDividendService.sync(self.asset)
+
+        self.assertEqual(
+            sorted(
+                AssetDividendEvent.objects.filter(asset=self.asset, date=date(2026, 3, 1))
+                .values_list("dividend", flat=True)
+            ),
+            [Decimal("0.26"), Decimal("1.00")],
+        )
+        self.assertEqual(AssetDividendEvent.objects.filter(asset=self.asset, date=date(2025, 12, 1)).count(), 1)
+
+    def test_store_events_keeps_same_day_special_dividend_and_counts_real_inserts(self):
+        events = [
+            {"date": date(2026, 3, 1), "dividend": Decimal("0.25"), "frequency": "Quarterly"},
+            {"date": date(2026, 3, 1), "dividend": Decimal("1.00"), "frequency": ""},
+        ]
+
+        self.assertEqual(AssetDividendService.store_events(asset_events=[(self.asset, events)]), 2)
+        self.assertEqual(AssetDividendService.store_events(asset_events=[(self.asset, events)]), 0)
+        self.assertEqual(AssetDividendEvent.objects.filter(asset=self.asset, date=date(2026, 3, 1)).count(), 2)
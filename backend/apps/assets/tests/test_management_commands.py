@@ -20,12 +20,12 @@ class AssetManagementCommandTests(TestCase):
         self.assertEqual(first_count, second_count)
         self.assertGreater(first_count, 0)
 
-    @patch("apps.assets.management.commands.sync_public_asset_dividends.AssetDividendService.sync_assets")
-    def test_sync_public_asset_dividends_command_calls_service(self, mock_sync_assets):
-        mock_sync_assets.return_value = {"synced": 1, "inactive": 0, "errors": 0}
+    @patch("apps.assets.management.commands.sync_public_asset_dividends.AssetDividendService.sync_many")
+    def test_sync_public_asset_dividends_command_calls_service(self, mock_sync_many):
+        mock_sync_many.return_value = {"synced": 1, "inactive": 0, "errors": 0}
 
         out = StringIO()
         call_command("sync_public_asset_dividends", stdout=out)
 
-        mock_sync_assets.assert_called_once()
+        mock_sync_many.assert_called_once()
         self.assertIn("synced", out.getvalue())
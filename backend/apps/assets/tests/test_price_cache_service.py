@@ -1,12 +1,12 @@
 from datetime import timedelta
 from decimal import Decimal
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from django.test import TestCase, override_settings
 from django.utils import timezone
 
 from apps.assets.models import Asset, AssetPrice, AssetType
-from apps.assets.services import AssetPriceService
+from apps.assets.services import AssetPriceService, asset_price_service
 from apps.integrations.exceptions import IntegrationError
 
 
@@ -105,3 +105,36 @@ class AssetPriceServiceTests(TestCase):
         AssetPrice.objects.filter(asset=self.asset).update(as_of=stale_time)
         self.asset.refresh_from_db()
         self.assertFalse(self.asset.current_price_is_fresh)
+
+    @patch("apps.assets.services.asset_price_service._refresh_executor")
+    @patch("apps.assets.services.asset_price_service.PublicAssetSyncService.refresh_quote")
+    def test_stale_while_revalidate_serves_cache_and_coalesces_refreshes(self, mock_refresh_quote, mock_executor):
+        executor = MagicMock()
+        mock_executor.return_value = executor
+        price = AssetPrice.objects.create(asset=self.asset, price=Decimal("210.15"), source="FMP")
+        AssetPrice.objects.filter(asset=self.asset).update(as_of=timezone.now() - timedelta(minutes=11))
+        self.asset.refresh_from_db()
+        self.addCleanup(asset_price_service._REFRESHING.clear)
+
+        first = AssetPriceService.get_price_stale_while_revalidate(asset=self.asset, refresh_in_background=True)
+        second = AssetPriceService.get_price_stale_while_revalidate(asset=self.asset, refresh_in_background=True)
+
+        self.assertEqual(first.pk, price.pk)
+        self.assertEqual(second.pk, price.pk)
+        self.assertFalse(self.asset.current_price_is_fresh)
+        executor.submit.assert_called_once_with(asset_price_service._refresh_asset, self.asset.pk, "AAPL")
+        mock_refresh_quote.assert_not_called()
+
+    @patch("apps.assets.services.asset_price_service.PublicAssetSyncService.refresh_quote")
+    def test_stale_while_revalidate_attaches_synchronous_refresh_without_reloading(self, mock_refresh_quote):
+        refreshed = AssetPrice.objects.create(asset=self.asset, price=Decimal("215.00"), source="FMP")
+        self.asset = Asset.objects.get(pk=self.asset.pk)
+        AssetPrice.objects.filter(pk=refreshed.pk).update(as_of=timezone.now() - timedelta(minutes=11))
+        mock_refresh_quote.return_value = refreshed
+
+        with self.assertNumQueries(1):
+            result = AssetPriceService.get_price_stale_while_revalidate(asset=self.asset, refresh_in_background=False)
+
+        self.assertIs(result, refreshed)
+        self.assertIs(self.asset.price, refreshed)
+        self.assertTrue(self.asset.current_price_is_fresh)
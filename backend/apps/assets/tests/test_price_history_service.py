@@ -0,0 +1,63 @@
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+
+import numpy as np
+from django.test import TestCase
+
+from apps.assets.models import Asset, AssetMarketData, AssetPriceBar, AssetType
+from apps.assets.services import AssetPriceHistoryService
+
+
+def _bar(day: str, close: str) -> dict:
+    return {"date": day, "open": None, "high": None, "low": None, "close": Decimal(close), "volume": 100}
+
+
+class AssetPriceHistoryServiceTests(TestCase):
+    def setUp(self):
+        equity = AssetType.objects.create(name="Equity")
+        self.apple = Asset.objects.create(asset_type=equity, name="Apple Inc.", symbol="AAPL")
+        self.msft = Asset.objects.create(asset_type=equity, name="Microsoft", symbol="MSFT")
+        for asset in (self.apple, self.msft):
+            AssetMarketData.objects.create(
+                asset=asset,
+                provider=AssetMarketData.Provider.FMP,
+                provider_symbol=asset.symbol,
+                status=AssetMarketData.Status.TRACKED,
+            )
+
+    @patch("apps.assets.services.asset_price_history_service.FMP_PROVIDER.get_historical_prices")
+    def test_backfill_upserts_in_batches_and_resumes_on_latest_bar(self, mock_get_history):
+        AssetPriceBar.objects.create(asset=self.apple, date=date(2026, 1, 2), close=Decimal("190"))
+        mock_get_history.side_effect = lambda symbol, start, end: {
+            "AAPL": [_bar("2026-01-05", "191"), _bar("2026-01-02", "999")],
+            "MSFT": [_bar("2026-01-02", "400"), _bar("2026-01-05", "405")],
+        }[symbol]
+
+        result = AssetPriceHistoryService.backfill(
+            assets=[self.apple, self.msft],
+            end=date(2026, 1, 5),
+            max_workers=1,
+            batch_size=2,
+        )
+
+        self.assertEqual(result, {"assets": 2, "bars": 4, "errors": 0})
+        mock_get_history.assert_any_call("AAPL", start=date(2026, 1, 2), end=date(2026, 1, 5))
+        self.assertEqual(AssetPriceBar.objects.get(asset=self.apple, date=date(2026, 1, 2)).close, Decimal("999"))
+        self.assertEqual(AssetPriceBar.objects.filter(asset=self.msft).count(), 2)
+
+    def test_load_matrix_aligns_assets_on_a_shared_date_axis(self):
+        AssetPriceBar.objects.create(asset=self.apple, date=date(2026, 1, 2), close=Decimal("190"))
+        AssetPriceBar.objects.create(asset=self.apple, date=date(2026, 1, 5), close=Decimal("191"))
+        AssetPriceBar.objects.create(asset=self.msft, date=date(2026, 1, 5), close=Decimal("405"))
+
+        dates, asset_ids, matrix = AssetPriceHistoryService.load_matrix(
+            asset_ids=[self.apple.pk, self.msft.pk],
+            start=date(2026, 1, 1),
+            end=date(2026, 1, 31),
+        )
+
+        self.assertEqual([str(day) for day in dates], ["2026-01-02", "2026-01-05"])
+        self.assertEqual(asset_ids, [self.apple.pk, self.msft.pk])
+        self.assertEqual(matrix[1].tolist(), [191.0, 405.0])
+        self.assertTrue(np.isnan(matrix[0, 1]))
@@ -36,6 +36,33 @@ class PublicAssetSyncServiceTests(TestCase):
         self.assertEqual(asset.market_data.provider_symbol, "AAPL")
         self.assertEqual(asset.data["market_profile"]["exchange"], "NASDAQ")
 
+    @patch("apps.assets.services.public_asset_sync_service.FMP_PROVIDER.get_company_profile")
+    def test_sync_symbols_fetches_concurrently_then_writes_in_bulk(self, mock_get_company_profile):
+        existing = Asset.objects.create(asset_type=self.equity_type, name="Old Name", symbol="MSFT")
+        missing = Asset.objects.create(asset_type=self.equity_type, name="Gone", symbol="GONE")
+
+        def fake_profile(symbol):
+            if symbol == "GONE":
+                raise EmptyProviderResult("No profile found for GONE.")
+            return CompanyProfile(symbol=symbol, name=f"{symbol} Corp", currency="USD")
+
+        mock_get_company_profile.side_effect = fake_profile
+
+        result = PublicAssetSyncService.sync_symbols(
+            symbols=["aapl", "MSFT", "gone", "AAPL"],
+            max_workers=3,
+        )
+
+        self.assertEqual(result, {"created_or_updated": 2, "unresolved": 1, "errors": 0})
+        self.assertEqual(mock_get_company_profile.call_count, 3)
+        existing.refresh_from_db()
+        self.assertEqual(existing.name, "MSFT Corp")
+        self.assertEqual(Asset.objects.get(symbol="AAPL").market_data.status, AssetMarketData.Status.TRACKED)
+        self.assertEqual(
+            AssetMarketData.objects.get(asset=missing).status,
+            AssetMarketData.Status.UNRESOLVED,
+        )
+
     @patch("apps.assets.services.public_asset_sync_service.FMP_PROVIDER.get_quote")
     def test_refresh_quote_updates_asset_price_and_tracking_state(self, mock_get_quote):
         asset = Asset.objects.create(
@@ -64,8 +91,8 @@ class PublicAssetSyncServiceTests(TestCase):
         asset.refresh_from_db()
         self.assertEqual(asset.market_data.status, AssetMarketData.Status.TRACKED)
 
-    @patch("apps.assets.services.public_asset_sync_service.FMP_PROVIDER.get_quote")
-    def test_refresh_quotes_marks_assets_stale_when_provider_returns_empty(self, mock_get_quote):
+    @patch("apps.assets.services.public_asset_sync_service.FMP_PROVIDER.get_quotes")
+    def test_refresh_quotes_marks_assets_stale_when_provider_returns_empty(self, mock_get_quotes):
         asset = Asset.objects.create(
             asset_type=self.equity_type,
             name="Old Co",
@@ -77,7 +104,7 @@ class PublicAssetSyncServiceTests(TestCase):
             provider_symbol="OLD",
             status=AssetMarketData.Status.TRACKED,
         )
-        mock_get_quote.side_effect = EmptyProviderResult("No quote found for OLD.")
+        mock_get_quotes.return_value = {}
 
         result = PublicAssetSyncService.refresh_quotes_for_assets(assets=[asset])
 
@@ -87,6 +114,40 @@ class PublicAssetSyncServiceTests(TestCase):
         self.assertEqual(asset.market_data.status, AssetMarketData.Status.STALE)
         self.assertIn("No quote found", asset.market_data.last_error)
 
+    @patch("apps.assets.services.public_asset_sync_service.FMP_PROVIDER.get_quotes")
+    def test_refresh_quotes_for_assets_upserts_prices_in_batches(self, mock_get_quotes):
+        apple = Asset.objects.create(asset_type=self.equity_type, name="Apple Inc.", symbol="AAPL")
+        AssetMarketData.objects.create(
+            asset=apple,
+            provider=AssetMarketData.Provider.FMP,
+            provider_symbol="AAPL",
+            status=AssetMarketData.Status.STALE,
+        )
+        AssetPrice.objects.create(asset=apple, price=Decimal("150"))
+        microsoft = Asset.objects.create(asset_type=self.equity_type, name="Microsoft", symbol="MSFT")
+        nvidia = Asset.objects.create(asset_type=self.equity_type, name="NVIDIA", symbol="NVDA")
+        mock_get_quotes.side_effect = lambda symbols, batch_size: {
+            symbol: QuoteSnapshot(symbol=symbol, price=Decimal("100"), source="FMP")
+            for symbol in symbols
+        }
+
+        result = PublicAssetSyncService.refresh_quotes_for_assets(
+            assets=[apple, microsoft, nvidia],
+            batch_size=2,
+        )
+
+        self.assertEqual(result["updated"], 3)
+        self.assertEqual(result["requests"], 2)
+        self.assertEqual(mock_get_quotes.call_count, 2)
+        mock_get_quotes.assert_any_call(["AAPL", "MSFT"], batch_size=2)
+        self.assertEqual(AssetPrice.objects.filter(price=Decimal("100")).count(), 3)
+        self.assertEqual(AssetPrice.objects.filter(asset=apple).count(), 1)
+        self.assertEqual(
+            AssetMarketData.objects.filter(status=AssetMarketData.Status.TRACKED).count(),
+            3,
+        )
+        self.assertEqual(AssetMarketData.objects.get(asset=nvidia).provider_symbol, "NVDA")
+
     @patch("apps.assets.services.public_asset_sync_service.FMP_PROVIDER.get_quote")
     def test_refresh_quote_creates_price_cache_row(self, mock_get_quote):
         asset = Asset.objects.create(
@@ -107,13 +168,13 @@ class PublicAssetSyncServiceTests(TestCase):
         self.assertTrue(AssetPrice.objects.filter(asset=asset).exists())
 
     @patch("apps.assets.services.public_asset_sync_service.FMP_PROVIDER.get_actively_traded_symbols")
-    @patch("apps.assets.services.public_asset_sync_service.FMP_PROVIDER.get_stock_list")
+    @patch("apps.assets.services.public_asset_sync_service.FMP_PROVIDER.iter_stock_list")
     def test_sync_equity_directory_uses_stock_list_and_active_symbols(
         self,
-        mock_get_stock_list,
+        mock_iter_stock_list,
         mock_get_actively_traded_symbols,
     ):
-        mock_get_stock_list.return_value = [
+        mock_iter_stock_list.return_value = [
             {"symbol": "AAPL", "name": "Apple Inc.", "exchange": "NASDAQ", "currency": "USD"},
             {"symbol": "OLD", "name": "Old Co", "exchange": "NYSE", "currency": "USD"},
         ]
@@ -128,3 +189,63 @@ class PublicAssetSyncServiceTests(TestCase):
         self.assertFalse(old.is_active)
         self.assertEqual(aapl.market_data.status, AssetMarketData.Status.TRACKED)
         self.assertEqual(old.market_data.status, AssetMarketData.Status.STALE)
+
+    @patch("apps.assets.services.public_asset_sync_service.FMP_PROVIDER.get_actively_traded_symbols")
+    @patch("apps.assets.services.public_asset_sync_service.FMP_PROVIDER.iter_stock_list")
+    def test_sync_equity_directory_only_writes_changed_rows(
+        self,
+        mock_iter_stock_list,
+        mock_get_actively_traded_symbols,
+    ):
+        rows = [
+            {"symbol": "AAPL", "name": "Apple Inc.", "exchange": "NASDAQ", "currency": "USD"},
+            {"symbol": "MSFT", "name": "Microsoft", "exchange": "NASDAQ", "currency": "USD"},
+            {"symbol": "GONE", "name": "Gone Co", "exchange": "NYSE", "currency": "USD"},
+        ]
+        mock_iter_stock_list.return_value = rows
+        mock_get_actively_traded_symbols.return_value = {"AAPL", "MSFT", "GONE"}
+        PublicAssetSyncService.sync_equity_directory(batch_size=2)
+
+        with self.assertNumQueries(2):
+            result = PublicAssetSyncService.sync_equity_directory(batch_size=2)
+        self.assertEqual((result["created"], result["updated"], result["unchanged"]), (0, 0, 3))
+
+        mock_iter_stock_list.return_value = [
+            rows[0],
+            {**rows[1], "name": "Microsoft Corporation"},
+        ]
+        result = PublicAssetSyncService.sync_equity_directory(batch_size=2)
+
+        self.assertEqual(
+            (result["created"], result["updated"], result["unchanged"], result["deactivated"]),
+            (0, 1, 1, 1),
+        )
+        self.assertEqual(Asset.objects.get(symbol="MSFT").name, "Microsoft Corporation")
+        gone = Asset.objects.get(symbol="GONE")
+        self.assertFalse(gone.is_active)
+        self.assertEqual(gone.market_data.status, AssetMarketData.Status.STALE)
+
+    @patch("apps.assets.services.public_asset_sync_service.FMP_PROVIDER.get_actively_traded_symbols")
+    @patch("apps.assets.services.public_asset_sync_service.FMP_PROVIDER.iter_stock_list")
+    def test_sync_equity_directory_reactivates_returning_symbol(
+        self,
+        mock_iter_stock_list,
+        mock_get_actively_traded_symbols,
+    ):
+        row = {"symbol": "BACK", "name": "Back Co", "exchange": "NYSE", "currency": "USD"}
+        mock_get_actively_traded_symbols.return_value = {"BACK"}
+        mock_iter_stock_list.return_value = [row]
+        PublicAssetSyncService.sync_equity_directory()
+
+        mock_iter_stock_list.return_value = []
+        result = PublicAssetSyncService.sync_equity_directory()
+        self.assertEqual(result["deactivated"], 1)
+        self.assertFalse(Asset.objects.get(symbol="BACK").is_active)
+
+        mock_iter_stock_list.return_value = [row]
+        result = PublicAssetSyncService.sync_equity_directory()
+
+        self.assertEqual((result["updated"], result["unchanged"]), (1, 0))
+        back = Asset.objects.get(symbol="BACK")
+        self.assertTrue(back.is_active)
+        self.assertEqual(back.market_data.status, AssetMarketData.Status.TRACKED)
@@ -28,8 +28,7 @@ def _hydrate_price_if_needed(*, asset: Asset):
     if asset.asset_type.slug not in {"equity", "crypto", "cryptocurrency", "commodity", "precious_metal"}:
         return asset
 
-    AssetPriceService.get_current_price(asset=asset)
-    asset.refresh_from_db()
+    AssetPriceService.get_price_stale_while_revalidate(asset=asset)
     return asset
 
 
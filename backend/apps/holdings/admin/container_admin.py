@@ -31,6 +31,11 @@ class ContainerAdmin(admin.ModelAdmin):
         "external_parent_id",
     )
     readonly_fields = (
+        "current_value",
+        "cost_basis",
+        "unrealized_gain",
+        "totals_stale",
+        "totals_refreshed_at",
         "created_at",
         "updated_at",
     )
@@ -24,6 +24,11 @@ class PortfolioAdmin(admin.ModelAdmin):
         "profile__user__email",
     )
     readonly_fields = (
+        "current_value",
+        "cost_basis",
+        "unrealized_gain",
+        "totals_stale",
+        "totals_refreshed_at",
         "created_at",
         "updated_at",
     )
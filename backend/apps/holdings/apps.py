@@ -5,3 +5,6 @@ class HoldingsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.holdings"
     label = "holdings"
+
+    def ready(self):
+        import apps.holdings.signals  # noqa: F401
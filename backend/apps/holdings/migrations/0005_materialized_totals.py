@@ -0,0 +1,64 @@
+# Generated by Django 6.0.3 on 2026-10-17 00:56
+
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('holdings', '0004_remove_dashboardlayoutstate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='container',
+            name='cost_basis',
+            field=models.DecimalField(decimal_places=18, default=Decimal('0'), help_text='Materialized total cost basis in profile currency.', max_digits=50),
+        ),
+        migrations.AddField(
+            model_name='container',
+            name='current_value',
+            field=models.DecimalField(decimal_places=18, default=Decimal('0'), help_text='Materialized total current value in profile currency.', max_digits=50),
+        ),
+        migrations.AddField(
+            model_name='container',
+            name='totals_refreshed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='container',
+            name='totals_stale',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddField(
+            model_name='container',
+            name='unrealized_gain',
+            field=models.DecimalField(decimal_places=18, default=Decimal('0'), help_text='Materialized total unrealized gain in profile currency.', max_digits=50),
+        ),
+        migrations.AddField(
+            model_name='portfolio',
+            name='cost_basis',
+            field=models.DecimalField(decimal_places=18, default=Decimal('0'), help_text='Materialized total cost basis in profile currency.', max_digits=50),
+        ),
+        migrations.AddField(
+            model_name='portfolio',
+            name='current_value',
+            field=models.DecimalField(decimal_places=18, default=Decimal('0'), help_text='Materialized total current value in profile currency.', max_digits=50),
+        ),
+        migrations.AddField(
+            model_name='portfolio',
+            name='totals_refreshed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='portfolio',
+            name='totals_stale',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddField(
+            model_name='portfolio',
+            name='unrealized_gain',
+            field=models.DecimalField(decimal_places=18, default=Decimal('0'), help_text='Materialized total unrealized gain in profile currency.', max_digits=50),
+        ),
+    ]
@@ -1,3 +1,5 @@
+from decimal import Decimal
+
 from django.core.exceptions import ValidationError
 from django.db import models
 
@@ -23,6 +25,27 @@ class Portfolio(models.Model):
     )
     is_default = models.BooleanField(default=False)
 
+    current_value = models.DecimalField(
+        max_digits=50,
+        decimal_places=18,
+        default=Decimal("0"),
+        help_text="Materialized total current value in profile currency.",
+    )
+    cost_basis = models.DecimalField(
+        max_digits=50,
+        decimal_places=18,
+        default=Decimal("0"),
+        help_text="Materialized total cost basis in profile currency.",
+    )
+    unrealized_gain = models.DecimalField(
+        max_digits=50,
+        decimal_places=18,
+        default=Decimal("0"),
+        help_text="Materialized total unrealized gain in profile currency.",
+    )
+    totals_stale = models.BooleanField(default=True)
+    totals_refreshed_at = models.DateTimeField(null=True, blank=True)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -20,12 +20,20 @@ class ContainerSerializer(serializers.ModelSerializer):
             "external_id",
             "external_parent_id",
             "last_synced_at",
+            "current_value",
+            "cost_basis",
+            "unrealized_gain",
+            "totals_refreshed_at",
             "created_at",
             "updated_at",
         ]
         read_only_fields = [
             "id",
             "portfolio_name",
+            "current_value",
+            "cost_basis",
+            "unrealized_gain",
+            "totals_refreshed_at",
             "created_at",
             "updated_at",
         ]
@@ -2,7 +2,9 @@ from rest_framework import serializers
 
 from apps.assets.models import Asset, AssetType
 from apps.holdings.models import Container, Holding, HoldingFactDefinition, HoldingFactValue, HoldingOverride, Portfolio
+from apps.holdings.services.holding_formula_service import HoldingFormulaService
 from apps.holdings.services.value_utils import parse_typed_value
+from apps.integrations.services import FXRateMatrix
 
 
 class HoldingFactDefinitionSerializer(serializers.ModelSerializer):
@@ -106,6 +108,28 @@ class HoldingOverrideUpsertSerializer(serializers.Serializer):
     value = serializers.JSONField(required=False, allow_null=True)
 
 
+class HoldingFormulaDecimalField(serializers.DecimalField):
+    def __init__(self, *, identifier: str, **kwargs):
+        self.identifier = identifier
+        kwargs.setdefault("read_only", True)
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        formula_values = self.context.setdefault("formula_values", {})
+        if instance.pk is not None and instance.pk not in formula_values:
+            # Evaluate every summary formula for this holding at once, sharing
+            # one FX matrix across the whole serializer.
+            if "fx_rates" not in self.context:
+                self.context["fx_rates"] = FXRateMatrix()
+            formula_values.update(
+                HoldingFormulaService.evaluate_batch(holdings=[instance], fx_rates=self.context["fx_rates"])
+            )
+        values = formula_values.get(instance.pk, {})
+        if self.identifier in values:
+            return values[self.identifier]
+        return super().get_attribute(instance)
+
+
 class HoldingSerializer(serializers.ModelSerializer):
     asset_name = serializers.CharField(source="asset.name", read_only=True)
     asset_symbol = serializers.CharField(source="asset.symbol", read_only=True)
@@ -127,12 +151,16 @@ class HoldingSerializer(serializers.ModelSerializer):
     effective_current_value = serializers.DecimalField(max_digits=50, decimal_places=18, read_only=True)
     effective_sector = serializers.CharField(read_only=True, allow_null=True)
     effective_industry = serializers.CharField(read_only=True, allow_null=True)
-    fx_rate = serializers.DecimalField(max_digits=30, decimal_places=10, read_only=True)
-    market_value = serializers.DecimalField(max_digits=50, decimal_places=18, read_only=True)
-    current_value_profile = serializers.DecimalField(max_digits=50, decimal_places=18, read_only=True)
-    cost_basis_profile = serializers.DecimalField(max_digits=50, decimal_places=18, read_only=True)
-    unrealized_gain = serializers.DecimalField(max_digits=50, decimal_places=18, read_only=True)
-    unrealized_gain_pct = serializers.DecimalField(max_digits=50, decimal_places=18, read_only=True)
+    fx_rate = HoldingFormulaDecimalField(identifier="fx_rate", max_digits=30, decimal_places=10)
+    market_value = HoldingFormulaDecimalField(identifier="market_value", max_digits=50, decimal_places=18)
+    current_value_profile = HoldingFormulaDecimalField(identifier="current_value", max_digits=50, decimal_places=18)
+    cost_basis_profile = HoldingFormulaDecimalField(identifier="cost_basis", max_digits=50, decimal_places=18)
+    unrealized_gain = HoldingFormulaDecimalField(identifier="unrealized_gain", max_digits=50, decimal_places=18)
+    unrealized_gain_pct = HoldingFormulaDecimalField(
+        identifier="unrealized_gain_pct",
+        max_digits=50,
+        decimal_places=18,
+    )
     fact_values = HoldingFactValueSerializer(many=True, read_only=True)
     overrides = HoldingOverrideSerializer(many=True, read_only=True)
     container_name = serializers.CharField(source="container.name", read_only=True)
@@ -197,7 +225,11 @@ class HoldingSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
 
-
+    def __init__(self, *args, fields: tuple[str, ...] | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
 
 
 class HoldingCreateSerializer(serializers.Serializer):
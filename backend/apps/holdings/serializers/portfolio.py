@@ -15,6 +15,10 @@ class PortfolioSerializer(serializers.ModelSerializer):
             "name",
             "kind",
             "is_default",
+            "current_value",
+            "cost_basis",
+            "unrealized_gain",
+            "totals_refreshed_at",
             "created_at",
             "updated_at",
         ]
@@ -22,6 +26,10 @@ class PortfolioSerializer(serializers.ModelSerializer):
             "id",
             "profile",
             "profile_email",
+            "current_value",
+            "cost_basis",
+            "unrealized_gain",
+            "totals_refreshed_at",
             "created_at",
             "updated_at",
         ]
@@ -1,7 +1,10 @@
 from .container_service import ContainerService
 from .holding_formula_service import HoldingFormulaService
+from .holding_list_service import HoldingListService
 from .holding_service import HoldingService
 from .holding_value_service import HoldingValueService
 from .portfolio_service import PortfolioService
+from .portfolio_totals_service import PortfolioTotalsService
+from .portfolio_valuation_service import PortfolioValuationService
 
 __all__ = ["PortfolioService", "ContainerService", "HoldingService"]
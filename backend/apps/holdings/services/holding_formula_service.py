@@ -1,7 +1,8 @@
 from decimal import Decimal
+from typing import Iterable
 
 from apps.holdings.services.holding_value_service import HoldingValueService
-from apps.integrations.services import FXRateService
+from apps.integrations.services import FXRateMatrix
 
 
 class HoldingFormulaService:
@@ -13,6 +14,18 @@ class HoldingFormulaService:
         "unrealized_gain",
         "unrealized_gain_pct",
     }
+    SUMMARY_IDENTIFIERS = (
+        "fx_rate",
+        "market_value",
+        "current_value",
+        "cost_basis",
+        "unrealized_gain",
+        "unrealized_gain_pct",
+    )
+
+    @staticmethod
+    def _normalize_identifier(identifier: str) -> str:
+        return (identifier or "").strip().lower()
 
     @staticmethod
     def _asset_currency(*, holding) -> str:
@@ -23,6 +36,12 @@ class HoldingFormulaService:
         profile = holding.container.portfolio.profile
         return (getattr(profile, "currency", "") or "").strip().upper()
 
+    @staticmethod
+    def _currency_pair(*, holding) -> tuple[str, str]:
+        asset_currency = HoldingFormulaService._asset_currency(holding=holding)
+        profile_currency = HoldingFormulaService._profile_currency(holding=holding)
+        return (asset_currency or profile_currency, profile_currency or asset_currency)
+
     @staticmethod
     def _to_decimal(value) -> Decimal | None:
         if value is None:
@@ -30,80 +49,121 @@ class HoldingFormulaService:
         return Decimal(str(value))
 
     @staticmethod
-    def evaluate(*, holding, identifier: str):
-        normalized = (identifier or "").strip().lower()
-
-        if normalized == "fx_rate":
-            asset_currency = HoldingFormulaService._asset_currency(holding=holding)
-            profile_currency = HoldingFormulaService._profile_currency(holding=holding)
-            return FXRateService.get_rate(
-                base_currency=asset_currency or profile_currency,
-                quote_currency=profile_currency or asset_currency,
-            )
+    def _fx_rate(*, holding, fx_rates: FXRateMatrix) -> Decimal:
+        base_currency, quote_currency = HoldingFormulaService._currency_pair(holding=holding)
+        return fx_rates.get_rate(base_currency=base_currency, quote_currency=quote_currency)
 
-        if normalized == "market_value":
-            quantity = HoldingFormulaService._to_decimal(
-                HoldingValueService.get_effective_value(holding=holding, key="quantity")
-            )
-            price = HoldingFormulaService._to_decimal(
-                HoldingValueService.get_effective_value(holding=holding, key="price")
+    @staticmethod
+    def _evaluate(*, holding, identifier: str, memo: dict, fx_rates: FXRateMatrix):
+        normalized = HoldingFormulaService._normalize_identifier(identifier)
+        if normalized not in memo:
+            memo[normalized] = HoldingFormulaService._compute(
+                holding=holding,
+                identifier=normalized,
+                memo=memo,
+                fx_rates=fx_rates,
             )
+        return memo[normalized]
+
+    @staticmethod
+    def _compute(*, holding, identifier: str, memo: dict, fx_rates: FXRateMatrix):
+        def dependency(name: str):
+            return HoldingFormulaService._evaluate(holding=holding, identifier=name, memo=memo, fx_rates=fx_rates)
+
+        if identifier == "fx_rate":
+            return HoldingFormulaService._fx_rate(holding=holding, fx_rates=fx_rates)
+
+        if identifier == "market_value":
+            quantity = HoldingFormulaService._to_decimal(dependency("quantity"))
+            price = HoldingFormulaService._to_decimal(dependency("price"))
             if quantity is None or price is None:
                 return None
             return quantity * price
 
-        if normalized == "current_value":
-            market_value = HoldingFormulaService.evaluate(holding=holding, identifier="market_value")
+        if identifier == "current_value":
+            market_value = dependency("market_value")
             if market_value is None:
                 return None
-            fx_rate = HoldingFormulaService.evaluate(holding=holding, identifier="fx_rate")
-            return market_value * fx_rate
+            return market_value * dependency("fx_rate")
 
-        if normalized == "cost_basis":
-            quantity = HoldingFormulaService._to_decimal(
-                HoldingValueService.get_effective_value(holding=holding, key="quantity")
-            )
-            unit_cost_basis = HoldingFormulaService._to_decimal(
-                HoldingValueService.get_effective_value(holding=holding, key="unit_cost_basis")
-            )
+        if identifier == "cost_basis":
+            quantity = HoldingFormulaService._to_decimal(dependency("quantity"))
+            unit_cost_basis = HoldingFormulaService._to_decimal(dependency("unit_cost_basis"))
             if quantity is None or unit_cost_basis is None:
                 return None
-            fx_rate = HoldingFormulaService.evaluate(holding=holding, identifier="fx_rate")
-            return quantity * unit_cost_basis * fx_rate
+            return quantity * unit_cost_basis * dependency("fx_rate")
 
-        if normalized == "unrealized_gain":
-            current_value = HoldingFormulaService.evaluate(holding=holding, identifier="current_value")
-            cost_basis = HoldingFormulaService.evaluate(holding=holding, identifier="cost_basis")
+        if identifier == "unrealized_gain":
+            current_value = dependency("current_value")
+            cost_basis = dependency("cost_basis")
             if current_value is None or cost_basis is None:
                 return None
             return current_value - cost_basis
 
-        if normalized == "unrealized_gain_pct":
-            unrealized_gain = HoldingFormulaService.evaluate(holding=holding, identifier="unrealized_gain")
-            cost_basis = HoldingFormulaService.evaluate(holding=holding, identifier="cost_basis")
+        if identifier == "unrealized_gain_pct":
+            unrealized_gain = dependency("unrealized_gain")
+            cost_basis = dependency("cost_basis")
             if unrealized_gain is None or cost_basis in (None, Decimal("0")):
                 return None
             return unrealized_gain / cost_basis
 
-        return HoldingValueService.get_effective_value(holding=holding, key=normalized)
+        return HoldingValueService.get_effective_value(holding=holding, key=identifier)
 
     @staticmethod
-    def evaluate_many(*, holding, identifiers: list[str] | tuple[str, ...]):
+    def evaluate(*, holding, identifier: str, fx_rates: FXRateMatrix | None = None):
+        return HoldingFormulaService._evaluate(
+            holding=holding,
+            identifier=identifier,
+            memo={},
+            fx_rates=fx_rates or FXRateMatrix(),
+        )
+
+    @staticmethod
+    def evaluate_many(
+        *,
+        holding,
+        identifiers: list[str] | tuple[str, ...],
+        fx_rates: FXRateMatrix | None = None,
+    ):
+        memo: dict = {}
+        fx_rates = fx_rates or FXRateMatrix()
         return {
-            identifier: HoldingFormulaService.evaluate(holding=holding, identifier=identifier)
+            identifier: HoldingFormulaService._evaluate(
+                holding=holding,
+                identifier=identifier,
+                memo=memo,
+                fx_rates=fx_rates,
+            )
             for identifier in identifiers
         }
 
     @staticmethod
-    def summary(*, holding) -> dict:
+    def evaluate_batch(
+        *,
+        holdings: Iterable,
+        identifiers: list[str] | tuple[str, ...] | None = None,
+        fx_rates: FXRateMatrix | None = None,
+    ) -> dict[int, dict]:
+        requested = tuple(identifiers or HoldingFormulaService.SUMMARY_IDENTIFIERS)
+        fx_rates = fx_rates or FXRateMatrix()
+        results: dict[int, dict] = {}
+        for holding in holdings:
+            memo: dict = {}
+            results[holding.pk] = {
+                identifier: HoldingFormulaService._evaluate(
+                    holding=holding,
+                    identifier=identifier,
+                    memo=memo,
+                    fx_rates=fx_rates,
+                )
+                for identifier in requested
+            }
+        return results
+
+    @staticmethod
+    def summary(*, holding, fx_rates: FXRateMatrix | None = None) -> dict:
         return HoldingFormulaService.evaluate_many(
             holding=holding,
-            identifiers=[
-                "fx_rate",
-                "market_value",
-                "current_value",
-                "cost_basis",
-                "unrealized_gain",
-                "unrealized_gain_pct",
-            ],
+            identifiers=HoldingFormulaService.SUMMARY_IDENTIFIERS,
+            fx_rates=fx_rates,
         )
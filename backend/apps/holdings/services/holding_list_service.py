@@ -0,0 +1,128 @@
+import base64
+import binascii
+import json
+from typing import Iterable, Iterator
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q, QuerySet
+
+from apps.holdings.models import Holding
+from apps.holdings.services.holding_formula_service import HoldingFormulaService
+
+
+class HoldingListService:
+    FORMULA_FIELDS = {
+        "fx_rate": "fx_rate",
+        "market_value": "market_value",
+        "current_value_profile": "current_value",
+        "cost_basis_profile": "cost_basis",
+        "unrealized_gain": "unrealized_gain",
+        "unrealized_gain_pct": "unrealized_gain_pct",
+    }
+    VALUE_FIELDS = {
+        "effective_price",
+        "effective_current_value",
+        "effective_sector",
+        "effective_industry",
+        "fact_values",
+        "overrides",
+        *FORMULA_FIELDS,
+    }
+
+    @staticmethod
+    def page_size() -> int:
+        return max(int(getattr(settings, "HOLDINGS_PAGE_SIZE", 100)), 1)
+
+    @staticmethod
+    def max_page_size() -> int:
+        return max(int(getattr(settings, "HOLDINGS_MAX_PAGE_SIZE", 1000)), 1)
+
+    @staticmethod
+    def parse_fields(raw: str | None, *, allowed: Iterable[str]) -> tuple[str, ...] | None:
+        if not raw:
+            return None
+        allowed = list(allowed)
+        requested = [field.strip() for field in raw.split(",") if field.strip()]
+        unknown = sorted(set(requested) - set(allowed))
+        if unknown:
+            raise ValidationError({"fields": f"Unknown fields: {', '.join(unknown)}."})
+        return tuple(field for field in allowed if field in requested)
+
+    @staticmethod
+    def parse_limit(raw: str | None) -> int:
+        if not raw:
+            return HoldingListService.page_size()
+        try:
+            limit = int(raw)
+        except ValueError as exc:
+            raise ValidationError({"limit": "Limit must be an integer."}) from exc
+        return min(max(limit, 1), HoldingListService.max_page_size())
+
+    @staticmethod
+    def formula_identifiers(fields: Iterable[str] | None) -> tuple[str, ...]:
+        if fields is None:
+            return tuple(HoldingFormulaService.SUMMARY_IDENTIFIERS)
+        return tuple(
+            HoldingListService.FORMULA_FIELDS[field]
+            for field in fields
+            if field in HoldingListService.FORMULA_FIELDS
+        )
+
+    @staticmethod
+    def project(queryset: QuerySet, *, fields: Iterable[str] | None) -> QuerySet:
+        if fields is None or HoldingListService.VALUE_FIELDS.intersection(fields):
+            return queryset
+        return queryset.prefetch_related(None)
+
+    @staticmethod
+    def evaluate(*, holdings: list[Holding], fields: Iterable[str] | None) -> dict:
+        identifiers = HoldingListService.formula_identifiers(fields)
+        if not identifiers or not holdings:
+            return {}
+        return HoldingFormulaService.evaluate_batch(holdings=holdings, identifiers=identifiers)
+
+    @staticmethod
+    def encode_cursor(holding: Holding) -> str:
+        raw = json.dumps([holding.container_id, str(holding.asset_id), holding.pk])
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> tuple[int, str, int]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            container_id, asset_id, holding_id = json.loads(base64.urlsafe_b64decode(padded))
+            return int(container_id), str(asset_id), int(holding_id)
+        except (binascii.Error, ValueError, TypeError) as exc:
+            raise ValidationError({"cursor": "Invalid cursor."}) from exc
+
+    @staticmethod
+    def after(queryset: QuerySet, *, cursor: str | None) -> QuerySet:
+        queryset = queryset.order_by("container_id", "asset_id", "id")
+        if not cursor:
+            return queryset
+        container_id, asset_id, holding_id = HoldingListService.decode_cursor(cursor)
+        return queryset.filter(
+            Q(container_id__gt=container_id)
+            | Q(container_id=container_id, asset_id__gt=asset_id)
+            | Q(container_id=container_id, asset_id=asset_id, id__gt=holding_id)
+        )
+
+    @staticmethod
+    def page(queryset: QuerySet, *, cursor: str | None, limit: int) -> tuple[list[Holding], str | None]:
+        holdings = list(HoldingListService.after(queryset, cursor=cursor)[:limit + 1])
+        if len(holdings) <= limit:
+            return holdings, None
+        holdings = holdings[:limit]
+        return holdings, HoldingListService.encode_cursor(holdings[-1])
+
+    @staticmethod
+    def iter_pages(queryset: QuerySet, *, chunk_size: int | None = None) -> Iterator[list[Holding]]:
+        chunk_size = chunk_size or HoldingListService.max_page_size()
+        cursor = None
+        while True:
+            holdings, cursor = HoldingListService.page(queryset, cursor=cursor, limit=chunk_size)
+            if holdings:
+                yield holdings
+            if cursor is None:
+                return
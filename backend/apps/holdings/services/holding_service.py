@@ -4,6 +4,7 @@ from django.core.exceptions import ValidationError
 
 from apps.assets.models import Asset
 from apps.holdings.models import Container, Holding
+from apps.holdings.services.portfolio_totals_service import PortfolioTotalsService
 
 
 class HoldingService:
@@ -28,6 +29,7 @@ class HoldingService:
             data=data or {},
         )
         holding.save()
+        PortfolioTotalsService.mark_holding_stale(holding=holding)
         return holding
 
     @staticmethod
@@ -56,6 +58,7 @@ class HoldingService:
             holding.data = data
 
         holding.save()
+        PortfolioTotalsService.mark_holding_stale(holding=holding)
         return holding
 
     @staticmethod
@@ -90,4 +93,5 @@ class HoldingService:
         holding.notes = (notes or "").strip()
         holding.data = data or holding.data
         holding.save()
+        PortfolioTotalsService.mark_holding_stale(holding=holding)
         return holding
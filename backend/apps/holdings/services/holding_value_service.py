@@ -3,6 +3,7 @@ from decimal import Decimal
 from django.core.exceptions import ValidationError
 
 from apps.holdings.models import Holding, HoldingFactDefinition, HoldingFactValue, HoldingOverride, Portfolio
+from apps.holdings.services.portfolio_totals_service import PortfolioTotalsService
 from apps.holdings.services.value_utils import parse_typed_value, serialize_typed_value
 
 
@@ -49,6 +50,7 @@ class HoldingValueService:
         if is_active is not None:
             definition.is_active = is_active
         definition.save()
+        PortfolioTotalsService.mark_portfolios_stale(portfolio_ids=[definition.portfolio_id])
         return definition
 
     @staticmethod
@@ -59,6 +61,7 @@ class HoldingValueService:
             definition=definition,
             defaults={"value": serialized},
         )
+        PortfolioTotalsService.mark_holding_stale(holding=holding)
         return fact_value
 
     @staticmethod
@@ -69,15 +72,15 @@ class HoldingValueService:
             key=key.strip().lower(),
             defaults={"data_type": data_type, "value": serialized},
         )
+        PortfolioTotalsService.mark_holding_stale(holding=holding)
         return override
 
     @staticmethod
     def get_override_value(*, holding: Holding, key: str):
-        override = next(
-            (item for item in getattr(holding, "_prefetched_objects_cache", {}).get("overrides", []) if item.key == key),
-            None,
-        )
-        if override is None:
+        prefetched = getattr(holding, "_prefetched_objects_cache", {})
+        if "overrides" in prefetched:
+            override = next((item for item in prefetched["overrides"] if item.key == key), None)
+        else:
             override = getattr(holding, "overrides", HoldingOverride.objects.none()).filter(key=key).first()
         if override is None:
             return None
@@ -139,14 +142,13 @@ class HoldingValueService:
         if builtin_value is not None:
             return builtin_value
 
-        definition = next(
-            (
-                item for item in getattr(holding, "_prefetched_objects_cache", {}).get("fact_values", [])
-                if item.definition.key == key
-            ),
-            None,
-        )
-        if definition is None:
+        prefetched = getattr(holding, "_prefetched_objects_cache", {})
+        if "fact_values" in prefetched:
+            definition = next(
+                (item for item in prefetched["fact_values"] if item.definition.key == key),
+                None,
+            )
+        else:
             definition = (
                 getattr(holding, "fact_values", HoldingFactValue.objects.none())
                 .select_related("definition")
@@ -0,0 +1,169 @@
+from collections import defaultdict
+from decimal import Decimal
+from typing import Iterable
+
+from django.db.models import Q, Sum
+from django.utils import timezone
+
+from apps.holdings.models import Container, Holding, Portfolio
+
+
+class PortfolioTotalsService:
+    TOTAL_FIELDS = ("current_value", "cost_basis", "unrealized_gain")
+
+    @staticmethod
+    def _zero_totals() -> dict:
+        return {field: Decimal("0") for field in PortfolioTotalsService.TOTAL_FIELDS}
+
+    @staticmethod
+    def mark_containers_stale(*, container_ids: Iterable[int]) -> None:
+        container_ids = list(container_ids)
+        if not container_ids:
+            return
+        Container.objects.filter(pk__in=container_ids).update(totals_stale=True)
+        Portfolio.objects.filter(containers__pk__in=container_ids).update(totals_stale=True)
+
+    @staticmethod
+    def mark_portfolios_stale(*, portfolio_ids: Iterable[int]) -> None:
+        portfolio_ids = list(portfolio_ids)
+        if not portfolio_ids:
+            return
+        Container.objects.filter(portfolio_id__in=portfolio_ids).update(totals_stale=True)
+        Portfolio.objects.filter(pk__in=portfolio_ids).update(totals_stale=True)
+
+    @staticmethod
+    def mark_assets_stale(*, asset_ids: Iterable) -> None:
+        asset_ids = list(asset_ids)
+        if not asset_ids:
+            return
+        Container.objects.filter(holdings__asset_id__in=asset_ids).update(totals_stale=True)
+        Portfolio.objects.filter(containers__holdings__asset_id__in=asset_ids).update(totals_stale=True)
+
+    @staticmethod
+    def mark_currencies_stale(*, currencies: Iterable[str]) -> None:
+        """
+        Mark containers whose valuation may convert through ``currencies``:
+        the profile (quote) side or an asset's (base) side, which also covers
+        rates used as one leg of a cross rate.
+        """
+        currencies = sorted({(currency or "").strip().upper() for currency in currencies} - {""})
+        if not currencies:
+            return
+        container_ids = set(
+            Container.objects.filter(
+                Q(portfolio__profile__currency__in=currencies)
+                | Q(holdings__asset__data__currency__in=currencies)
+                | Q(holdings__overrides__key="currency")
+            ).values_list("pk", flat=True)
+        )
+        PortfolioTotalsService.mark_containers_stale(container_ids=container_ids)
+
+    @staticmethod
+    def mark_all_stale() -> None:
+        Container.objects.update(totals_stale=True)
+        Portfolio.objects.update(totals_stale=True)
+
+    @staticmethod
+    def _holdings(*, container_ids: list[int]):
+        return (
+            Holding.objects.select_related(
+                "container__portfolio__profile",
+                "asset",
+                "asset__price",
+                "asset__market_data",
+            )
+            .prefetch_related("fact_values__definition", "overrides")
+            .filter(container_id__in=container_ids)
+        )
+
+    @staticmethod
+    def _recompute_containers(*, container_ids: list[int], now) -> None:
+        from apps.holdings.services.holding_formula_service import HoldingFormulaService
+
+        # Clear the flag before reading so a concurrent invalidation survives this pass.
+        Container.objects.filter(pk__in=container_ids).update(totals_stale=False)
+
+        holdings = list(PortfolioTotalsService._holdings(container_ids=container_ids))
+        values = HoldingFormulaService.evaluate_batch(
+            holdings=holdings,
+            identifiers=PortfolioTotalsService.TOTAL_FIELDS,
+        )
+        totals = defaultdict(PortfolioTotalsService._zero_totals)
+        for holding in holdings:
+            for field, value in values[holding.pk].items():
+                if value is not None:
+                    totals[holding.container_id][field] += value
+
+        containers = list(Container.objects.filter(pk__in=container_ids))
+        for container in containers:
+            for field, value in totals[container.pk].items():
+                setattr(container, field, value)
+            container.totals_refreshed_at = now
+        Container.objects.bulk_update(
+            containers,
+            fields=[*PortfolioTotalsService.TOTAL_FIELDS, "totals_refreshed_at"],
+        )
+
+    @staticmethod
+    def _recompute_portfolios(*, portfolio_ids: list[int], now) -> None:
+        Portfolio.objects.filter(pk__in=portfolio_ids).update(totals_stale=False)
+
+        sums = {
+            row["portfolio_id"]: row
+            for row in Container.objects.filter(portfolio_id__in=portfolio_ids)
+            .order_by()
+            .values("portfolio_id")
+            .annotate(**{field: Sum(field) for field in PortfolioTotalsService.TOTAL_FIELDS})
+        }
+        portfolios = list(Portfolio.objects.filter(pk__in=portfolio_ids))
+        for portfolio in portfolios:
+            row = sums.get(portfolio.pk, {})
+            for field in PortfolioTotalsService.TOTAL_FIELDS:
+                setattr(portfolio, field, row.get(field) or Decimal("0"))
+            portfolio.totals_refreshed_at = now
+        Portfolio.objects.bulk_update(
+            portfolios,
+            fields=[*PortfolioTotalsService.TOTAL_FIELDS, "totals_refreshed_at"],
+        )
+
+    @staticmethod
+    def recompute(*, container_ids: Iterable[int] = (), portfolio_ids: Iterable[int] = ()) -> None:
+        """Recompute the given containers plus any stale siblings, then roll up their portfolios."""
+        container_ids = set(container_ids)
+        portfolio_ids = set(portfolio_ids)
+        portfolio_ids.update(
+            Container.objects.filter(pk__in=container_ids).values_list("portfolio_id", flat=True)
+        )
+        if not portfolio_ids:
+            return
+
+        container_ids.update(
+            Container.objects.filter(portfolio_id__in=portfolio_ids, totals_stale=True).values_list("pk", flat=True)
+        )
+        now = timezone.now()
+        if container_ids:
+            PortfolioTotalsService._recompute_containers(container_ids=sorted(container_ids), now=now)
+        PortfolioTotalsService._recompute_portfolios(portfolio_ids=sorted(portfolio_ids), now=now)
+
+    @staticmethod
+    def mark_holding_stale(*, holding: Holding) -> None:
+        """
+        Flag the holding's container instead of re-evaluating it: a write to
+        one holding stays O(1), and the next read recomputes the container once.
+        """
+        PortfolioTotalsService.mark_containers_stale(container_ids=[holding.container_id])
+
+    @staticmethod
+    def refresh_stale(*, portfolios: Iterable[Portfolio] = (), containers: Iterable[Container] = ()) -> bool:
+        """
+        Read-through refresh used by the portfolio and container GET views.
+
+        Stale totals are recomputed and persisted here, so those reads can
+        write; returns True when they did and the caller should re-fetch.
+        """
+        portfolio_ids = {portfolio.pk for portfolio in portfolios if portfolio.totals_stale}
+        portfolio_ids.update(container.portfolio_id for container in containers if container.totals_stale)
+        if not portfolio_ids:
+            return False
+        PortfolioTotalsService.recompute(portfolio_ids=portfolio_ids)
+        return True
@@ -0,0 +1,146 @@
+import datetime
+from dataclasses import dataclass
+
+import numpy as np
+from django.core.exceptions import ValidationError
+
+from apps.assets.services import AssetPriceHistoryService
+from apps.holdings.models import Holding, Portfolio
+from apps.holdings.services.holding_formula_service import HoldingFormulaService
+
+
+@dataclass(frozen=True)
+class PortfolioValuationSeries:
+    dates: "np.ndarray"
+    holding_ids: list[int]
+    values: "np.ndarray"
+    nav: "np.ndarray"
+    returns: "np.ndarray"
+    contributions: "np.ndarray"
+
+    @property
+    def cumulative_return(self) -> float:
+        return float(np.prod(1.0 + self.returns) - 1.0) if len(self.returns) else 0.0
+
+
+class PortfolioValuationService:
+    FREQUENCIES = {"D": None, "W": "datetime64[W]", "M": "datetime64[M]"}
+
+    @staticmethod
+    def _holdings(*, portfolio: Portfolio) -> list[Holding]:
+        return list(
+            Holding.objects.select_related(
+                "container__portfolio__profile",
+                "asset",
+                "asset__price",
+                "asset__market_data",
+            )
+            .prefetch_related("fact_values__definition", "overrides")
+            .filter(container__portfolio=portfolio)
+            .order_by("container_id", "asset_id", "id")
+        )
+
+    @staticmethod
+    def _as_float(value) -> float:
+        return float(value) if value is not None else np.nan
+
+    @staticmethod
+    def _axis(*, start: datetime.date, end: datetime.date, frequency: str):
+        days = np.arange(np.datetime64(start, "D"), np.datetime64(end, "D") + 1)
+        days = days[np.is_busday(days)]
+        period = PortfolioValuationService.FREQUENCIES[frequency]
+        if period is None or not len(days):
+            return days
+        # numpy weeks start on Thursday (the epoch); shift so buckets run Monday to Sunday.
+        buckets = (days + np.timedelta64(3, "D")).astype(period) if frequency == "W" else days.astype(period)
+        return days[np.append(buckets[1:] != buckets[:-1], True)]
+
+    @staticmethod
+    def _prices_as_of(*, axis, asset_ids: list, start: datetime.date, end: datetime.date):
+        bar_dates, _, bars = AssetPriceHistoryService.load_matrix(asset_ids=asset_ids, start=start, end=end)
+        # Seed a row from each asset's last bar before ``start`` so stale
+        # prices carry forward no matter how long ago they were recorded.
+        seed = AssetPriceHistoryService.latest_before(asset_ids=asset_ids, before=start)
+        bar_dates = np.concatenate(([np.datetime64(start - datetime.timedelta(days=1), "D")], bar_dates))
+        bars = np.vstack(
+            ([[float(seed[asset_id]) if asset_id in seed else np.nan for asset_id in asset_ids]], bars)
+        )
+        prices = np.full((len(axis), len(asset_ids)), np.nan)
+
+        observed = ~np.isnan(bars)
+        last_seen = np.where(observed, np.arange(len(bar_dates))[:, None], -1)
+        np.maximum.accumulate(last_seen, axis=0, out=last_seen)
+        filled = np.take_along_axis(bars, np.maximum(last_seen, 0), axis=0)
+        filled[last_seen < 0] = np.nan
+
+        position = np.searchsorted(bar_dates, axis, side="right") - 1
+        valid = position >= 0
+        prices[valid] = filled[position[valid]]
+        return prices, observed.any(axis=0)
+
+    @staticmethod
+    def series(
+        *,
+        portfolio: Portfolio,
+        start: datetime.date,
+        end: datetime.date,
+        frequency: str = "D",
+    ) -> PortfolioValuationSeries:
+        if frequency not in PortfolioValuationService.FREQUENCIES:
+            raise ValidationError({"frequency": "Frequency must be one of D, W or M."})
+        if start > end:
+            raise ValidationError({"start": "Start date must be on or before end date."})
+
+        holdings = PortfolioValuationService._holdings(portfolio=portfolio)
+        axis = PortfolioValuationService._axis(start=start, end=end, frequency=frequency)
+        current = HoldingFormulaService.evaluate_batch(
+            holdings=holdings,
+            identifiers=("quantity", "price", "fx_rate"),
+        )
+
+        as_float = PortfolioValuationService._as_float
+        quantities = np.array([as_float(current[holding.pk]["quantity"]) for holding in holdings])
+        fx_rates = np.array([as_float(current[holding.pk]["fx_rate"]) for holding in holdings])
+        latest_prices = np.array([as_float(current[holding.pk]["price"]) for holding in holdings])
+
+        asset_ids = list(dict.fromkeys(holding.asset_id for holding in holdings))
+        column = {asset_id: index for index, asset_id in enumerate(asset_ids)}
+        asset_prices, has_history = PortfolioValuationService._prices_as_of(
+            axis=axis,
+            asset_ids=asset_ids,
+            start=start,
+            end=end,
+        )
+        columns = np.array([column[holding.asset_id] for holding in holdings], dtype=np.intp)
+        prices = asset_prices[:, columns] if len(holdings) else np.empty((len(axis), 0))
+        flat = ~has_history[columns] if len(holdings) else np.zeros(0, dtype=bool)
+        prices[:, flat] = latest_prices[flat]
+
+        values = prices * quantities * fx_rates
+        nav = np.nansum(values, axis=1)
+
+        contributions = np.zeros_like(values)
+        if len(axis) > 1:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                price_returns = prices[1:] / prices[:-1] - 1.0
+                weights = values[:-1] / nav[:-1, None]
+            contributions[1:] = np.nan_to_num(weights * price_returns, nan=0.0, posinf=0.0, neginf=0.0)
+
+        return PortfolioValuationSeries(
+            dates=axis,
+            holding_ids=[holding.pk for holding in holdings],
+            values=values,
+            nav=nav,
+            returns=contributions.sum(axis=1),
+            contributions=contributions,
+        )
+
+    @staticmethod
+    def nav_as_of(*, portfolio: Portfolio, as_of: datetime.date) -> float:
+        valuation = PortfolioValuationService.series(
+            portfolio=portfolio,
+            # Any seven-day window contains a business day.
+            start=as_of - datetime.timedelta(days=6),
+            end=as_of,
+        )
+        return float(valuation.nav[-1]) if len(valuation.nav) else 0.0
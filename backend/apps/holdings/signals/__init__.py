@@ -0,0 +1 @@
+from .totals_signals import *  # noqa: F401,F403
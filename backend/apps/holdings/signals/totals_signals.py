@@ -0,0 +1,41 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.assets.models import AssetPrice
+from apps.assets.signals import asset_prices_changed
+from apps.holdings.models import Holding
+from apps.holdings.services import PortfolioTotalsService
+from apps.integrations.models import FXRateCache
+from apps.users.models import Profile
+
+
+@receiver(post_save, sender=AssetPrice)
+@receiver(post_delete, sender=AssetPrice)
+def invalidate_totals_for_asset_price(sender, instance, **kwargs):
+    PortfolioTotalsService.mark_assets_stale(asset_ids=[instance.asset_id])
+
+
+@receiver(asset_prices_changed)
+def invalidate_totals_for_asset_prices(sender, asset_ids, **kwargs):
+    PortfolioTotalsService.mark_assets_stale(asset_ids=asset_ids)
+
+
+@receiver(post_save, sender=FXRateCache)
+@receiver(post_delete, sender=FXRateCache)
+def invalidate_totals_for_fx_rate(sender, instance, **kwargs):
+    PortfolioTotalsService.mark_currencies_stale(
+        currencies=[instance.base_currency, instance.quote_currency],
+    )
+
+
+@receiver(post_save, sender=Profile)
+def invalidate_totals_for_profile(sender, instance, created, **kwargs):
+    if not created:
+        PortfolioTotalsService.mark_portfolios_stale(
+            portfolio_ids=instance.portfolios.values_list("pk", flat=True)
+        )
+
+
+@receiver(post_delete, sender=Holding)
+def invalidate_totals_for_deleted_holding(sender, instance, **kwargs):
+    PortfolioTotalsService.mark_containers_stale(container_ids=[instance.container_id])
@@ -6,11 +6,14 @@ from django.test import TestCase
 
 from apps.assets.models import Asset, AssetPrice, AssetType
 from apps.holdings.models import Container, Holding, Portfolio
+from apps.holdings.serializers import HoldingSerializer
 from apps.holdings.services import HoldingFormulaService
+from apps.integrations.services import FXRateMatrix
 
 
 class HoldingFormulaServiceTests(TestCase):
     def setUp(self):
+        FXRateMatrix.clear_process_cache()
         self.user = get_user_model().objects.create_user(
             email="holding-formulas@example.com",
             password="StrongPass123!",
@@ -34,7 +37,7 @@ class HoldingFormulaServiceTests(TestCase):
             unit_cost_basis=Decimal("150"),
         )
 
-    @patch("apps.holdings.services.holding_formula_service.FXRateService.get_rate")
+    @patch("apps.integrations.services.fx_rate_service.FXRateService.get_rate")
     def test_formula_summary_uses_fx_rate_for_profile_currency_outputs(self, mock_get_rate):
         mock_get_rate.return_value = Decimal("1.35")
 
@@ -58,3 +61,43 @@ class HoldingFormulaServiceTests(TestCase):
             HoldingFormulaService.evaluate(holding=self.holding, identifier="unrealized_gain_pct"),
             Decimal("0.4"),
         )
+
+    @patch("apps.integrations.services.fx_rate_service.FXRateService.get_rate")
+    def test_evaluate_batch_matches_single_evaluation_and_fetches_each_pair_once(self, mock_get_rate):
+        mock_get_rate.return_value = Decimal("1.35")
+        second_asset = Asset.objects.create(
+            asset_type=self.asset_type,
+            name="Microsoft Corp.",
+            symbol="MSFT",
+            data={"currency": "USD"},
+        )
+        AssetPrice.objects.create(asset=second_asset, price=Decimal("400"))
+        second_holding = Holding.objects.create(
+            container=self.container,
+            asset=second_asset,
+            quantity=Decimal("1"),
+            unit_cost_basis=Decimal("300"),
+        )
+
+        results = HoldingFormulaService.evaluate_batch(holdings=[self.holding, second_holding])
+
+        mock_get_rate.assert_called_once_with(base_currency="USD", quote_currency="CAD")
+        self.assertEqual(results[self.holding.pk]["current_value"], Decimal("567.00"))
+        self.assertEqual(results[self.holding.pk]["unrealized_gain_pct"], Decimal("0.4"))
+        self.assertEqual(results[second_holding.pk]["market_value"], Decimal("400"))
+        self.assertEqual(results[second_holding.pk]["cost_basis"], Decimal("405.00"))
+
+    @patch("apps.integrations.services.fx_rate_service.FXRateService.get_rate")
+    def test_serializer_evaluates_each_holding_once_with_a_shared_fx_matrix(self, mock_get_rate):
+        mock_get_rate.return_value = Decimal("1.35")
+
+        with patch.object(
+            HoldingFormulaService,
+            "evaluate_batch",
+            wraps=HoldingFormulaService.evaluate_batch,
+        ) as evaluate_batch:
+            data = HoldingSerializer(self.holding).data
+
+        evaluate_batch.assert_called_once()
+        self.assertEqual(Decimal(data["current_value_profile"]), Decimal("567.00"))
+        self.assertEqual(Decimal(data["unrealized_gain"]), Decimal("162.00"))
@@ -52,7 +52,7 @@ class HoldingSerializerFieldTests(TestCase):
         self.assertTrue(data["asset_current_price_is_fresh"])
         self.assertIsNotNone(data["asset_current_price_as_of"])
 
-    @patch("apps.holdings.services.holding_formula_service.FXRateService.get_rate")
+    @patch("apps.integrations.services.fx_rate_service.FXRateService.get_rate")
     def test_serializer_exposes_formula_fields(self, mock_get_rate):
         mock_get_rate.return_value = Decimal("1")
         self.asset.data = {"currency": "USD"}
@@ -0,0 +1,122 @@
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.assets.models import Asset, AssetPrice, AssetType
+from apps.assets.signals import asset_prices_changed
+from apps.holdings.models import Container, Portfolio
+from apps.holdings.services import HoldingService, PortfolioTotalsService
+from apps.integrations.models import FXRateCache
+
+
+class PortfolioTotalsServiceTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="portfolio-totals@example.com",
+            password="StrongPass123!",
+        )
+        self.client.force_authenticate(self.user)
+        self.portfolio = Portfolio.objects.create(profile=self.user.profile, name="Main")
+        self.brokerage = Container.objects.create(portfolio=self.portfolio, name="Brokerage")
+        self.vault = Container.objects.create(portfolio=self.portfolio, name="Vault")
+        asset_type = AssetType.objects.create(name="Equity")
+        self.apple = Asset.objects.create(asset_type=asset_type, name="Apple", symbol="AAPL", data={"currency": "USD"})
+        self.gold = Asset.objects.create(asset_type=asset_type, name="Gold Bar", symbol="GOLD", data={"currency": "USD"})
+        AssetPrice.objects.create(asset=self.apple, price=Decimal("200"))
+
+    def _create_holdings(self):
+        HoldingService.create_holding(
+            container=self.brokerage,
+            asset=self.apple,
+            quantity=Decimal("3"),
+            unit_cost_basis=Decimal("150"),
+        )
+        HoldingService.create_holding(
+            container=self.vault,
+            asset=self.gold,
+            quantity=Decimal("1"),
+            unit_value=Decimal("1000"),
+        )
+
+    def test_holding_mutations_mark_totals_stale_and_reads_roll_them_up(self):
+        self._create_holdings()
+
+        self.assertTrue(Container.objects.get(pk=self.brokerage.pk).totals_stale)
+        self.assertTrue(Portfolio.objects.get(pk=self.portfolio.pk).totals_stale)
+
+        response = self.client.get(reverse("portfolio-detail", args=[self.portfolio.pk]))
+
+        self.assertEqual(response.status_code, 200)
+        self.brokerage.refresh_from_db()
+        self.portfolio.refresh_from_db()
+        self.assertFalse(self.brokerage.totals_stale)
+        self.assertFalse(self.portfolio.totals_stale)
+        self.assertEqual(self.brokerage.current_value, Decimal("600"))
+        self.assertEqual(self.brokerage.cost_basis, Decimal("450"))
+        self.assertEqual(self.brokerage.unrealized_gain, Decimal("150"))
+        self.assertEqual(self.portfolio.current_value, Decimal("1600"))
+        self.assertEqual(self.portfolio.cost_basis, Decimal("450"))
+        self.assertEqual(self.portfolio.unrealized_gain, Decimal("150"))
+
+    def test_single_holding_write_does_not_reevaluate_the_container(self):
+        self._create_holdings()
+        PortfolioTotalsService.recompute(portfolio_ids=[self.portfolio.pk])
+        holding = self.brokerage.holdings.get()
+
+        with patch("apps.holdings.services.holding_formula_service.HoldingFormulaService.evaluate_batch") as evaluate:
+            HoldingService.update_holding(holding=holding, profile=self.user.profile, quantity=Decimal("4"))
+
+        evaluate.assert_not_called()
+        self.assertTrue(Container.objects.get(pk=self.brokerage.pk).totals_stale)
+        self.assertFalse(Container.objects.get(pk=self.vault.pk).totals_stale)
+
+    def test_price_changes_mark_holders_stale_and_reads_recompute_them(self):
+        self._create_holdings()
+        PortfolioTotalsService.recompute(portfolio_ids=[self.portfolio.pk])
+
+        price = self.apple.price
+        price.price = Decimal("210")
+        price.save()
+
+        self.assertTrue(Container.objects.get(pk=self.brokerage.pk).totals_stale)
+        self.assertFalse(Container.objects.get(pk=self.vault.pk).totals_stale)
+        self.assertTrue(Portfolio.objects.get(pk=self.portfolio.pk).totals_stale)
+
+        response = self.client.get(reverse("portfolio-detail", args=[self.portfolio.pk]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Decimal(response.data["current_value"]), Decimal("1630"))
+        self.assertEqual(Decimal(response.data["unrealized_gain"]), Decimal("180"))
+        self.assertFalse(Container.objects.get(pk=self.brokerage.pk).totals_stale)
+
+    def test_bulk_price_signal_and_fx_changes_invalidate_totals(self):
+        self._create_holdings()
+        PortfolioTotalsService.recompute(portfolio_ids=[self.portfolio.pk])
+
+        asset_prices_changed.send(sender=AssetPrice, asset_ids=[self.gold.pk])
+        self.assertEqual(
+            set(Container.objects.filter(totals_stale=True).values_list("pk", flat=True)),
+            {self.vault.pk},
+        )
+
+        PortfolioTotalsService.recompute(portfolio_ids=[self.portfolio.pk])
+        FXRateCache.objects.create(base_currency="EUR", quote_currency="JPY", pair_symbol="EURJPY", rate=Decimal("160"))
+        self.assertFalse(Container.objects.filter(totals_stale=True).exists())
+        self.assertFalse(Portfolio.objects.get(pk=self.portfolio.pk).totals_stale)
+
+        FXRateCache.objects.create(base_currency="USD", quote_currency="CAD", pair_symbol="USDCAD", rate=Decimal("1.35"))
+        self.assertFalse(Container.objects.filter(totals_stale=False).exists())
+
+    def test_container_list_serves_materialized_totals(self):
+        self._create_holdings()
+
+        response = self.client.get(reverse("container-list-create"), {"portfolio": self.portfolio.pk})
+
+        self.assertEqual(response.status_code, 200)
+        totals = {row["name"]: Decimal(row["current_value"]) for row in response.data}
+        self.assertEqual(totals, {"Brokerage": Decimal("600"), "Vault": Decimal("1000")})
@@ -0,0 +1,75 @@
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from apps.assets.models import Asset, AssetPrice, AssetPriceBar, AssetType
+from apps.holdings.models import Container, Holding, Portfolio
+from apps.holdings.services import PortfolioValuationService
+from apps.integrations.services import FXRateMatrix
+
+
+class PortfolioValuationServiceTests(TestCase):
+    def setUp(self):
+        FXRateMatrix.clear_process_cache()
+        user = get_user_model().objects.create_user(email="valuation@example.com", password="StrongPass123!")
+        user.profile.currency = "USD"
+        user.profile.save(update_fields=["currency"])
+        self.portfolio = Portfolio.objects.create(profile=user.profile, name="Main")
+        container = Container.objects.create(portfolio=self.portfolio, name="Brokerage")
+        equity = AssetType.objects.create(name="Equity")
+        self.apple = Asset.objects.create(asset_type=equity, name="Apple", symbol="AAPL", data={"currency": "USD"})
+        self.house = Asset.objects.create(asset_type=equity, name="House", symbol="", data={"currency": "USD"})
+        AssetPrice.objects.create(asset=self.apple, price=Decimal("120"))
+        AssetPrice.objects.create(asset=self.house, price=Decimal("1000"))
+        self.apple_holding = Holding.objects.create(container=container, asset=self.apple, quantity=Decimal("10"))
+        self.house_holding = Holding.objects.create(container=container, asset=self.house, quantity=Decimal("1"))
+        for day, close in ((date(2026, 1, 2), "100"), (date(2026, 1, 6), "110")):
+            AssetPriceBar.objects.create(asset=self.apple, date=day, close=Decimal(close))
+
+    @patch("apps.integrations.services.fx_rate_service.FXRateService.get_rate", return_value=Decimal("1"))
+    def test_series_forward_fills_prices_and_attributes_returns(self, _):
+        valuation = PortfolioValuationService.series(
+            portfolio=self.portfolio,
+            start=date(2026, 1, 2),
+            end=date(2026, 1, 6),
+        )
+
+        self.assertEqual([str(day) for day in valuation.dates], ["2026-01-02", "2026-01-05", "2026-01-06"])
+        self.assertEqual(valuation.nav.tolist(), [2000.0, 2000.0, 2100.0])
+        self.assertAlmostEqual(float(valuation.returns[2]), 0.05)
+        apple = valuation.holding_ids.index(self.apple_holding.pk)
+        house = valuation.holding_ids.index(self.house_holding.pk)
+        self.assertAlmostEqual(float(valuation.contributions[2, apple]), 0.05)
+        self.assertEqual(valuation.contributions[:, house].tolist(), [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(valuation.cumulative_return, 0.05)
+
+    @patch("apps.integrations.services.fx_rate_service.FXRateService.get_rate", return_value=Decimal("1"))
+    def test_weekly_frequency_keeps_last_business_day_per_week(self, _):
+        valuation = PortfolioValuationService.series(
+            portfolio=self.portfolio,
+            start=date(2026, 1, 1),
+            end=date(2026, 1, 14),
+            frequency="W",
+        )
+
+        self.assertEqual([str(day) for day in valuation.dates], ["2026-01-02", "2026-01-09", "2026-01-14"])
+
+    @patch("apps.integrations.services.fx_rate_service.FXRateService.get_rate", return_value=Decimal("1"))
+    def test_series_carries_forward_bars_older_than_the_window(self, _):
+        AssetPriceBar.objects.filter(asset=self.apple).delete()
+        AssetPriceBar.objects.create(asset=self.apple, date=date(2025, 10, 1), close=Decimal("90"))
+
+        valuation = PortfolioValuationService.series(
+            portfolio=self.portfolio,
+            start=date(2026, 1, 5),
+            end=date(2026, 1, 6),
+        )
+
+        self.assertEqual(valuation.nav.tolist(), [1900.0, 1900.0])
+        self.assertEqual(
+            PortfolioValuationService.nav_as_of(portfolio=self.portfolio, as_of=date(2026, 1, 10)),
+            1900.0,
+        )
@@ -1,7 +1,11 @@
+import json
+from decimal import Decimal
 from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APIClient
 
@@ -123,3 +127,82 @@ class HoldingCreateWithActiveEquityTests(TestCase):
 
         self.assertEqual(response.status_code, 201)
         mock_ensure_identity.assert_called_once_with(asset=asset)
+
+
+class HoldingListQueryCountTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="holding-list@example.com",
+            password="StrongPass123!",
+        )
+        self.client.force_authenticate(self.user)
+        self.portfolio = Portfolio.objects.create(profile=self.user.profile, name="Main")
+        self.container = Container.objects.create(portfolio=self.portfolio, name="Brokerage")
+        self.asset_type = AssetType.objects.create(name="Equity")
+
+    def _create_holdings(self, count: int, *, offset: int = 0):
+        for index in range(offset, offset + count):
+            asset = Asset.objects.create(
+                asset_type=self.asset_type,
+                name=f"Asset {index}",
+                symbol=f"SYM{index}",
+            )
+            Holding.objects.create(container=self.container, asset=asset, quantity=Decimal("2"), unit_value=Decimal("5"))
+
+    def _count_list_queries(self) -> int:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("holding-list-create"))
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_list_query_count_does_not_grow_with_holdings(self):
+        self._create_holdings(2)
+        small = self._count_list_queries()
+        self._create_holdings(6, offset=2)
+        large = self._count_list_queries()
+
+        self.assertEqual(small, large)
+
+    def test_cursor_pagination_walks_all_holdings_in_key_order(self):
+        self._create_holdings(5)
+        seen = []
+        cursor = None
+        while True:
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = self.client.get(reverse("holding-list-create"), params)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(row["id"] for row in response.json()["results"])
+            cursor = response.json()["next_cursor"]
+            if cursor is None:
+                break
+
+        expected = list(
+            Holding.objects.order_by("container_id", "asset_id", "id").values_list("id", flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+    def test_fields_projection_skips_unrequested_values(self):
+        self._create_holdings(3)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("holding-list-create"), {"fields": "id,asset_symbol,quantity"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.json()[0]), {"id", "asset_symbol", "quantity"})
+        self.assertFalse(any("holdingoverride" in query["sql"] for query in context.captured_queries))
+
+        response = self.client.get(reverse("holding-list-create"), {"fields": "id,bogus"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_stream_returns_same_rows_as_list(self):
+        self._create_holdings(3)
+
+        listed = self.client.get(reverse("holding-list-create"), {"fields": "id,market_value"}).json()
+        response = self.client.get(reverse("holding-list-create"), {"fields": "id,market_value", "stream": "1"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(b"".join(response.streaming_content)), listed)
+        self.assertEqual(listed[0]["market_value"], "10.000000000000000000")
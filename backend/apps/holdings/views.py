@@ -1,10 +1,12 @@
 from typing import Any, cast
 
 from django.db.models import Q
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
 
 from apps.assets.models import Asset, AssetType
 from apps.assets.services import AssetPriceService, AssetService
@@ -27,7 +29,14 @@ from apps.holdings.serializers import (
     PortfolioSerializer,
     PortfolioUpdateSerializer,
 )
-from apps.holdings.services import ContainerService, HoldingService, HoldingValueService, PortfolioService
+from apps.holdings.services import (
+    ContainerService,
+    HoldingListService,
+    HoldingService,
+    HoldingValueService,
+    PortfolioService,
+    PortfolioTotalsService,
+)
 from apps.integrations.services import (
     ActiveCommodityAssetService,
     ActiveCryptoAssetService,
@@ -45,11 +54,31 @@ def _hydrate_holding_asset_price(*, holding: Holding) -> Holding:
     if asset.asset_type.slug not in {"equity", "crypto", "cryptocurrency", "commodity", "precious_metal"}:
         return holding
 
-    AssetPriceService.get_current_price(asset=asset)
-    holding.refresh_from_db()
+    AssetPriceService.get_price_stale_while_revalidate(asset=asset)
     return holding
 
 
+def _serialize_holdings(*, holdings: list[Holding], fields: tuple[str, ...] | None) -> list[dict]:
+    formula_values = HoldingListService.evaluate(holdings=holdings, fields=fields)
+    return HoldingSerializer(
+        holdings,
+        many=True,
+        fields=fields,
+        context={"formula_values": formula_values},
+    ).data
+
+
+def _stream_holdings(*, queryset, fields: tuple[str, ...] | None):
+    encoder = JSONEncoder()
+    yield "["
+    first = True
+    for holdings in HoldingListService.iter_pages(queryset):
+        for row in _serialize_holdings(holdings=holdings, fields=fields):
+            yield ("" if first else ",") + encoder.encode(row)
+            first = False
+    yield "]"
+
+
 class PortfolioListCreateView(ServiceAPIView):
     permission_classes = [IsAuthenticated]
 
@@ -57,7 +86,10 @@ class PortfolioListCreateView(ServiceAPIView):
         return Portfolio.objects.filter(profile=request.user.profile).order_by("created_at", "id")
 
     def get(self, request):
-        portfolios = self.get_queryset(request)
+        portfolios = list(self.get_queryset(request))
+        # Like the other portfolio/container reads, this persists stale totals first.
+        if PortfolioTotalsService.refresh_stale(portfolios=portfolios):
+            portfolios = list(self.get_queryset(request))
         return Response(PortfolioSerializer(portfolios, many=True).data)
 
     def post(self, request):
@@ -82,6 +114,8 @@ class PortfolioDetailView(ServiceAPIView):
 
     def get(self, request, pk):
         portfolio = self.get_object(request, pk)
+        if PortfolioTotalsService.refresh_stale(portfolios=[portfolio]):
+            portfolio = self.get_object(request, pk)
         return Response(PortfolioSerializer(portfolio).data)
 
     def patch(self, request, pk):
@@ -113,7 +147,10 @@ class ContainerListCreateView(ServiceAPIView):
         portfolio_id = request.query_params.get("portfolio")
         if portfolio_id:
             queryset = queryset.filter(portfolio_id=portfolio_id)
-        return Response(ContainerSerializer(queryset, many=True).data)
+        containers = list(queryset)
+        if PortfolioTotalsService.refresh_stale(containers=containers):
+            containers = list(queryset.all())
+        return Response(ContainerSerializer(containers, many=True).data)
 
     def post(self, request):
         serializer = ContainerCreateSerializer(data=request.data, context={"request": request})
@@ -149,6 +186,8 @@ class ContainerDetailView(ServiceAPIView):
 
     def get(self, request, pk):
         container = self.get_object(request, pk)
+        if PortfolioTotalsService.refresh_stale(containers=[container]):
+            container = self.get_object(request, pk)
         return Response(ContainerSerializer(container).data)
 
     def patch(self, request, pk):
@@ -178,6 +217,7 @@ class HoldingListCreateView(ServiceAPIView):
     def get_queryset(self, request):
         return Holding.objects.select_related(
             "container",
+            "container__portfolio__profile",
             "asset",
             "asset__price",
             "asset__market_data",
@@ -194,7 +234,35 @@ class HoldingListCreateView(ServiceAPIView):
         container_id = request.query_params.get("container")
         if container_id:
             queryset = queryset.filter(container_id=container_id)
-        return Response(HoldingSerializer(queryset, many=True).data)
+
+        fields = HoldingListService.parse_fields(
+            request.query_params.get("fields"),
+            allowed=HoldingSerializer.Meta.fields,
+        )
+        queryset = HoldingListService.project(queryset, fields=fields)
+
+        if request.query_params.get("stream") in {"1", "true"}:
+            return StreamingHttpResponse(
+                _stream_holdings(queryset=queryset, fields=fields),
+                content_type="application/json",
+            )
+
+        cursor = request.query_params.get("cursor")
+        if cursor is None and "limit" not in request.query_params:
+            holdings = list(queryset)
+            return Response(_serialize_holdings(holdings=holdings, fields=fields))
+
+        holdings, next_cursor = HoldingListService.page(
+            queryset,
+            cursor=cursor,
+            limit=HoldingListService.parse_limit(request.query_params.get("limit")),
+        )
+        return Response(
+            {
+                "results": _serialize_holdings(holdings=holdings, fields=fields),
+                "next_cursor": next_cursor,
+            }
+        )
 
     def post(self, request):
         serializer = HoldingCreateSerializer(data=request.data, context={"request": request})
@@ -397,6 +465,7 @@ class HoldingFactDefinitionDetailView(ServiceAPIView):
     def delete(self, request, pk):
         definition = self.get_object(request, pk)
         definition.delete()
+        PortfolioTotalsService.mark_portfolios_stale(portfolio_ids=[definition.portfolio_id])
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -476,4 +545,5 @@ class HoldingOverrideDetailView(ServiceAPIView):
     def delete(self, request, override_id):
         override = self.get_object(request, override_id)
         override.delete()
+        PortfolioTotalsService.mark_holding_stale(holding=override.holding)
         return Response(status=status.HTTP_204_NO_CONTENT)
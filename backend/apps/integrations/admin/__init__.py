@@ -1,11 +1,17 @@
 from .active_commodity_admin import ActiveCommodityListingAdmin
 from .active_crypto_admin import ActiveCryptoListingAdmin
 from .active_equity_admin import ActiveEquityListingAdmin
+from .active_listing_generation_admin import ActiveListingGenerationAdmin
 from .fx_rate_admin import FXRateCacheAdmin
+from .provider_guard_admin import ProviderGuardStateAdmin
+from .provider_lease_admin import ProviderLeaseAdmin
 
 __all__ = [
     "ActiveEquityListingAdmin",
     "ActiveCryptoListingAdmin",
     "ActiveCommodityListingAdmin",
+    "ActiveListingGenerationAdmin",
     "FXRateCacheAdmin",
+    "ProviderGuardStateAdmin",
+    "ProviderLeaseAdmin",
 ]
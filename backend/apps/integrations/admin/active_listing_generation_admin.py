@@ -0,0 +1,11 @@
+from django.contrib import admin
+
+from apps.integrations.models import ActiveListingGeneration
+
+
+@admin.register(ActiveListingGeneration)
+class ActiveListingGenerationAdmin(admin.ModelAdmin):
+    list_display = ("listing", "provider", "active_generation", "row_count", "refreshed_at")
+    list_filter = ("listing", "provider")
+    readonly_fields = ("active_generation", "row_count", "refreshed_at")
+    ordering = ("listing", "provider")
@@ -0,0 +1,17 @@
+from django.contrib import admin
+
+from apps.integrations.models import ProviderGuardState
+
+
+@admin.register(ProviderGuardState)
+class ProviderGuardStateAdmin(admin.ModelAdmin):
+    list_display = ("provider", "tokens", "waiting", "consecutive_failures", "updated_at")
+    readonly_fields = (
+        "tokens",
+        "refilled_at",
+        "waiting",
+        "last_success_ts",
+        "last_failure_ts",
+        "updated_at",
+    )
+    ordering = ("provider",)
@@ -0,0 +1,11 @@
+from django.contrib import admin
+
+from apps.integrations.models import ProviderLease
+
+
+@admin.register(ProviderLease)
+class ProviderLeaseAdmin(admin.ModelAdmin):
+    list_display = ("key", "owner", "expires_at", "created_at")
+    search_fields = ("key",)
+    readonly_fields = ("owner", "expires_at", "created_at")
+    ordering = ("key",)
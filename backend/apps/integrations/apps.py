@@ -5,3 +5,6 @@ class IntegrationsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.integrations"
     label = "integrations"
+
+    def ready(self):
+        import apps.integrations.signals  # noqa: F401
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from apps.integrations.providers.fmp.request import FMP_GUARD
+
+
+class Command(BaseCommand):
+    help = "Show the shared request budget, queue depth and circuit state for provider guards."
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS(str(FMP_GUARD.status())))
@@ -0,0 +1,30 @@
+# Generated by Django 6.0.3 on 2026-10-17 00:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('integrations', '0004_fxratecache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProviderGuardState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('provider', models.CharField(max_length=50, unique=True)),
+                ('tokens', models.FloatField(default=0)),
+                ('refilled_at', models.FloatField(default=0)),
+                ('waiting', models.IntegerField(default=0)),
+                ('consecutive_failures', models.PositiveIntegerField(default=0)),
+                ('last_success_ts', models.FloatField(blank=True, null=True)),
+                ('last_failure_ts', models.FloatField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['provider'],
+            },
+        ),
+    ]
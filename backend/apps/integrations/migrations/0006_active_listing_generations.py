@@ -0,0 +1,69 @@
+# Generated by Django 6.0.3 on 2026-10-17 00:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('integrations', '0005_providerguardstate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActiveListingGeneration',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('listing', models.CharField(choices=[('equity', 'Equity'), ('crypto', 'Crypto')], max_length=20)),
+                ('provider', models.CharField(default='fmp', max_length=50)),
+                ('active_generation', models.PositiveBigIntegerField(default=0)),
+                ('row_count', models.PositiveIntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['listing', 'provider'],
+            },
+        ),
+        migrations.AddField(
+            model_name='activecryptolisting',
+            name='content_hash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='activecryptolisting',
+            name='generation',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='activecryptolisting',
+            name='retired_generation',
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='activeequitylisting',
+            name='content_hash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='activeequitylisting',
+            name='generation',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='activeequitylisting',
+            name='retired_generation',
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='activecryptolisting',
+            index=models.Index(fields=['provider', 'retired_generation'], name='integration_provide_cf1f79_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activeequitylisting',
+            index=models.Index(fields=['provider', 'retired_generation'], name='integration_provide_7ddab1_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='activelistinggeneration',
+            constraint=models.UniqueConstraint(fields=('listing', 'provider'), name='uniq_active_listing_generation_per_provider'),
+        ),
+    ]
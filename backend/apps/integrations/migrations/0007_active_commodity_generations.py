@@ -0,0 +1,37 @@
+# Generated by Django 6.0.3 on 2026-10-17 00:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('integrations', '0006_active_listing_generations'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='activecommoditylisting',
+            name='content_hash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='activecommoditylisting',
+            name='generation',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='activecommoditylisting',
+            name='retired_generation',
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='activelistinggeneration',
+            name='listing',
+            field=models.CharField(choices=[('equity', 'Equity'), ('crypto', 'Crypto'), ('commodity', 'Commodity')], max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='activecommoditylisting',
+            index=models.Index(fields=['provider', 'retired_generation'], name='integration_provide_de8e22_idx'),
+        ),
+    ]
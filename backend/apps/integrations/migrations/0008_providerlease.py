@@ -0,0 +1,26 @@
+# Generated by Django 6.0.3 on 2026-10-17 01:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('integrations', '0007_active_commodity_generations'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProviderLease',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=255, unique=True)),
+                ('owner', models.CharField(max_length=64)),
+                ('expires_at', models.FloatField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['key'],
+            },
+        ),
+    ]
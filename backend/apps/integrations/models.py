@@ -1,18 +1,75 @@
 from django.db import models
+from django.db.models.functions import Coalesce
+
+
+class ActiveListingGeneration(models.Model):
+    class Listing(models.TextChoices):
+        EQUITY = "equity", "Equity"
+        CRYPTO = "crypto", "Crypto"
+        COMMODITY = "commodity", "Commodity"
+
+    listing = models.CharField(max_length=20, choices=Listing.choices)
+    provider = models.CharField(max_length=50, default="fmp")
+    active_generation = models.PositiveBigIntegerField(default=0)
+    row_count = models.PositiveIntegerField(default=0)
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["listing", "provider"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["listing", "provider"],
+                name="uniq_active_listing_generation_per_provider",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.listing}/{self.provider} @ {self.active_generation}"
+
+
+class ActiveListingQuerySet(models.QuerySet):
+    def current(self, *, provider: str = "fmp"):
+        active_generation = Coalesce(
+            models.Subquery(
+                ActiveListingGeneration.objects.filter(
+                    listing=self.model.LISTING,
+                    provider=provider,
+                ).order_by().values("active_generation")[:1]
+            ),
+            models.Value(0),
+            output_field=models.PositiveBigIntegerField(),
+        )
+        return (
+            self.filter(provider=provider)
+            .alias(active_generation=active_generation)
+            .filter(generation__lte=models.F("active_generation"))
+            .filter(
+                models.Q(retired_generation__isnull=True)
+                | models.Q(retired_generation__gt=models.F("active_generation"))
+            )
+        )
 
 
 class ActiveEquityListing(models.Model):
+    LISTING = ActiveListingGeneration.Listing.EQUITY
+
     provider = models.CharField(max_length=50, default="fmp")
     symbol = models.CharField(max_length=50, unique=True)
     name = models.CharField(max_length=255)
     source_payload = models.JSONField(default=dict, blank=True)
+    content_hash = models.CharField(max_length=64, blank=True)
+    generation = models.PositiveBigIntegerField(default=0)
+    retired_generation = models.PositiveBigIntegerField(null=True, blank=True)
     last_refreshed_at = models.DateTimeField(auto_now=True)
 
+    objects = ActiveListingQuerySet.as_manager()
+
     class Meta:
         ordering = ["symbol"]
         indexes = [
             models.Index(fields=["provider", "symbol"]),
             models.Index(fields=["name"]),
+            models.Index(fields=["provider", "retired_generation"]),
         ]
 
     def __str__(self):
@@ -20,20 +77,28 @@ class ActiveEquityListing(models.Model):
 
 
 class ActiveCryptoListing(models.Model):
+    LISTING = ActiveListingGeneration.Listing.CRYPTO
+
     provider = models.CharField(max_length=50, default="fmp")
     symbol = models.CharField(max_length=50, unique=True)
     name = models.CharField(max_length=255)
     base_symbol = models.CharField(max_length=20, blank=True)
     quote_currency = models.CharField(max_length=10, blank=True)
     source_payload = models.JSONField(default=dict, blank=True)
+    content_hash = models.CharField(max_length=64, blank=True)
+    generation = models.PositiveBigIntegerField(default=0)
+    retired_generation = models.PositiveBigIntegerField(null=True, blank=True)
     last_refreshed_at = models.DateTimeField(auto_now=True)
 
+    objects = ActiveListingQuerySet.as_manager()
+
     class Meta:
         ordering = ["symbol"]
         indexes = [
             models.Index(fields=["provider", "symbol"]),
             models.Index(fields=["base_symbol"]),
             models.Index(fields=["name"]),
+            models.Index(fields=["provider", "retired_generation"]),
         ]
 
     def __str__(self):
@@ -41,6 +106,8 @@ class ActiveCryptoListing(models.Model):
 
 
 class ActiveCommodityListing(models.Model):
+    LISTING = ActiveListingGeneration.Listing.COMMODITY
+
     provider = models.CharField(max_length=50, default="fmp")
     symbol = models.CharField(max_length=50, unique=True)
     name = models.CharField(max_length=255)
@@ -48,14 +115,20 @@ class ActiveCommodityListing(models.Model):
     trade_month = models.CharField(max_length=50, blank=True)
     currency = models.CharField(max_length=10, blank=True)
     source_payload = models.JSONField(default=dict, blank=True)
+    content_hash = models.CharField(max_length=64, blank=True)
+    generation = models.PositiveBigIntegerField(default=0)
+    retired_generation = models.PositiveBigIntegerField(null=True, blank=True)
     last_refreshed_at = models.DateTimeField(auto_now=True)
 
+    objects = ActiveListingQuerySet.as_manager()
+
     class Meta:
         ordering = ["symbol"]
         indexes = [
             models.Index(fields=["provider", "symbol"]),
             models.Index(fields=["name"]),
             models.Index(fields=["exchange"]),
+            models.Index(fields=["provider", "retired_generation"]),
         ]
 
     def __str__(self):
@@ -86,3 +159,33 @@ class FXRateCache(models.Model):
 
     def __str__(self):
         return f"{self.base_currency}/{self.quote_currency}={self.rate}"
+
+
+class ProviderGuardState(models.Model):
+    provider = models.CharField(max_length=50, unique=True)
+    tokens = models.FloatField(default=0)
+    refilled_at = models.FloatField(default=0)
+    waiting = models.IntegerField(default=0)
+    consecutive_failures = models.PositiveIntegerField(default=0)
+    last_success_ts = models.FloatField(null=True, blank=True)
+    last_failure_ts = models.FloatField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["provider"]
+
+    def __str__(self):
+        return f"{self.provider} (failures={self.consecutive_failures})"
+
+
+class ProviderLease(models.Model):
+    key = models.CharField(max_length=255, unique=True)
+    owner = models.CharField(max_length=64)
+    expires_at = models.FloatField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["key"]
+
+    def __str__(self):
+        return f"{self.key} (owner={self.owner})"
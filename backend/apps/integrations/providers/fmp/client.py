@@ -1,5 +1,6 @@
 from apps.integrations.providers.fmp.provider import FMPProvider
-from apps.integrations.shared.provider_guard import ProviderGuard
 
 
-FMP_PROVIDER = ProviderGuard(name="FMP", provider=FMPProvider())
+# Budget and circuit are enforced per network request by FMP_GUARD in
+# request.py, so responses served from the disk cache bypass both.
+FMP_PROVIDER = FMPProvider()
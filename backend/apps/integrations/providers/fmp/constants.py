@@ -7,11 +7,14 @@ FMP_API_KEY = getattr(settings, "FMP_API_KEY", "")
 FMP_TIMEOUT_SECONDS = getattr(settings, "INTEGRATIONS_TIMEOUT_SECONDS", 10)
 FMP_MAX_RETRIES = getattr(settings, "INTEGRATIONS_MAX_RETRIES", 2)
 FMP_RETRY_BACKOFF_SECONDS = getattr(settings, "INTEGRATIONS_RETRY_BACKOFF_SECONDS", 0.5)
+FMP_QUOTE_BATCH_SIZE = getattr(settings, "FMP_QUOTE_BATCH_SIZE", 100)
 
 # Stable endpoints we can rely on for the current build.
 QUOTE_SHORT = "/quote-short"
+BATCH_QUOTE_SHORT = "/batch-quote-short"
 PROFILE = "/profile"
 DIVIDENDS = "/dividends"
+HISTORICAL_PRICE_EOD = "/historical-price-eod/full"
 STOCK_LIST = "/stock-list"
 ACTIVELY_TRADING_LIST = "/actively-trading-list"
 CRYPTOCURRENCY_LIST = "/cryptocurrency-list"
@@ -21,3 +24,13 @@ AVAILABLE_COUNTRIES = "/available-countries"
 SEARCH_ISIN = "/search-isin"
 SEARCH_CUSIP = "/search-cusip"
 PROFILE_CIK = "/profile-cik"
+
+# Reference lists change slowly; serve repeat downloads from the response cache.
+RESPONSE_CACHE_TTLS = {
+    STOCK_LIST: 6 * 60 * 60,
+    ACTIVELY_TRADING_LIST: 60 * 60,
+    CRYPTOCURRENCY_LIST: 6 * 60 * 60,
+    COMMODITIES_LIST: 6 * 60 * 60,
+    FOREX_LIST: 24 * 60 * 60,
+    AVAILABLE_COUNTRIES: 7 * 24 * 60 * 60,
+}
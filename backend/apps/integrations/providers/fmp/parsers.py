@@ -84,6 +84,23 @@ def parse_stock_list_row(raw: dict) -> dict:
     }
 
 
+def parse_historical_price_row(raw: dict) -> dict:
+    date = (raw.get("date") or "").strip()[:10]
+    close = _decimal(raw.get("close", raw.get("price")))
+    if not date or close is None:
+        raise InvalidProviderResponse("Historical price row missing date or close.")
+
+    volume = raw.get("volume")
+    return {
+        "date": date,
+        "open": _decimal(raw.get("open")),
+        "high": _decimal(raw.get("high")),
+        "low": _decimal(raw.get("low")),
+        "close": close,
+        "volume": int(volume) if isinstance(volume, (int, float)) else None,
+    }
+
+
 def parse_actively_traded_row(raw: dict) -> str:
     symbol = (raw.get("symbol") or "").strip().upper()
     if not symbol:
@@ -1,11 +1,16 @@
+from typing import Callable, Iterator
+
 from apps.integrations.exceptions import EmptyProviderResult, InvalidProviderResponse
 from apps.integrations.providers.fmp.constants import (
     ACTIVELY_TRADING_LIST,
     AVAILABLE_COUNTRIES,
+    BATCH_QUOTE_SHORT,
     COMMODITIES_LIST,
     CRYPTOCURRENCY_LIST,
     DIVIDENDS,
+    FMP_QUOTE_BATCH_SIZE,
     FOREX_LIST,
+    HISTORICAL_PRICE_EOD,
     PROFILE,
     PROFILE_CIK,
     PROVIDER_NAME,
@@ -20,12 +25,13 @@ from apps.integrations.providers.fmp.parsers import (
     parse_company_profile_payload,
     parse_commodity_list_row,
     parse_crypto_list_row,
+    parse_historical_price_row,
     parse_identifier_search_row,
     parse_profile_identity_payload,
     parse_quote_payload,
     parse_stock_list_row,
 )
-from apps.integrations.providers.fmp.request import fmp_get_json
+from apps.integrations.providers.fmp.request import fmp_get_json, fmp_iter_json
 from apps.integrations.providers.market_data import MarketDataProvider
 from apps.integrations.shared.types import CompanyProfile, QuoteSnapshot
 
@@ -46,6 +52,27 @@ class FMPProvider(MarketDataProvider):
             raise InvalidProviderResponse(f"Malformed quote payload for {normalized}.")
         return parse_quote_payload(row, source=self.name)
 
+    def get_quotes(self, symbols: list[str], *, batch_size: int | None = None) -> dict[str, QuoteSnapshot]:
+        normalized = list(dict.fromkeys((symbol or "").strip().upper() for symbol in symbols))
+        normalized = [symbol for symbol in normalized if symbol]
+        batch_size = max(int(batch_size or FMP_QUOTE_BATCH_SIZE), 1)
+
+        quotes: dict[str, QuoteSnapshot] = {}
+        for start in range(0, len(normalized), batch_size):
+            chunk = normalized[start:start + batch_size]
+            data = fmp_get_json(BATCH_QUOTE_SHORT, symbols=",".join(chunk))
+            if not isinstance(data, list):
+                raise InvalidProviderResponse("Malformed batch quote payload.")
+            for row in data:
+                if not isinstance(row, dict):
+                    continue
+                try:
+                    quote = parse_quote_payload(row, source=self.name)
+                except InvalidProviderResponse:
+                    continue
+                quotes[quote.symbol] = quote
+        return quotes
+
     def get_company_profile(self, symbol: str) -> CompanyProfile:
         normalized = (symbol or "").strip().upper()
         if not normalized:
@@ -59,16 +86,39 @@ class FMPProvider(MarketDataProvider):
             raise InvalidProviderResponse(f"Malformed profile payload for {normalized}.")
         return parse_company_profile_payload(row)
 
-    def get_dividends(self, symbol: str) -> list[dict]:
+    def get_dividends(self, symbol: str, *, limit: int | None = None) -> list[dict]:
         normalized = (symbol or "").strip().upper()
         if not normalized:
             raise InvalidProviderResponse("Symbol is required for dividend lookup.")
 
-        data = fmp_get_json(DIVIDENDS, symbol=normalized)
+        data = fmp_get_json(DIVIDENDS, symbol=normalized, limit=limit)
         if not isinstance(data, list):
             return []
         return [row for row in data if isinstance(row, dict)]
 
+    def get_historical_prices(self, symbol: str, *, start=None, end=None) -> list[dict]:
+        normalized = (symbol or "").strip().upper()
+        if not normalized:
+            raise InvalidProviderResponse("Symbol is required for historical price lookup.")
+
+        data = fmp_get_json(
+            HISTORICAL_PRICE_EOD,
+            symbol=normalized,
+            **{"from": start.isoformat() if start else None, "to": end.isoformat() if end else None},
+        )
+        if not isinstance(data, list):
+            return []
+
+        parsed: list[dict] = []
+        for row in data:
+            if not isinstance(row, dict):
+                continue
+            try:
+                parsed.append(parse_historical_price_row(row))
+            except InvalidProviderResponse:
+                continue
+        return parsed
+
     def get_forex_list(self) -> list[dict]:
         data = fmp_get_json(FOREX_LIST)
         if not isinstance(data, list):
@@ -88,50 +138,36 @@ class FMPProvider(MarketDataProvider):
                 results.append(code)
         return results
 
-    def get_stock_list(self) -> list[dict]:
-        data = fmp_get_json(STOCK_LIST)
-        if not isinstance(data, list):
-            raise InvalidProviderResponse("Malformed stock list payload.")
-
-        parsed: list[dict] = []
-        for row in data:
+    @staticmethod
+    def _iter_parsed(path: str, parser: Callable[[dict], object]) -> Iterator:
+        for row in fmp_iter_json(path):
             if not isinstance(row, dict):
                 continue
             try:
-                parsed.append(parse_stock_list_row(row))
+                yield parser(row)
             except InvalidProviderResponse:
                 continue
-        return parsed
 
-    def get_actively_traded_symbols(self) -> set[str]:
-        data = fmp_get_json(ACTIVELY_TRADING_LIST)
-        if not isinstance(data, list):
-            raise InvalidProviderResponse("Malformed actively trading list payload.")
+    def iter_stock_list(self) -> Iterator[dict]:
+        return self._iter_parsed(STOCK_LIST, parse_stock_list_row)
 
-        parsed: set[str] = set()
-        for row in data:
-            if not isinstance(row, dict):
-                continue
-            try:
-                parsed.add(parse_actively_traded_row(row))
-            except InvalidProviderResponse:
-                continue
-        return parsed
+    def iter_actively_traded_rows(self) -> Iterator[dict]:
+        return self._iter_parsed(ACTIVELY_TRADING_LIST, parse_active_equity_row)
 
-    def get_actively_traded_rows(self) -> list[dict]:
-        data = fmp_get_json(ACTIVELY_TRADING_LIST)
-        if not isinstance(data, list):
-            raise InvalidProviderResponse("Malformed actively trading list payload.")
+    def iter_cryptocurrency_rows(self) -> Iterator[dict]:
+        return self._iter_parsed(CRYPTOCURRENCY_LIST, parse_crypto_list_row)
 
-        parsed: list[dict] = []
-        for row in data:
-            if not isinstance(row, dict):
-                continue
-            try:
-                parsed.append(parse_active_equity_row(row))
-            except InvalidProviderResponse:
-                continue
-        return parsed
+    def iter_commodity_rows(self) -> Iterator[dict]:
+        return self._iter_parsed(COMMODITIES_LIST, parse_commodity_list_row)
+
+    def get_stock_list(self) -> list[dict]:
+        return list(self.iter_stock_list())
+
+    def get_actively_traded_symbols(self) -> set[str]:
+        return set(self._iter_parsed(ACTIVELY_TRADING_LIST, parse_actively_traded_row))
+
+    def get_actively_traded_rows(self) -> list[dict]:
+        return list(self.iter_actively_traded_rows())
 
     def get_profile_with_identifiers(self, symbol: str) -> dict:
         normalized = (symbol or "").strip().upper()
@@ -147,34 +183,10 @@ class FMPProvider(MarketDataProvider):
         return parse_profile_identity_payload(row)
 
     def get_cryptocurrency_rows(self) -> list[dict]:
-        data = fmp_get_json(CRYPTOCURRENCY_LIST)
-        if not isinstance(data, list):
-            raise InvalidProviderResponse("Malformed cryptocurrency list payload.")
-
-        parsed: list[dict] = []
-        for row in data:
-            if not isinstance(row, dict):
-                continue
-            try:
-                parsed.append(parse_crypto_list_row(row))
-            except InvalidProviderResponse:
-                continue
-        return parsed
+        return list(self.iter_cryptocurrency_rows())
 
     def get_commodity_rows(self) -> list[dict]:
-        data = fmp_get_json(COMMODITIES_LIST)
-        if not isinstance(data, list):
-            raise InvalidProviderResponse("Malformed commodities list payload.")
-
-        parsed: list[dict] = []
-        for row in data:
-            if not isinstance(row, dict):
-                continue
-            try:
-                parsed.append(parse_commodity_list_row(row))
-            except InvalidProviderResponse:
-                continue
-        return parsed
+        return list(self.iter_commodity_rows())
 
     def search_by_isin(self, isin: str) -> list[dict]:
         normalized = (isin or "").strip().upper()
@@ -8,8 +8,20 @@ from apps.integrations.providers.fmp.constants import (
     FMP_MAX_RETRIES,
     FMP_RETRY_BACKOFF_SECONDS,
     FMP_TIMEOUT_SECONDS,
+    RESPONSE_CACHE_TTLS,
+)
+from apps.integrations.shared.http import get_json, iter_json
+from apps.integrations.shared.provider_guard import ProviderGuard
+from apps.integrations.shared.provider_state import get_provider_state_backend
+from apps.integrations.shared.response_cache import ResponseCache, cache_key
+
+
+FMP_GUARD = ProviderGuard(
+    name="FMP",
+    rate_per_minute=getattr(settings, "FMP_REQUESTS_PER_MINUTE", 300),
+    burst=getattr(settings, "FMP_REQUEST_BURST", None),
+    backend=get_provider_state_backend(),
 )
-from apps.integrations.shared.http import get_json
 
 
 def api_key_or_raise() -> str:
@@ -26,14 +38,51 @@ def build_fmp_url(path: str, **params) -> str:
     return f"{base_url}{path}?{urlencode(cleaned)}"
 
 
-def fmp_get_json(path: str, **params):
-    return get_json(
-        build_fmp_url(path, **params),
-        timeout=getattr(settings, "INTEGRATIONS_TIMEOUT_SECONDS", FMP_TIMEOUT_SECONDS),
-        max_retries=getattr(settings, "INTEGRATIONS_MAX_RETRIES", FMP_MAX_RETRIES),
-        backoff_seconds=getattr(
+def _request_options() -> dict:
+    return {
+        "timeout": getattr(settings, "INTEGRATIONS_TIMEOUT_SECONDS", FMP_TIMEOUT_SECONDS),
+        "max_retries": getattr(settings, "INTEGRATIONS_MAX_RETRIES", FMP_MAX_RETRIES),
+        "backoff_seconds": getattr(
             settings,
             "INTEGRATIONS_RETRY_BACKOFF_SECONDS",
             FMP_RETRY_BACKOFF_SECONDS,
         ),
-    )
+    }
+
+
+def response_cache_ttl(path: str) -> float:
+    overrides = getattr(settings, "FMP_RESPONSE_CACHE_TTLS", None) or {}
+    return float(overrides.get(path, RESPONSE_CACHE_TTLS.get(path, 0)))
+
+
+def response_cache() -> ResponseCache | None:
+    directory = getattr(settings, "FMP_RESPONSE_CACHE_DIR", None)
+    return ResponseCache(directory) if directory else None
+
+
+def fmp_get_json(path: str, **params):
+    url = build_fmp_url(path, **params)
+    ttl = response_cache_ttl(path)
+    cache = response_cache() if ttl > 0 else None
+    if cache is None:
+        return FMP_GUARD.request(get_json, url, **_request_options())
+
+    key = cache_key(path, params)
+    # Fresh entries are served outside the guard: they spend no budget and
+    # stay available while the circuit is open.
+    if cache.has_fresh(key, ttl_seconds=ttl):
+        return cache.get_json(url, key=key, ttl_seconds=ttl, **_request_options())
+    return FMP_GUARD.request(cache.get_json, url, key=key, ttl_seconds=ttl, **_request_options())
+
+
+def fmp_iter_json(path: str, **params):
+    url = build_fmp_url(path, **params)
+    ttl = response_cache_ttl(path)
+    cache = response_cache() if ttl > 0 else None
+    if cache is None:
+        return FMP_GUARD.stream(iter_json, url, **_request_options())
+
+    key = cache_key(path, params)
+    if cache.has_fresh(key, ttl_seconds=ttl):
+        return cache.iter_json(url, key=key, ttl_seconds=ttl, **_request_options())
+    return FMP_GUARD.stream(cache.iter_json, url, key=key, ttl_seconds=ttl, **_request_options())
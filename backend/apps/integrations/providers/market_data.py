@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Iterator
 
 from apps.integrations.shared.types import CompanyProfile, QuoteSnapshot
 
@@ -10,12 +11,20 @@ class MarketDataProvider(ABC):
     def get_quote(self, symbol: str) -> QuoteSnapshot:
         raise NotImplementedError
 
+    @abstractmethod
+    def get_quotes(self, symbols: list[str], *, batch_size: int | None = None) -> dict[str, QuoteSnapshot]:
+        raise NotImplementedError
+
     @abstractmethod
     def get_company_profile(self, symbol: str) -> CompanyProfile:
         raise NotImplementedError
 
     @abstractmethod
-    def get_dividends(self, symbol: str) -> list[dict]:
+    def get_dividends(self, symbol: str, *, limit: int | None = None) -> list[dict]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_historical_prices(self, symbol: str, *, start=None, end=None) -> list[dict]:
         raise NotImplementedError
 
     @abstractmethod
@@ -46,6 +55,18 @@ class MarketDataProvider(ABC):
     def get_commodity_rows(self) -> list[dict]:
         raise NotImplementedError
 
+    def iter_stock_list(self) -> Iterator[dict]:
+        yield from self.get_stock_list()
+
+    def iter_actively_traded_rows(self) -> Iterator[dict]:
+        yield from self.get_actively_traded_rows()
+
+    def iter_cryptocurrency_rows(self) -> Iterator[dict]:
+        yield from self.get_cryptocurrency_rows()
+
+    def iter_commodity_rows(self) -> Iterator[dict]:
+        yield from self.get_commodity_rows()
+
     @abstractmethod
     def get_profile_with_identifiers(self, symbol: str) -> dict:
         raise NotImplementedError
@@ -4,6 +4,9 @@ from .active_crypto_asset_service import ActiveCryptoAssetService
 from .active_crypto_sync_service import ActiveCryptoSyncService
 from .active_equity_asset_service import ActiveEquityAssetService
 from .active_equity_sync_service import ActiveEquitySyncService
+from .active_listing_refresh_service import ActiveListingRefreshService
+from .active_listing_search_service import ActiveListingSearchService
+from .fx_rate_matrix import FXRateMatrix
 from .fx_rate_service import FXRateService
 from .held_equity_review_service import HeldEquityReviewService
 from .held_market_asset_review_service import HeldMarketAssetReviewService
@@ -12,9 +15,12 @@ from .market_data_service import MarketDataService
 __all__ = [
     "MarketDataService",
     "FXRateService",
+    "FXRateMatrix",
     "ActiveCryptoSyncService",
     "ActiveCommoditySyncService",
     "ActiveEquitySyncService",
+    "ActiveListingRefreshService",
+    "ActiveListingSearchService",
     "ActiveCryptoAssetService",
     "ActiveCommodityAssetService",
     "HeldEquityReviewService",
@@ -19,7 +19,7 @@ class ActiveCommodityAssetService:
     @staticmethod
     def _get_listing(*, symbol: str) -> ActiveCommodityListing:
         normalized = (symbol or "").strip().upper()
-        listing = ActiveCommodityListing.objects.filter(provider="fmp", symbol=normalized).first()
+        listing = ActiveCommodityListing.objects.current(provider="fmp").filter(symbol=normalized).first()
         if listing is None:
             raise ValidationError({"active_commodity_symbol": "That commodity is not in the current commodity list."})
         return listing
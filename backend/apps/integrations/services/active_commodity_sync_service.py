@@ -1,37 +1,25 @@
-from django.db import transaction
-
 from apps.integrations.models import ActiveCommodityListing
 from apps.integrations.providers.fmp import FMP_PROVIDER
+from apps.integrations.services.active_listing_refresh_service import ActiveListingRefreshService
 
 
 class ActiveCommoditySyncService:
     @staticmethod
     def get_queryset(*, provider: str = "fmp"):
-        return ActiveCommodityListing.objects.filter(provider=provider)
+        return ActiveCommodityListing.objects.current(provider=provider)
 
     @staticmethod
-    @transaction.atomic
     def refresh_from_fmp() -> dict:
-        rows = FMP_PROVIDER.get_commodity_rows()
+        rows = FMP_PROVIDER.iter_commodity_rows()
 
-        ActiveCommodityListing.objects.filter(provider="fmp").delete()
-        ActiveCommodityListing.objects.bulk_create(
-            [
-                ActiveCommodityListing(
-                    provider="fmp",
-                    symbol=row["symbol"],
-                    name=row["name"],
-                    exchange=row["exchange"],
-                    trade_month=row["trade_month"],
-                    currency=row["currency"],
-                    source_payload=row,
-                )
-                for row in rows
-            ],
-            batch_size=5000,
+        return ActiveListingRefreshService.refresh(
+            model=ActiveCommodityListing,
+            rows=rows,
+            build_fields=lambda row: {
+                "name": row["name"],
+                "exchange": row["exchange"],
+                "trade_month": row["trade_month"],
+                "currency": row["currency"],
+                "source_payload": row,
+            },
         )
-
-        return {
-            "provider": "fmp",
-            "row_count": len(rows),
-        }
@@ -21,7 +21,7 @@ class ActiveCryptoAssetService:
     @staticmethod
     def _get_listing(*, symbol: str) -> ActiveCryptoListing:
         normalized = (symbol or "").strip().upper()
-        listing = ActiveCryptoListing.objects.filter(provider="fmp", symbol=normalized).first()
+        listing = ActiveCryptoListing.objects.current(provider="fmp").filter(symbol=normalized).first()
         if listing is None:
             raise ValidationError({"active_crypto_symbol": "That crypto pair is not in the current crypto list."})
         return listing
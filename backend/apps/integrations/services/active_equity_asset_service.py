@@ -23,7 +23,7 @@ class ActiveEquityAssetService:
     @staticmethod
     def _get_active_listing(*, symbol: str) -> ActiveEquityListing:
         normalized = (symbol or "").strip().upper()
-        listing = ActiveEquityListing.objects.filter(provider="fmp", symbol=normalized).first()
+        listing = ActiveEquityListing.objects.current(provider="fmp").filter(symbol=normalized).first()
         if listing is None:
             raise ValidationError({"active_equity_symbol": "That stock is not in the current active equity list."})
         return listing
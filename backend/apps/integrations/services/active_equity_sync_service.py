@@ -1,34 +1,22 @@
-from django.db import transaction
-
 from apps.integrations.models import ActiveEquityListing
 from apps.integrations.providers.fmp import FMP_PROVIDER
+from apps.integrations.services.active_listing_refresh_service import ActiveListingRefreshService
 
 
 class ActiveEquitySyncService:
     @staticmethod
     def get_queryset(*, provider: str = "fmp"):
-        return ActiveEquityListing.objects.filter(provider=provider)
+        return ActiveEquityListing.objects.current(provider=provider)
 
     @staticmethod
-    @transaction.atomic
     def refresh_from_fmp() -> dict:
-        rows = FMP_PROVIDER.get_actively_traded_rows()
+        rows = FMP_PROVIDER.iter_actively_traded_rows()
 
-        ActiveEquityListing.objects.filter(provider="fmp").delete()
-        ActiveEquityListing.objects.bulk_create(
-            [
-                ActiveEquityListing(
-                    provider="fmp",
-                    symbol=row["symbol"],
-                    name=row["name"],
-                    source_payload=row,
-                )
-                for row in rows
-            ],
-            batch_size=5000,
+        return ActiveListingRefreshService.refresh(
+            model=ActiveEquityListing,
+            rows=rows,
+            build_fields=lambda row: {
+                "name": row["name"],
+                "source_payload": row,
+            },
         )
-
-        return {
-            "provider": "fmp",
-            "row_count": len(rows),
-        }
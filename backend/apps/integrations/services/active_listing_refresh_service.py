@@ -0,0 +1,164 @@
+import hashlib
+import json
+from itertools import islice
+from typing import Callable, Iterable
+
+from django.conf import settings
+from django.utils import timezone
+
+from apps.integrations.models import ActiveListingGeneration
+from apps.integrations.services.active_listing_search_service import ActiveListingSearchService
+
+
+class ActiveListingRefreshService:
+    @staticmethod
+    def batch_size() -> int:
+        return max(int(getattr(settings, "ACTIVE_LISTING_REFRESH_BATCH_SIZE", 1000)), 1)
+
+    @staticmethod
+    def _content_hash(row: dict) -> str:
+        return hashlib.sha256(json.dumps(row, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _chunks(items: Iterable, size: int):
+        iterator = iter(items)
+        while chunk := list(islice(iterator, size)):
+            yield chunk
+
+    @staticmethod
+    def _pointer(*, model, provider: str) -> ActiveListingGeneration:
+        pointer, _ = ActiveListingGeneration.objects.get_or_create(listing=model.LISTING, provider=provider)
+        return pointer
+
+    @staticmethod
+    def collect_garbage(*, model, provider: str = "fmp", batch_size: int | None = None) -> int:
+        batch_size = max(batch_size or ActiveListingRefreshService.batch_size(), 1)
+        active_generation = (
+            ActiveListingGeneration.objects.filter(listing=model.LISTING, provider=provider)
+            .values_list("active_generation", flat=True)
+            .first()
+        ) or 0
+
+        collected = 0
+        while True:
+            pks = list(
+                model.objects.filter(
+                    provider=provider,
+                    retired_generation__lte=active_generation,
+                ).values_list("pk", flat=True)[:batch_size]
+            )
+            if not pks:
+                return collected
+            collected += model.objects.filter(pk__in=pks).delete()[0]
+
+    @staticmethod
+    def _write_batch(*, model, provider: str, generation: int, incoming: dict, existing: dict) -> tuple[int, int]:
+        new_symbols = [symbol for symbol in incoming if symbol not in existing]
+        changed = {
+            existing[symbol][0]: symbol
+            for symbol, (_, content_hash) in incoming.items()
+            if symbol in existing
+            and (existing[symbol][1] != content_hash or existing[symbol][2] is not None)
+        }
+
+        if new_symbols:
+            model.objects.bulk_create(
+                [
+                    model(
+                        provider=provider,
+                        symbol=symbol,
+                        content_hash=incoming[symbol][1],
+                        generation=generation,
+                        **incoming[symbol][0],
+                    )
+                    for symbol in new_symbols
+                ]
+            )
+
+        if changed:
+            now = timezone.now()
+            listings = list(model.objects.filter(pk__in=list(changed)))
+            for listing in listings:
+                fields, content_hash = incoming[changed[listing.pk]]
+                for field, value in fields.items():
+                    setattr(listing, field, value)
+                listing.content_hash = content_hash
+                listing.retired_generation = None
+                listing.last_refreshed_at = now
+            if listings:
+                model.objects.bulk_update(
+                    listings,
+                    fields=["content_hash", "retired_generation", "last_refreshed_at", *fields.keys()],
+                )
+
+        return len(new_symbols), len(changed)
+
+    @staticmethod
+    def refresh(
+        *,
+        model,
+        rows: Iterable[dict],
+        build_fields: Callable[[dict], dict],
+        provider: str = "fmp",
+        batch_size: int | None = None,
+    ) -> dict:
+        batch_size = max(batch_size or ActiveListingRefreshService.batch_size(), 1)
+        pointer = ActiveListingRefreshService._pointer(model=model, provider=provider)
+        generation = pointer.active_generation + 1
+
+        existing = {
+            symbol: (pk, content_hash, retired_generation)
+            for pk, symbol, content_hash, retired_generation in model.objects.filter(provider=provider)
+            .order_by()
+            .values_list("pk", "symbol", "content_hash", "retired_generation")
+        }
+
+        seen: set[str] = set()
+        created = updated = 0
+        for chunk in ActiveListingRefreshService._chunks(rows, batch_size):
+            incoming: dict[str, tuple[dict, str]] = {}
+            for row in chunk:
+                if row["symbol"] in seen:
+                    continue
+                seen.add(row["symbol"])
+                incoming[row["symbol"]] = (build_fields(row), ActiveListingRefreshService._content_hash(row))
+            batch_created, batch_updated = ActiveListingRefreshService._write_batch(
+                model=model,
+                provider=provider,
+                generation=generation,
+                incoming=incoming,
+                existing=existing,
+            )
+            created += batch_created
+            updated += batch_updated
+
+        retired_ids = [
+            pk
+            for symbol, (pk, _, retired_generation) in existing.items()
+            if symbol not in seen and retired_generation is None
+        ]
+        for chunk in ActiveListingRefreshService._chunks(retired_ids, batch_size):
+            model.objects.filter(pk__in=chunk).update(retired_generation=generation)
+
+        ActiveListingGeneration.objects.filter(pk=pointer.pk).update(
+            active_generation=generation,
+            row_count=len(seen),
+            refreshed_at=timezone.now(),
+        )
+        collected = ActiveListingRefreshService.collect_garbage(
+            model=model,
+            provider=provider,
+            batch_size=batch_size,
+        )
+        ActiveListingSearchService.build(model=model, provider=provider)
+
+        return {
+            "provider": provider,
+            "row_count": len(seen),
+            "generation": generation,
+            "created": created,
+            "updated": updated,
+            "unchanged": len(seen) - created - updated,
+            "retired": len(retired_ids),
+            "collected": collected,
+        }
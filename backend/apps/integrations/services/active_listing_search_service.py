@@ -0,0 +1,151 @@
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.conf import settings
+
+from apps.integrations.models import (
+    ActiveCommodityListing,
+    ActiveCryptoListing,
+    ActiveEquityListing,
+    ActiveListingGeneration,
+)
+from apps.integrations.shared.search_index import PrefixTrigramIndex
+
+logger = logging.getLogger(__name__)
+
+SEARCH_FIELDS = {
+    ActiveEquityListing: {
+        "fields": ("symbol", "name"),
+        "key_fields": ("symbol",),
+        "text_fields": ("name",),
+    },
+    ActiveCryptoListing: {
+        "fields": ("symbol", "name", "base_symbol", "quote_currency"),
+        "key_fields": ("symbol", "base_symbol"),
+        "text_fields": ("name",),
+    },
+    ActiveCommodityListing: {
+        "fields": ("symbol", "name", "exchange", "trade_month", "currency"),
+        "key_fields": ("symbol",),
+        "text_fields": ("name",),
+    },
+}
+
+
+@dataclass
+class _IndexSlot:
+    index: PrefixTrigramIndex
+    generation: int
+    checked_at: float
+    dirty: bool = False
+
+
+_SLOTS: dict[tuple[str, str], _IndexSlot] = {}
+_LOCK = threading.Lock()
+
+
+class ActiveListingSearchService:
+    @staticmethod
+    def _check_seconds() -> float:
+        return float(getattr(settings, "ACTIVE_LISTING_INDEX_CHECK_SECONDS", 5))
+
+    @staticmethod
+    def _active_generation(*, model, provider: str) -> int:
+        return (
+            ActiveListingGeneration.objects.filter(listing=model.LISTING, provider=provider)
+            .values_list("active_generation", flat=True)
+            .first()
+        ) or 0
+
+    @staticmethod
+    def _warm_path(*, model, provider: str) -> Path | None:
+        index_dir = getattr(settings, "ACTIVE_LISTING_INDEX_DIR", None)
+        if not index_dir:
+            return None
+        return Path(index_dir) / f"{model.LISTING}-{provider}.json"
+
+    @staticmethod
+    def _load_warm(*, model, provider: str, generation: int) -> PrefixTrigramIndex | None:
+        path = ActiveListingSearchService._warm_path(model=model, provider=provider)
+        if path is None or not path.exists():
+            return None
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            logger.warning("[SEARCH] unreadable warm-start file %s", path)
+            return None
+        if payload.get("generation") != generation:
+            return None
+        return PrefixTrigramIndex.from_payload(payload)
+
+    @staticmethod
+    def _write_warm(*, model, provider: str, generation: int, index: PrefixTrigramIndex) -> None:
+        path = ActiveListingSearchService._warm_path(model=model, provider=provider)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            temp_path.write_text(json.dumps({"generation": generation, **index.to_payload()}), encoding="utf-8")
+            os.replace(temp_path, path)
+        except OSError:
+            logger.warning("[SEARCH] could not write warm-start file %s", path, exc_info=True)
+
+    @staticmethod
+    def build(*, model, provider: str = "fmp") -> PrefixTrigramIndex:
+        spec = SEARCH_FIELDS[model]
+        generation = ActiveListingSearchService._active_generation(model=model, provider=provider)
+        index = PrefixTrigramIndex(
+            rows=list(model.objects.current(provider=provider).order_by().values(*spec["fields"])),
+            key_fields=spec["key_fields"],
+            text_fields=spec["text_fields"],
+        )
+        ActiveListingSearchService._write_warm(model=model, provider=provider, generation=generation, index=index)
+        with _LOCK:
+            _SLOTS[(model.LISTING, provider)] = _IndexSlot(
+                index=index,
+                generation=generation,
+                checked_at=time.monotonic(),
+            )
+        return index
+
+    @staticmethod
+    def invalidate(*, model=None, provider: str | None = None) -> None:
+        with _LOCK:
+            for (listing, slot_provider), slot in _SLOTS.items():
+                if model is not None and listing != model.LISTING:
+                    continue
+                if provider is not None and slot_provider != provider:
+                    continue
+                slot.dirty = True
+
+    @staticmethod
+    def get_index(*, model, provider: str = "fmp") -> PrefixTrigramIndex:
+        key = (model.LISTING, provider)
+        slot = _SLOTS.get(key)
+        now = time.monotonic()
+        if slot is not None and not slot.dirty and now - slot.checked_at < ActiveListingSearchService._check_seconds():
+            return slot.index
+
+        generation = ActiveListingSearchService._active_generation(model=model, provider=provider)
+        if slot is not None and not slot.dirty and slot.generation == generation:
+            slot.checked_at = now
+            return slot.index
+
+        if slot is None or slot.generation != generation:
+            index = ActiveListingSearchService._load_warm(model=model, provider=provider, generation=generation)
+            if index is not None:
+                with _LOCK:
+                    _SLOTS[key] = _IndexSlot(index=index, generation=generation, checked_at=now)
+                return index
+
+        return ActiveListingSearchService.build(model=model, provider=provider)
+
+    @staticmethod
+    def search(*, model, query: str, provider: str = "fmp", limit: int = 25) -> list[dict]:
+        return ActiveListingSearchService.get_index(model=model, provider=provider).search(query, limit=limit)
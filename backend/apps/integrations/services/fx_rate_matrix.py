@@ -0,0 +1,173 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import connections
+
+from apps.integrations.models import FXRateCache
+from apps.integrations.services.fx_rate_service import FXRateService
+
+logger = logging.getLogger(__name__)
+
+
+class _ProcessRateCache:
+    def __init__(self):
+        self._entries: OrderedDict[tuple[str, str], tuple[Decimal, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _max_size() -> int:
+        return getattr(settings, "FX_RATE_PROCESS_CACHE_SIZE", 1024)
+
+    @staticmethod
+    def _ttl_seconds() -> int:
+        return getattr(settings, "FX_RATE_PROCESS_CACHE_TTL_SECONDS", 300)
+
+    def get(self, pair: tuple[str, str]) -> Decimal | None:
+        with self._lock:
+            entry = self._entries.get(pair)
+            if entry is None:
+                return None
+            rate, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[pair]
+                return None
+            self._entries.move_to_end(pair)
+            return rate
+
+    def set(self, pair: tuple[str, str], rate: Decimal) -> None:
+        with self._lock:
+            self._entries[pair] = (rate, time.monotonic() + self._ttl_seconds())
+            self._entries.move_to_end(pair)
+            while len(self._entries) > self._max_size():
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_PROCESS_CACHE = _ProcessRateCache()
+_REFRESH_LOCK = threading.Lock()
+_REFRESHING: set[tuple[str, str]] = set()
+_REFRESH_EXECUTOR: ThreadPoolExecutor | None = None
+
+
+def _refresh_executor() -> ThreadPoolExecutor:
+    global _REFRESH_EXECUTOR
+    with _REFRESH_LOCK:
+        if _REFRESH_EXECUTOR is None:
+            _REFRESH_EXECUTOR = ThreadPoolExecutor(
+                max_workers=getattr(settings, "FX_RATE_REFRESH_WORKERS", 2),
+                thread_name_prefix="fx-refresh",
+            )
+        return _REFRESH_EXECUTOR
+
+
+def _refresh_pair(pair: tuple[str, str]) -> None:
+    try:
+        rate = FXRateService.get_rate(base_currency=pair[0], quote_currency=pair[1], force_refresh=True)
+        _PROCESS_CACHE.set(pair, rate)
+    except Exception:
+        logger.warning("[FX] background refresh failed for %s/%s", pair[0], pair[1], exc_info=True)
+    finally:
+        with _REFRESH_LOCK:
+            _REFRESHING.discard(pair)
+        connections.close_all()
+
+
+class FXRateMatrix:
+    """Request/job-scoped FX lookups backed by one FXRateCache load and a process-level LRU."""
+
+    def __init__(self, *, provider: str = "fmp", refresh_in_background: bool | None = None):
+        self.provider = provider
+        if refresh_in_background is None:
+            refresh_in_background = getattr(settings, "FX_RATE_BACKGROUND_REFRESH", True)
+        self.refresh_in_background = refresh_in_background
+        self._rows: dict[tuple[str, str], FXRateCache] | None = None
+        self._resolved: dict[tuple[str, str], Decimal] = {}
+
+    @staticmethod
+    def clear_process_cache() -> None:
+        _PROCESS_CACHE.clear()
+
+    @staticmethod
+    def _cross_currency() -> str:
+        return (getattr(settings, "FX_RATE_CROSS_CURRENCY", "USD") or "").strip().upper()
+
+    def _load(self) -> dict[tuple[str, str], FXRateCache]:
+        if self._rows is None:
+            self._rows = {
+                (row.base_currency, row.quote_currency): row
+                for row in FXRateCache.objects.filter(provider=self.provider)
+            }
+        return self._rows
+
+    def _direct(self, base: str, quote: str) -> tuple[Decimal, bool] | None:
+        rows = self._load()
+        row = rows.get((base, quote))
+        if row is not None and row.rate:
+            return row.rate, FXRateService.is_fresh(cache_row=row)
+        inverse = rows.get((quote, base))
+        if inverse is not None and inverse.rate:
+            return Decimal("1") / inverse.rate, FXRateService.is_fresh(cache_row=inverse)
+        return None
+
+    def _derive(self, base: str, quote: str) -> tuple[Decimal, bool] | None:
+        direct = self._direct(base, quote)
+        if direct is not None and direct[1]:
+            return direct
+
+        cross = self._cross_currency()
+        if cross and cross not in (base, quote):
+            first_leg = self._direct(base, cross)
+            second_leg = self._direct(cross, quote)
+            if first_leg is not None and second_leg is not None:
+                crossed = (first_leg[0] * second_leg[0], first_leg[1] and second_leg[1])
+                if crossed[1] or direct is None:
+                    return crossed
+
+        return direct
+
+    def _schedule_refresh(self, pair: tuple[str, str]) -> None:
+        with _REFRESH_LOCK:
+            if pair in _REFRESHING:
+                return
+            _REFRESHING.add(pair)
+        _refresh_executor().submit(_refresh_pair, pair)
+
+    def get_rate(self, *, base_currency: str | None, quote_currency: str | None) -> Decimal:
+        base = (base_currency or "").strip().upper()
+        quote = (quote_currency or "").strip().upper()
+        if not base or not quote or base == quote:
+            return Decimal("1")
+
+        pair = (base, quote)
+        if pair in self._resolved:
+            return self._resolved[pair]
+
+        rate = _PROCESS_CACHE.get(pair)
+        if rate is None:
+            derived = self._derive(base, quote)
+            if derived is None:
+                rate = FXRateService.get_rate(base_currency=base, quote_currency=quote)
+                _PROCESS_CACHE.set(pair, rate)
+            else:
+                rate, is_fresh = derived
+                if is_fresh:
+                    _PROCESS_CACHE.set(pair, rate)
+                elif self.refresh_in_background:
+                    self._schedule_refresh(pair)
+                else:
+                    try:
+                        rate = FXRateService.get_rate(base_currency=base, quote_currency=quote, force_refresh=True)
+                        _PROCESS_CACHE.set(pair, rate)
+                    except Exception:
+                        logger.warning("[FX] refresh failed for %s/%s; serving stale rate", base, quote)
+
+        self._resolved[pair] = rate
+        return rate
@@ -1,15 +1,20 @@
 from difflib import SequenceMatcher
 
-from django.db import transaction
+from django.db import models, transaction
 from django.utils import timezone
 
 from apps.assets.models import Asset, AssetMarketData
 from apps.integrations.exceptions import EmptyProviderResult, IntegrationError
 from apps.integrations.models import ActiveEquityListing
 from apps.integrations.providers.fmp import FMP_PROVIDER
+from apps.integrations.shared.concurrency import fmp_executor
 
 
 class HeldEquityReviewService:
+    BULK_BATCH_SIZE = 1000
+    NO_IDENTIFIERS_REASON = "Ticker or name changed and no identifiers are stored for verification."
+    NO_MATCH_REASON = "No clear active match found from stored identifiers."
+
     @staticmethod
     def _normalized_name(value: str) -> str:
         return " ".join((value or "").strip().upper().split())
@@ -31,14 +36,30 @@ class HeldEquityReviewService:
         normalized = (symbol or "").strip().upper()
         if not normalized:
             return None
-        return ActiveEquityListing.objects.filter(provider="fmp", symbol=normalized).first()
+        return ActiveEquityListing.objects.current(provider="fmp").filter(symbol=normalized).first()
 
     @staticmethod
-    def _candidate_rows_from_identifiers(market_data: AssetMarketData) -> list[dict]:
+    def _identifier_lookups(market_data: AssetMarketData) -> list[tuple[str, str]]:
+        return [
+            (kind, value)
+            for kind, value in (
+                ("isin", market_data.isin),
+                ("cusip", market_data.cusip),
+                ("cik", market_data.cik),
+            )
+            if value
+        ]
+
+    @staticmethod
+    def _search_identifier(lookup: tuple[str, str]) -> list[dict]:
+        kind, value = lookup
+        return getattr(FMP_PROVIDER, f"search_by_{kind}")(value)
+
+    @staticmethod
+    def _collect_candidates(row_groups: list[list[dict]]) -> list[dict]:
         candidates: list[dict] = []
         seen_keys: set[tuple[str, str]] = set()
-
-        def add_rows(rows):
+        for rows in row_groups:
             for row in rows or []:
                 symbol = (row.get("symbol") or "").strip().upper()
                 name = (row.get("name") or row.get("companyName") or "").strip()
@@ -58,28 +79,41 @@ class HeldEquityReviewService:
                         "cik": (row.get("cik") or "").strip(),
                     }
                 )
+        return candidates
 
-        if market_data.isin:
-            add_rows(FMP_PROVIDER.search_by_isin(market_data.isin))
-        if market_data.cusip:
-            add_rows(FMP_PROVIDER.search_by_cusip(market_data.cusip))
-        if market_data.cik:
-            add_rows(FMP_PROVIDER.search_by_cik(market_data.cik))
+    @staticmethod
+    def _candidate_rows_from_identifiers(market_data: AssetMarketData) -> list[dict]:
+        return HeldEquityReviewService._collect_candidates(
+            [
+                HeldEquityReviewService._search_identifier(lookup)
+                for lookup in HeldEquityReviewService._identifier_lookups(market_data)
+            ]
+        )
 
-        return candidates
+    @staticmethod
+    def _active_symbols(symbols) -> set[str]:
+        symbols = {symbol for symbol in symbols if symbol}
+        if not symbols:
+            return set()
+        return set(
+            ActiveEquityListing.objects.current(provider="fmp")
+            .filter(symbol__in=symbols)
+            .values_list("symbol", flat=True)
+        )
 
     @staticmethod
-    def _resolve_candidate(asset: Asset, market_data: AssetMarketData) -> dict | None:
-        candidates = HeldEquityReviewService._candidate_rows_from_identifiers(market_data)
+    def _match_candidates(
+        asset: Asset,
+        market_data: AssetMarketData,
+        candidates: list[dict],
+        active_symbols: set[str],
+    ) -> dict | None:
         expected_name = market_data.last_seen_name or asset.name
         expected_exchange = market_data.last_seen_exchange
 
         matched: list[dict] = []
         for candidate in candidates:
-            if not ActiveEquityListing.objects.filter(
-                provider="fmp",
-                symbol=candidate["symbol"],
-            ).exists():
+            if candidate["symbol"] not in active_symbols:
                 continue
 
             if expected_exchange and candidate["exchange"] and candidate["exchange"] != expected_exchange:
@@ -106,19 +140,55 @@ class HeldEquityReviewService:
         return None
 
     @staticmethod
-    def _mark_review_needed(asset: Asset, market_data: AssetMarketData, reason: str) -> None:
+    def _resolve_candidate(asset: Asset, market_data: AssetMarketData) -> dict | None:
+        candidates = HeldEquityReviewService._candidate_rows_from_identifiers(market_data)
+        active_symbols = HeldEquityReviewService._active_symbols(candidate["symbol"] for candidate in candidates)
+        return HeldEquityReviewService._match_candidates(asset, market_data, candidates, active_symbols)
+
+    @staticmethod
+    def _apply_tracked(market_data: AssetMarketData, *, name: str, symbol: str, now) -> None:
+        market_data.status = AssetMarketData.Status.TRACKED
+        market_data.last_seen_name = name
+        market_data.last_seen_symbol = symbol
+        market_data.last_synced_at = now
+        market_data.last_error = ""
+
+    @staticmethod
+    def _apply_review_needed(market_data: AssetMarketData, reason: str, now) -> None:
         market_data.status = AssetMarketData.Status.NEEDS_REVIEW
-        market_data.last_synced_at = timezone.now()
+        market_data.last_synced_at = now
         market_data.last_error = reason
-        market_data.save()
 
     @staticmethod
-    def _mark_stale(asset: Asset, market_data: AssetMarketData, reason: str) -> None:
+    def _apply_stale(asset: Asset, market_data: AssetMarketData, reason: str, now) -> None:
         market_data.status = AssetMarketData.Status.STALE
-        market_data.last_synced_at = timezone.now()
+        market_data.last_synced_at = now
         market_data.last_error = reason
-        market_data.save()
         asset.is_active = False
+
+    @staticmethod
+    def _apply_candidate(asset: Asset, market_data: AssetMarketData, candidate: dict, now) -> None:
+        market_data.provider_symbol = candidate["symbol"]
+        market_data.last_seen_symbol = candidate["symbol"]
+        market_data.last_seen_name = candidate["name"]
+        market_data.last_seen_exchange = candidate["exchange"]
+        market_data.status = AssetMarketData.Status.TRACKED
+        market_data.last_synced_at = now
+        market_data.last_successful_sync_at = now
+        market_data.last_error = ""
+        asset.symbol = candidate["symbol"]
+        asset.name = candidate["name"]
+        asset.is_active = True
+
+    @staticmethod
+    def _mark_review_needed(asset: Asset, market_data: AssetMarketData, reason: str) -> None:
+        HeldEquityReviewService._apply_review_needed(market_data, reason, timezone.now())
+        market_data.save()
+
+    @staticmethod
+    def _mark_stale(asset: Asset, market_data: AssetMarketData, reason: str) -> None:
+        HeldEquityReviewService._apply_stale(asset, market_data, reason, timezone.now())
+        market_data.save()
         asset.save(update_fields=["is_active", "updated_at"])
 
     @staticmethod
@@ -173,11 +243,12 @@ class HeldEquityReviewService:
             expected_name,
             active_listing.name,
         ):
-            market_data.status = AssetMarketData.Status.TRACKED
-            market_data.last_seen_name = active_listing.name
-            market_data.last_seen_symbol = active_listing.symbol
-            market_data.last_synced_at = timezone.now()
-            market_data.last_error = ""
+            HeldEquityReviewService._apply_tracked(
+                market_data,
+                name=active_listing.name,
+                symbol=active_listing.symbol,
+                now=timezone.now(),
+            )
             market_data.save()
             return "tracked"
 
@@ -185,7 +256,7 @@ class HeldEquityReviewService:
             HeldEquityReviewService._mark_review_needed(
                 asset,
                 market_data,
-                "Ticker or name changed and no identifiers are stored for verification.",
+                HeldEquityReviewService.NO_IDENTIFIERS_REASON,
             )
             return "needs_review"
 
@@ -201,36 +272,163 @@ class HeldEquityReviewService:
             HeldEquityReviewService._mark_stale(
                 asset,
                 market_data,
-                "No clear active match found from stored identifiers.",
+                HeldEquityReviewService.NO_MATCH_REASON,
             )
             return "stale"
 
-        market_data.provider_symbol = candidate["symbol"]
-        market_data.last_seen_symbol = candidate["symbol"]
-        market_data.last_seen_name = candidate["name"]
-        market_data.last_seen_exchange = candidate["exchange"]
-        market_data.status = AssetMarketData.Status.TRACKED
-        market_data.last_synced_at = timezone.now()
-        market_data.last_successful_sync_at = market_data.last_synced_at
-        market_data.last_error = ""
+        HeldEquityReviewService._apply_candidate(asset, market_data, candidate, timezone.now())
         market_data.save()
-
-        asset.symbol = candidate["symbol"]
-        asset.name = candidate["name"]
-        asset.is_active = True
         asset.save(update_fields=["symbol", "name", "is_active", "updated_at"])
         return "tracked"
 
     @staticmethod
-    def review_all_tracked_equities() -> dict:
-        queryset = Asset.objects.filter(
-            owner__isnull=True,
-            asset_type__slug="equity",
-            market_data__provider=AssetMarketData.Provider.FMP,
-        ).select_related("market_data", "asset_type")
+    def _lookup_identifiers(lookups: set[tuple[str, str]], *, max_workers: int | None = None) -> dict:
+        results = fmp_executor(max_workers=max_workers).map(
+            HeldEquityReviewService._search_identifier,
+            sorted(lookups),
+        )
+        return {result.item: result for result in results}
 
+    @staticmethod
+    def _candidates_from_lookups(market_data: AssetMarketData, lookups: dict) -> tuple[list[dict], Exception | None]:
+        row_groups: list[list[dict]] = []
+        for lookup in HeldEquityReviewService._identifier_lookups(market_data):
+            result = lookups[lookup]
+            if result.ok:
+                row_groups.append(result.value)
+                continue
+            if isinstance(result.error, IntegrationError):
+                return [], result.error
+            raise result.error
+        return HeldEquityReviewService._collect_candidates(row_groups), None
+
+    @staticmethod
+    @transaction.atomic
+    def _flush_review(*, assets: list[Asset], market_data_rows: list[AssetMarketData], now) -> None:
+        for market_data in market_data_rows:
+            market_data.updated_at = now
+        AssetMarketData.objects.bulk_update(
+            market_data_rows,
+            fields=[
+                "provider_symbol",
+                "last_seen_symbol",
+                "last_seen_name",
+                "last_seen_exchange",
+                "status",
+                "last_synced_at",
+                "last_successful_sync_at",
+                "last_error",
+                "updated_at",
+            ],
+            batch_size=HeldEquityReviewService.BULK_BATCH_SIZE,
+        )
+        for asset in assets:
+            asset.updated_at = now
+        Asset.objects.bulk_update(
+            assets,
+            fields=["symbol", "name", "is_active", "updated_at"],
+            batch_size=HeldEquityReviewService.BULK_BATCH_SIZE,
+        )
+
+    @staticmethod
+    def review_all_tracked_equities(*, max_workers: int | None = None) -> dict:
+        queryset = (
+            Asset.objects.filter(
+                owner__isnull=True,
+                asset_type__slug="equity",
+                market_data__provider=AssetMarketData.Provider.FMP,
+            )
+            .select_related("market_data")
+            .annotate(
+                active_listing_name=models.Subquery(
+                    ActiveEquityListing.objects.current(provider="fmp")
+                    .filter(symbol=models.OuterRef("market_data__provider_symbol"))
+                    .order_by()
+                    .values("name")[:1]
+                )
+            )
+            .order_by()
+        )
+
+        now = timezone.now()
         summary = {"tracked": 0, "needs_review": 0, "stale": 0, "skipped": 0}
+        changed_assets: list[Asset] = []
+        changed_market_data: list[AssetMarketData] = []
+        unresolved: list[Asset] = []
+
         for asset in queryset:
-            result = HeldEquityReviewService.review_asset(asset=asset)
-            summary[result] = summary.get(result, 0) + 1
+            market_data = asset.market_data
+            if not market_data.provider_symbol:
+                summary["skipped"] += 1
+                continue
+
+            expected_name = market_data.last_seen_name or asset.name
+            if asset.active_listing_name is not None and HeldEquityReviewService._names_are_consistent(
+                expected_name,
+                asset.active_listing_name,
+            ):
+                HeldEquityReviewService._apply_tracked(
+                    market_data,
+                    name=asset.active_listing_name,
+                    symbol=market_data.provider_symbol,
+                    now=now,
+                )
+                changed_market_data.append(market_data)
+                summary["tracked"] += 1
+            elif not any([market_data.isin, market_data.cusip, market_data.cik]):
+                HeldEquityReviewService._apply_review_needed(
+                    market_data,
+                    HeldEquityReviewService.NO_IDENTIFIERS_REASON,
+                    now,
+                )
+                changed_market_data.append(market_data)
+                summary["needs_review"] += 1
+            else:
+                unresolved.append(asset)
+
+        lookups = HeldEquityReviewService._lookup_identifiers(
+            {
+                lookup
+                for asset in unresolved
+                for lookup in HeldEquityReviewService._identifier_lookups(asset.market_data)
+            },
+            max_workers=max_workers,
+        )
+        candidates_by_asset: dict = {}
+        for asset in unresolved:
+            candidates, error = HeldEquityReviewService._candidates_from_lookups(asset.market_data, lookups)
+            candidates_by_asset[asset.pk] = (candidates, error)
+
+        active_symbols = HeldEquityReviewService._active_symbols(
+            candidate["symbol"]
+            for candidates, _ in candidates_by_asset.values()
+            for candidate in candidates
+        )
+
+        for asset in unresolved:
+            market_data = asset.market_data
+            candidates, error = candidates_by_asset[asset.pk]
+            changed_market_data.append(market_data)
+            if isinstance(error, EmptyProviderResult):
+                candidate = None
+            elif error is not None:
+                HeldEquityReviewService._apply_review_needed(market_data, str(error), now)
+                summary["needs_review"] += 1
+                continue
+            else:
+                candidate = HeldEquityReviewService._match_candidates(asset, market_data, candidates, active_symbols)
+
+            changed_assets.append(asset)
+            if candidate is None:
+                HeldEquityReviewService._apply_stale(asset, market_data, HeldEquityReviewService.NO_MATCH_REASON, now)
+                summary["stale"] += 1
+            else:
+                HeldEquityReviewService._apply_candidate(asset, market_data, candidate, now)
+                summary["tracked"] += 1
+
+        HeldEquityReviewService._flush_review(
+            assets=changed_assets,
+            market_data_rows=changed_market_data,
+            now=now,
+        )
         return summary
@@ -41,7 +41,7 @@ class HeldMarketAssetReviewService:
         symbol = market_data.provider_symbol
 
         if slug in {"crypto", "cryptocurrency"}:
-            listing = ActiveCryptoListing.objects.filter(provider="fmp", symbol=symbol).first()
+            listing = ActiveCryptoListing.objects.current(provider="fmp").filter(symbol=symbol).first()
             if listing is None:
                 return HeldMarketAssetReviewService._mark_stale(
                     asset=asset,
@@ -56,7 +56,7 @@ class HeldMarketAssetReviewService:
             )
 
         if slug == "commodity":
-            listing = ActiveCommodityListing.objects.filter(provider="fmp", symbol=symbol).first()
+            listing = ActiveCommodityListing.objects.current(provider="fmp").filter(symbol=symbol).first()
             if listing is None:
                 return HeldMarketAssetReviewService._mark_stale(
                     asset=asset,
@@ -79,10 +79,7 @@ class HeldMarketAssetReviewService:
                     market_data=market_data,
                     reason="Precious metal mapping is missing.",
                 )
-            listing = ActiveCommodityListing.objects.filter(
-                provider="fmp",
-                symbol=metal_spec["symbol"],
-            ).first()
+            listing = ActiveCommodityListing.objects.current(provider="fmp").filter(symbol=metal_spec["symbol"]).first()
             if listing is None:
                 return HeldMarketAssetReviewService._mark_stale(
                     asset=asset,
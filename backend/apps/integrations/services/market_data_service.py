@@ -1,9 +1,7 @@
-from django.db import models
-
 from apps.integrations.exceptions import EmptyProviderResult
-from apps.integrations.models import ActiveCommodityListing, ActiveCryptoListing
+from apps.integrations.models import ActiveCommodityListing, ActiveCryptoListing, ActiveEquityListing
 from apps.integrations.providers.fmp import FMP_PROVIDER
-from apps.integrations.services.active_equity_sync_service import ActiveEquitySyncService
+from apps.integrations.services.active_listing_search_service import ActiveListingSearchService
 from apps.integrations.services.constants import PRECIOUS_METAL_COMMODITY_MAP
 
 
@@ -33,43 +31,22 @@ class MarketDataService:
         return FMP_PROVIDER.get_available_countries()
 
     @staticmethod
-    def search_active_equities(*, query: str):
-        queryset = ActiveEquitySyncService.get_queryset(provider="fmp")
-        normalized = (query or "").strip()
-        if normalized:
-            queryset = queryset.filter(
-                models.Q(symbol__icontains=normalized) | models.Q(name__icontains=normalized)
-            )
-        return queryset.order_by("symbol")
+    def search_active_equities(*, query: str, limit: int = 25) -> list[dict]:
+        return ActiveListingSearchService.search(model=ActiveEquityListing, query=query, limit=limit)
 
     @staticmethod
-    def search_active_cryptos(*, query: str):
-        queryset = ActiveCryptoListing.objects.filter(provider="fmp")
-        normalized = (query or "").strip()
-        if normalized:
-            queryset = queryset.filter(
-                models.Q(symbol__icontains=normalized)
-                | models.Q(name__icontains=normalized)
-                | models.Q(base_symbol__icontains=normalized)
-            )
-        return queryset.order_by("symbol")
+    def search_active_cryptos(*, query: str, limit: int = 25) -> list[dict]:
+        return ActiveListingSearchService.search(model=ActiveCryptoListing, query=query, limit=limit)
 
     @staticmethod
-    def search_active_commodities(*, query: str):
-        queryset = ActiveCommodityListing.objects.filter(provider="fmp")
-        normalized = (query or "").strip()
-        if normalized:
-            queryset = queryset.filter(
-                models.Q(symbol__icontains=normalized) | models.Q(name__icontains=normalized)
-            )
-        return queryset.order_by("symbol")
+    def search_active_commodities(*, query: str, limit: int = 25) -> list[dict]:
+        return ActiveListingSearchService.search(model=ActiveCommodityListing, query=query, limit=limit)
 
     @staticmethod
     def get_active_precious_metals() -> list[dict]:
         commodity_listings = {
             listing.symbol: listing
-            for listing in ActiveCommodityListing.objects.filter(
-                provider="fmp",
+            for listing in ActiveCommodityListing.objects.current(provider="fmp").filter(
                 symbol__in=[spec["symbol"] for spec in PRECIOUS_METAL_COMMODITY_MAP.values()],
             )
         }
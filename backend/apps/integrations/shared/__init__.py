@@ -1,5 +1,24 @@
-from .http import get_json
+from .http import SESSION_MANAGER, get_json, get_session, iter_json
 from .provider_guard import ProviderGuard
+from .provider_state import DatabaseProviderStateBackend, LocalProviderStateBackend, get_provider_state_backend
+from .response_cache import ResponseCache
+from .single_flight import DatabaseLeaseBackend, LocalLeaseBackend, SingleFlight, get_lease_backend
 from .types import CompanyProfile, QuoteSnapshot
 
-__all__ = ["get_json", "ProviderGuard", "QuoteSnapshot", "CompanyProfile"]
+__all__ = [
+    "get_json",
+    "iter_json",
+    "get_session",
+    "SESSION_MANAGER",
+    "ProviderGuard",
+    "LocalProviderStateBackend",
+    "DatabaseProviderStateBackend",
+    "get_provider_state_backend",
+    "ResponseCache",
+    "SingleFlight",
+    "LocalLeaseBackend",
+    "DatabaseLeaseBackend",
+    "get_lease_backend",
+    "QuoteSnapshot",
+    "CompanyProfile",
+]
@@ -0,0 +1,55 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+
+from django.conf import settings
+from django.db import connections
+
+
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+@dataclass(frozen=True)
+class ProviderCallResult:
+    item: Any
+    value: Any = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class ProviderExecutor:
+    def __init__(self, *, max_workers: int | None = None):
+        self.max_workers = max(
+            int(max_workers or getattr(settings, "FMP_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)),
+            1,
+        )
+
+    def _call(self, fn: Callable[[Any], Any], item: Any) -> ProviderCallResult:
+        try:
+            return ProviderCallResult(item=item, value=fn(item))
+        except Exception as exc:
+            return ProviderCallResult(item=item, error=exc)
+
+    def _call_in_worker(self, fn: Callable[[Any], Any], item: Any) -> ProviderCallResult:
+        try:
+            return self._call(fn, item)
+        finally:
+            connections.close_all()
+
+    def map(self, fn: Callable[[Any], Any], items: Iterable[Any]) -> list[ProviderCallResult]:
+        items = list(items)
+        if self.max_workers == 1 or len(items) <= 1:
+            return [self._call(fn, item) for item in items]
+
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(items)),
+            thread_name_prefix="provider-fanout",
+        ) as executor:
+            return list(executor.map(lambda item: self._call_in_worker(fn, item), items))
+
+
+def fmp_executor(*, max_workers: int | None = None) -> ProviderExecutor:
+    return ProviderExecutor(max_workers=max_workers)
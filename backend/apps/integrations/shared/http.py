@@ -1,7 +1,12 @@
+import codecs
+import json
+import threading
 import time
-from typing import Any
+from typing import Any, Iterable, Iterator
 
 import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
 
 from apps.integrations.exceptions import (
     InvalidProviderResponse,
@@ -11,10 +16,62 @@ from apps.integrations.exceptions import (
     ProviderUnavailable,
 )
 
-
 DEFAULT_TIMEOUT_SECONDS = 10
 DEFAULT_MAX_RETRIES = 2
 DEFAULT_BACKOFF_SECONDS = 0.5
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 20
+DEFAULT_STREAM_CHUNK_SIZE = 64 * 1024
+DEFAULT_HEADERS = {
+    "Accept": "application/json",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
+
+class HTTPSessionManager:
+    def __init__(self):
+        self._local = threading.local()
+
+    @staticmethod
+    def pool_connections() -> int:
+        return int(getattr(settings, "INTEGRATIONS_HTTP_POOL_CONNECTIONS", DEFAULT_POOL_CONNECTIONS))
+
+    @staticmethod
+    def pool_maxsize() -> int:
+        return int(getattr(settings, "INTEGRATIONS_HTTP_POOL_MAXSIZE", DEFAULT_POOL_MAXSIZE))
+
+    def build_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections(),
+            pool_maxsize=self.pool_maxsize(),
+            max_retries=0,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update(DEFAULT_HEADERS)
+        return session
+
+    def get_session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self.build_session()
+            self._local.session = session
+        return session
+
+    def close(self) -> None:
+        session = getattr(self._local, "session", None)
+        if session is not None:
+            session.close()
+            self._local.session = None
+
+
+SESSION_MANAGER = HTTPSessionManager()
+
+
+def get_session() -> requests.Session:
+    return SESSION_MANAGER.get_session()
 
 
 def get_json(
@@ -23,11 +80,34 @@ def get_json(
     timeout: int = DEFAULT_TIMEOUT_SECONDS,
     max_retries: int = DEFAULT_MAX_RETRIES,
     backoff_seconds: float = DEFAULT_BACKOFF_SECONDS,
+    session: requests.Session | None = None,
 ) -> Any:
+    return _decode_json(
+        get_response(
+            url,
+            timeout=timeout,
+            max_retries=max_retries,
+            backoff_seconds=backoff_seconds,
+            session=session,
+        )
+    )
+
+
+def get_response(
+    url: str,
+    *,
+    headers: dict | None = None,
+    timeout: int = DEFAULT_TIMEOUT_SECONDS,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    backoff_seconds: float = DEFAULT_BACKOFF_SECONDS,
+    session: requests.Session | None = None,
+    stream: bool = False,
+) -> requests.Response:
+    session = session or get_session()
     attempt = 0
     while True:
         try:
-            response = requests.get(url, timeout=timeout)
+            response = session.get(url, headers=headers, timeout=timeout, stream=stream)
         except requests.RequestException as exc:
             if attempt >= max_retries:
                 raise ProviderUnavailable("Network error while contacting provider.") from exc
@@ -35,35 +115,128 @@ def get_json(
             attempt += 1
             continue
 
-        status = response.status_code
-        if status == 401:
-            raise ProviderUnauthorized("Provider authentication failed (401).")
-        if status == 403:
-            raise ProviderAccessDenied("Provider denied access to endpoint (403).")
-        if status == 429:
-            if attempt >= max_retries:
-                raise ProviderRateLimited("Provider rate limit exceeded (429).")
-            retry_after = _parse_retry_after_seconds(response.headers.get("Retry-After"))
-            time.sleep(retry_after if retry_after is not None else _backoff_for_attempt(attempt, backoff_seconds))
+        delay = _retry_delay_or_raise(response, attempt=attempt, max_retries=max_retries, backoff_seconds=backoff_seconds)
+        if delay is not None:
+            time.sleep(delay)
             attempt += 1
             continue
-        if status >= 500:
-            if attempt >= max_retries:
-                raise ProviderUnavailable(f"Provider server error ({status}).")
-            _sleep_backoff(attempt, backoff_seconds)
-            attempt += 1
-            continue
-        if status >= 400:
-            raise InvalidProviderResponse(f"Unexpected client error ({status}).")
+        return response
 
-        try:
-            data = response.json()
-        except ValueError as exc:
-            raise InvalidProviderResponse("Response contained invalid JSON.") from exc
 
-        if data is None:
-            raise InvalidProviderResponse("Provider returned empty response body.")
-        return data
+def iter_json(
+    url: str,
+    *,
+    chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+    timeout: int = DEFAULT_TIMEOUT_SECONDS,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    backoff_seconds: float = DEFAULT_BACKOFF_SECONDS,
+    session: requests.Session | None = None,
+) -> Iterator[Any]:
+    response = get_response(
+        url,
+        timeout=timeout,
+        max_retries=max_retries,
+        backoff_seconds=backoff_seconds,
+        session=session,
+        stream=True,
+    )
+    try:
+        yield from iter_json_array(response.iter_content(chunk_size=chunk_size))
+    except requests.RequestException as exc:
+        raise ProviderUnavailable("Network error while streaming provider response.") from exc
+    finally:
+        response.close()
+
+
+def iter_json_array(chunks: Iterable[bytes | str]) -> Iterator[Any]:
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    position = 0
+    state = "start"
+
+    def feed(final: bool):
+        nonlocal position, state
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n":
+                position += 1
+            if position >= len(buffer):
+                return
+
+            char = buffer[position]
+            if state == "start":
+                if char != "[":
+                    raise InvalidProviderResponse("Expected a JSON array payload.")
+                position += 1
+                state = "first"
+            elif state in {"first", "value"}:
+                if char == "]" and state == "first":
+                    position += 1
+                    state = "done"
+                    continue
+                try:
+                    value, end = decoder.raw_decode(buffer, position)
+                except ValueError as exc:
+                    if final:
+                        raise InvalidProviderResponse("Response contained invalid JSON.") from exc
+                    return
+                if end >= len(buffer) and not final:
+                    return
+                position = end
+                state = "separator"
+                yield value
+            elif state == "separator":
+                if char not in ",]":
+                    raise InvalidProviderResponse("Response contained invalid JSON.")
+                position += 1
+                state = "value" if char == "," else "done"
+            else:
+                raise InvalidProviderResponse("Unexpected data after JSON array.")
+
+    for chunk in chunks:
+        text = text_decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        buffer = buffer[position:] + text
+        position = 0
+        yield from feed(final=False)
+
+    buffer = buffer[position:] + text_decoder.decode(b"", final=True)
+    position = 0
+    yield from feed(final=True)
+    if state == "start":
+        raise InvalidProviderResponse("Provider returned empty response body.")
+    if state != "done":
+        raise InvalidProviderResponse("Response contained invalid JSON.")
+
+
+def _retry_delay_or_raise(response, *, attempt: int, max_retries: int, backoff_seconds: float) -> float | None:
+    status = response.status_code
+    if status == 401:
+        raise ProviderUnauthorized("Provider authentication failed (401).")
+    if status == 403:
+        raise ProviderAccessDenied("Provider denied access to endpoint (403).")
+    if status == 429:
+        if attempt >= max_retries:
+            raise ProviderRateLimited("Provider rate limit exceeded (429).")
+        retry_after = _parse_retry_after_seconds(response.headers.get("Retry-After"))
+        return retry_after if retry_after is not None else _backoff_for_attempt(attempt, backoff_seconds)
+    if status >= 500:
+        if attempt >= max_retries:
+            raise ProviderUnavailable(f"Provider server error ({status}).")
+        return _backoff_for_attempt(attempt, backoff_seconds)
+    if status >= 400:
+        raise InvalidProviderResponse(f"Unexpected client error ({status}).")
+    return None
+
+
+def _decode_json(response) -> Any:
+    try:
+        data = response.json()
+    except ValueError as exc:
+        raise InvalidProviderResponse("Response contained invalid JSON.") from exc
+
+    if data is None:
+        raise InvalidProviderResponse("Provider returned empty response body.")
+    return data
 
 
 def _sleep_backoff(attempt: int, backoff_seconds: float) -> None:
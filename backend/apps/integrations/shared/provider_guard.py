@@ -1,8 +1,12 @@
 import logging
 import time
-from typing import Any, Callable
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
 
-from apps.integrations.exceptions import IntegrationError, ProviderUnavailable
+from django.conf import settings
+
+from apps.integrations.exceptions import IntegrationError, ProviderRateLimited, ProviderUnavailable
+from apps.integrations.shared.provider_state import LocalProviderStateBackend, refill_state
 
 logger = logging.getLogger(__name__)
 
@@ -10,48 +14,137 @@ logger = logging.getLogger(__name__)
 class ProviderGuard:
     MAX_FAILURES = 5
     COOLDOWN_SECONDS = 300
+    MAX_WAIT_SECONDS = 30
+    RATE_LIMIT_PENALTY_SECONDS = 60
 
-    def __init__(self, *, name: str, provider):
+    def __init__(
+        self,
+        *,
+        name: str,
+        provider=None,
+        rate_per_minute: float | None = None,
+        burst: float | None = None,
+        backend=None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
         self.name = name
         self.provider = provider
-        self.consecutive_failures = 0
-        self.last_success_ts: float | None = None
-        self.last_failure_ts: float | None = None
+        self.rate_per_second = max(float(rate_per_minute), 1.0) / 60.0 if rate_per_minute else None
+        self.capacity = (
+            float(burst)
+            if burst is not None
+            else max(self.rate_per_second or 1.0, 1.0)
+        )
+        self.backend = backend or LocalProviderStateBackend()
+        self._sleep = sleep
 
     def __getattr__(self, attr):
         target = getattr(self.provider, attr)
         if not callable(target):
             return target
 
+        if attr.startswith("iter_"):
+            def guarded_stream(*args, **kwargs):
+                return self.stream(target, *args, **kwargs)
+
+            return guarded_stream
+
         def guarded(*args, **kwargs):
             return self.request(target, *args, **kwargs)
 
         return guarded
 
+    @property
+    def consecutive_failures(self) -> int:
+        return self.backend.state(self.name).consecutive_failures
+
+    @property
+    def last_success_ts(self) -> float | None:
+        return self.backend.state(self.name).last_success_ts
+
+    @property
+    def last_failure_ts(self) -> float | None:
+        return self.backend.state(self.name).last_failure_ts
+
+    def _is_open(self, state) -> bool:
+        if state.consecutive_failures < self.MAX_FAILURES or not state.last_failure_ts:
+            return False
+        return (time.time() - state.last_failure_ts) <= self.COOLDOWN_SECONDS
+
     def can_call(self) -> bool:
-        if self.consecutive_failures < self.MAX_FAILURES:
-            return True
-        if not self.last_failure_ts:
-            return True
-        return (time.time() - self.last_failure_ts) > self.COOLDOWN_SECONDS
+        return not self._is_open(self.backend.state(self.name))
+
+    def status(self) -> dict:
+        state = self.backend.state(self.name)
+        budget = None
+        if self.rate_per_second:
+            budget = refill_state(
+                state,
+                now=time.time(),
+                rate_per_second=self.rate_per_second,
+                capacity=self.capacity,
+            ).tokens
+        return {
+            "provider": self.name,
+            "circuit": "open" if self._is_open(state) else "closed",
+            "consecutive_failures": state.consecutive_failures,
+            "budget": budget,
+            "capacity": self.capacity if self.rate_per_second else None,
+            "queue_depth": state.waiting,
+            "last_success_ts": state.last_success_ts,
+            "last_failure_ts": state.last_failure_ts,
+        }
+
+    def acquire_budget(self) -> None:
+        if not self.rate_per_second:
+            return
+
+        max_wait = getattr(settings, "PROVIDER_GUARD_MAX_WAIT_SECONDS", self.MAX_WAIT_SECONDS)
+        waited = 0.0
+        queued = False
+        try:
+            while True:
+                wait_seconds = self.backend.acquire(
+                    self.name,
+                    rate_per_second=self.rate_per_second,
+                    capacity=self.capacity,
+                )
+                if wait_seconds <= 0:
+                    return
+                if waited + wait_seconds > max_wait:
+                    raise ProviderRateLimited(f"{self.name} request budget exhausted.")
+                if not queued:
+                    self.backend.adjust_waiting(self.name, 1)
+                    queued = True
+                self._sleep(wait_seconds)
+                waited += wait_seconds
+        finally:
+            if queued:
+                self.backend.adjust_waiting(self.name, -1)
 
     def record_success(self) -> None:
-        self.consecutive_failures = 0
-        self.last_success_ts = time.time()
+        self.backend.record_success(self.name)
 
     def record_failure(self, exc: Exception | None = None) -> None:
-        self.consecutive_failures += 1
-        self.last_failure_ts = time.time()
-        logger.warning("[PROVIDER:%s] failure #%s", self.name, self.consecutive_failures)
+        failures = self.backend.record_failure(self.name)
+        logger.warning("[PROVIDER:%s] failure #%s", self.name, failures)
         if exc:
             logger.debug("[PROVIDER:%s] exception=%r", self.name, exc)
 
-    def request(self, fn: Callable[..., Any], *args, **kwargs):
+    @contextmanager
+    def _guarded(self):
         if not self.can_call():
             raise ProviderUnavailable(f"{self.name} is temporarily unavailable (circuit open).")
 
+        self.acquire_budget()
         try:
-            result = fn(*args, **kwargs)
+            yield
+        except ProviderRateLimited:
+            self.backend.penalize(
+                self.name,
+                seconds=getattr(settings, "PROVIDER_GUARD_RATE_LIMIT_PENALTY_SECONDS", self.RATE_LIMIT_PENALTY_SECONDS),
+            )
+            raise
         except ProviderUnavailable as exc:
             self.record_failure(exc)
             raise
@@ -62,4 +155,11 @@ class ProviderGuard:
             raise ProviderUnavailable(f"{self.name} request failed.") from exc
 
         self.record_success()
-        return result
+
+    def request(self, fn: Callable[..., Any], *args, **kwargs):
+        with self._guarded():
+            return fn(*args, **kwargs)
+
+    def stream(self, fn: Callable[..., Iterator], *args, **kwargs) -> Iterator:
+        with self._guarded():
+            yield from fn(*args, **kwargs)
@@ -0,0 +1,173 @@
+import threading
+import time
+from dataclasses import dataclass, replace
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import F
+
+
+def state_db_alias() -> str:
+    """Database alias used for shared guard / lease state.
+
+    Points at its own connection so state writes commit immediately instead of
+    joining (and being rolled back or held locked by) the caller's transaction.
+    """
+    alias = getattr(settings, "INTEGRATIONS_STATE_DB_ALIAS", DEFAULT_DB_ALIAS)
+    return alias if alias in connections else DEFAULT_DB_ALIAS
+
+
+@dataclass(frozen=True)
+class ProviderState:
+    tokens: float = 0.0
+    refilled_at: float = 0.0
+    waiting: int = 0
+    consecutive_failures: int = 0
+    last_success_ts: float | None = None
+    last_failure_ts: float | None = None
+
+
+def refill_state(state: ProviderState, *, now: float, rate_per_second: float, capacity: float) -> ProviderState:
+    elapsed = max(now - state.refilled_at, 0.0)
+    return replace(
+        state,
+        tokens=min(capacity, state.tokens + elapsed * rate_per_second),
+        refilled_at=max(now, state.refilled_at),
+    )
+
+
+def _take(state: ProviderState, *, now: float, rate_per_second: float) -> tuple[ProviderState, float]:
+    if state.refilled_at <= now and state.tokens >= 1:
+        return replace(state, tokens=state.tokens - 1), 0.0
+    return state, max(state.refilled_at - now, 0.0) + max(1 - state.tokens, 0.0) / rate_per_second
+
+
+class LocalProviderStateBackend:
+    def __init__(self, *, clock=time.time):
+        self._states: dict[str, ProviderState] = {}
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def state(self, name: str) -> ProviderState:
+        with self._lock:
+            return self._states.get(name, ProviderState())
+
+    def acquire(self, name: str, *, rate_per_second: float, capacity: float) -> float:
+        now = self._clock()
+        with self._lock:
+            state = self._states.get(name) or ProviderState(tokens=capacity, refilled_at=now)
+            state = refill_state(state, now=now, rate_per_second=rate_per_second, capacity=capacity)
+            state, wait_seconds = _take(state, now=now, rate_per_second=rate_per_second)
+            self._states[name] = state
+            return wait_seconds
+
+    def adjust_waiting(self, name: str, delta: int) -> None:
+        with self._lock:
+            state = self._states.get(name, ProviderState())
+            self._states[name] = replace(state, waiting=max(state.waiting + delta, 0))
+
+    def penalize(self, name: str, *, seconds: float) -> None:
+        with self._lock:
+            state = self._states.get(name, ProviderState())
+            self._states[name] = replace(state, tokens=0.0, refilled_at=self._clock() + seconds)
+
+    def record_success(self, name: str) -> None:
+        with self._lock:
+            state = self._states.get(name, ProviderState())
+            self._states[name] = replace(state, consecutive_failures=0, last_success_ts=self._clock())
+
+    def record_failure(self, name: str) -> int:
+        with self._lock:
+            state = self._states.get(name, ProviderState())
+            state = replace(
+                state,
+                consecutive_failures=state.consecutive_failures + 1,
+                last_failure_ts=self._clock(),
+            )
+            self._states[name] = state
+            return state.consecutive_failures
+
+    def reset(self, name: str) -> None:
+        with self._lock:
+            self._states.pop(name, None)
+
+
+class DatabaseProviderStateBackend:
+    def __init__(self, *, clock=time.time, using: str | None = None):
+        self._clock = clock
+        self._using = using or state_db_alias()
+
+    def _objects(self):
+        from apps.integrations.models import ProviderGuardState
+
+        return ProviderGuardState.objects.using(self._using)
+
+    @staticmethod
+    def _to_state(row) -> ProviderState:
+        return ProviderState(
+            tokens=row.tokens,
+            refilled_at=row.refilled_at,
+            waiting=row.waiting,
+            consecutive_failures=row.consecutive_failures,
+            last_success_ts=row.last_success_ts,
+            last_failure_ts=row.last_failure_ts,
+        )
+
+    def _ensure(self, name: str, **defaults) -> None:
+        self._objects().get_or_create(provider=name, defaults=defaults)
+
+    def state(self, name: str) -> ProviderState:
+        row = self._objects().filter(provider=name).first()
+        return self._to_state(row) if row is not None else ProviderState()
+
+    def acquire(self, name: str, *, rate_per_second: float, capacity: float) -> float:
+        now = self._clock()
+        # Commits (and releases the row lock) before the provider is called.
+        with transaction.atomic(using=self._using):
+            row, _ = self._objects().select_for_update().get_or_create(
+                provider=name,
+                defaults={"tokens": capacity, "refilled_at": now},
+            )
+            state = refill_state(self._to_state(row), now=now, rate_per_second=rate_per_second, capacity=capacity)
+            state, wait_seconds = _take(state, now=now, rate_per_second=rate_per_second)
+            self._objects().filter(pk=row.pk).update(tokens=state.tokens, refilled_at=state.refilled_at)
+        return wait_seconds
+
+    def adjust_waiting(self, name: str, delta: int) -> None:
+        self._ensure(name)
+        self._objects().filter(provider=name).update(waiting=F("waiting") + delta)
+
+    def penalize(self, name: str, *, seconds: float) -> None:
+        self._ensure(name)
+        self._objects().filter(provider=name).update(tokens=0, refilled_at=self._clock() + seconds)
+
+    def record_success(self, name: str) -> None:
+        updated = self._objects().filter(provider=name).update(
+            consecutive_failures=0,
+            last_success_ts=self._clock(),
+        )
+        if not updated:
+            self._ensure(name, last_success_ts=self._clock())
+
+    def record_failure(self, name: str) -> int:
+        self._ensure(name)
+        with transaction.atomic(using=self._using):
+            self._objects().filter(provider=name).update(
+                consecutive_failures=F("consecutive_failures") + 1,
+                last_failure_ts=self._clock(),
+            )
+            return self._objects().filter(provider=name).values_list("consecutive_failures", flat=True).get()
+
+    def reset(self, name: str) -> None:
+        self._objects().filter(provider=name).delete()
+
+
+PROVIDER_STATE_BACKENDS = {
+    "local": LocalProviderStateBackend,
+    "database": DatabaseProviderStateBackend,
+}
+
+
+def get_provider_state_backend():
+    backend = getattr(settings, "PROVIDER_GUARD_BACKEND", "database")
+    return PROVIDER_STATE_BACKENDS[backend]()
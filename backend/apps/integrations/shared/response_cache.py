@@ -0,0 +1,186 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+
+from apps.integrations.exceptions import InvalidProviderResponse
+from apps.integrations.shared.http import DEFAULT_STREAM_CHUNK_SIZE, get_response, iter_json_array
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    content: bytes
+    fetched_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def is_fresh(self, ttl_seconds: float, *, now: float) -> bool:
+        return now - self.fetched_at < ttl_seconds
+
+    @property
+    def validators(self) -> dict:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def cache_key(path: str, params: dict) -> str:
+    cleaned = sorted((key, str(value)) for key, value in params.items() if value is not None)
+    raw = json.dumps([path, cleaned], separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _loads(content: bytes) -> Any:
+    try:
+        data = json.loads(content)
+    except ValueError as exc:
+        raise InvalidProviderResponse("Response contained invalid JSON.") from exc
+    if data is None:
+        raise InvalidProviderResponse("Provider returned empty response body.")
+    return data
+
+
+class ResponseCache:
+    def __init__(self, directory: str | os.PathLike, *, clock: Callable[[], float] = time.time):
+        self.directory = Path(directory)
+        self._clock = clock
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json.gz"
+
+    def load(self, key: str, *, with_content: bool = True) -> CachedResponse | None:
+        try:
+            with gzip.open(self._path(key), "rb") as handle:
+                meta = json.loads(handle.readline())
+                content = handle.read() if with_content else b""
+        except (OSError, EOFError, ValueError):
+            return None
+        return CachedResponse(
+            content=content,
+            fetched_at=float(meta.get("fetched_at") or 0),
+            etag=meta.get("etag"),
+            last_modified=meta.get("last_modified"),
+        )
+
+    def has_fresh(self, key: str, *, ttl_seconds: float) -> bool:
+        cached = self.load(key, with_content=False)
+        return cached is not None and cached.is_fresh(ttl_seconds, now=self._clock())
+
+    def _meta(self, entry: CachedResponse) -> dict:
+        return {
+            "fetched_at": entry.fetched_at,
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+        }
+
+    def _iter_content(self, key: str, *, chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+        with gzip.open(self._path(key), "rb") as handle:
+            handle.readline()
+            while chunk := handle.read(chunk_size):
+                yield chunk
+
+    @contextmanager
+    def _writer(self, key: str, meta: dict) -> Iterator[Callable[[bytes], Any]]:
+        """Yield a write callable; the entry replaces the cached one only on clean exit."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        descriptor, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        committed = False
+        try:
+            with os.fdopen(descriptor, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) as handle:
+                handle.write(json.dumps(meta).encode("utf-8") + b"\n")
+                yield handle.write
+            os.replace(temp_path, self._path(key))
+            committed = True
+        finally:
+            if not committed and os.path.exists(temp_path):
+                os.unlink(temp_path)
+
+    @staticmethod
+    def _tee(chunks: Iterable[bytes], write: Callable[[bytes], Any]) -> Iterator[bytes]:
+        for chunk in chunks:
+            write(chunk)
+            yield chunk
+
+    def store(self, key: str, entry: CachedResponse) -> None:
+        with self._writer(key, self._meta(entry)) as write:
+            write(entry.content)
+
+    @staticmethod
+    def _revalidated(*, cached: CachedResponse | None, response, now: float) -> tuple[CachedResponse, bool]:
+        not_modified = response.status_code == 304 and cached is not None
+        previous = cached if not_modified else CachedResponse(content=b"", fetched_at=now)
+        entry = CachedResponse(
+            content=previous.content,
+            fetched_at=now,
+            etag=response.headers.get("ETag") or previous.etag,
+            last_modified=response.headers.get("Last-Modified") or previous.last_modified,
+        )
+        return entry, not_modified
+
+    def get_json(
+        self,
+        url: str,
+        *,
+        key: str,
+        ttl_seconds: float,
+        fetch: Callable[..., Any] | None = None,
+        **request_options,
+    ) -> Any:
+        now = self._clock()
+        cached = self.load(key)
+        if cached is not None and cached.is_fresh(ttl_seconds, now=now):
+            return _loads(cached.content)
+
+        fetch = fetch or get_response
+        response = fetch(url, headers=cached.validators if cached else None, **request_options)
+        entry, not_modified = self._revalidated(cached=cached, response=response, now=now)
+        if not not_modified:
+            entry = replace(entry, content=response.content)
+
+        data = _loads(entry.content)
+        try:
+            self.store(key, entry)
+        except OSError:
+            pass
+        return data
+
+    def iter_json(
+        self,
+        url: str,
+        *,
+        key: str,
+        ttl_seconds: float,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        fetch: Callable[..., Any] | None = None,
+        **request_options,
+    ) -> Iterator[Any]:
+        now = self._clock()
+        cached = self.load(key, with_content=False)
+        if cached is not None and cached.is_fresh(ttl_seconds, now=now):
+            yield from iter_json_array(self._iter_content(key, chunk_size=chunk_size))
+            return
+
+        fetch = fetch or get_response
+        response = fetch(url, headers=cached.validators if cached else None, stream=True, **request_options)
+        try:
+            entry, not_modified = self._revalidated(cached=cached, response=response, now=now)
+            chunks = (
+                self._iter_content(key, chunk_size=chunk_size)
+                if not_modified
+                else response.iter_content(chunk_size=chunk_size)
+            )
+            # Commit only once the parser has seen a complete array, so a
+            # truncated or malformed body is never served from cache.
+            with self._writer(key, self._meta(entry)) as write:
+                yield from iter_json_array(self._tee(chunks, write))
+        finally:
+            response.close()
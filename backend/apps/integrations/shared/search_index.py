@@ -0,0 +1,130 @@
+import re
+from bisect import bisect_left
+from collections import Counter
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+EXACT = 0
+PREFIX = 1
+WORD_PREFIX = 2
+FUZZY = 3
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+class PrefixTrigramIndex:
+    def __init__(
+        self,
+        *,
+        rows: list[dict],
+        key_fields: tuple[str, ...] = ("symbol",),
+        text_fields: tuple[str, ...] = ("name",),
+        min_similarity: float = 0.5,
+    ):
+        self.rows = sorted(rows, key=lambda row: row["symbol"])
+        self.key_fields = key_fields
+        self.text_fields = text_fields
+        self.min_similarity = min_similarity
+
+        keys: list[tuple[str, int]] = []
+        words: list[tuple[str, int]] = []
+        postings: dict[str, list[int]] = {}
+        for position, row in enumerate(self.rows):
+            for field in key_fields:
+                value = (row.get(field) or "").upper()
+                if value:
+                    keys.append((value, position))
+
+            text = " ".join(
+                (row.get(field) or "") for field in (*key_fields, *text_fields)
+            ).lower()
+            for word in set(WORD_PATTERN.findall(text)):
+                words.append((word, position))
+            for trigram in _trigrams(text):
+                postings.setdefault(trigram, []).append(position)
+
+        keys.sort()
+        words.sort()
+        self._keys = [key for key, _ in keys]
+        self._key_positions = [position for _, position in keys]
+        self._words = [word for word, _ in words]
+        self._word_positions = [position for _, position in words]
+        self._postings = postings
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @staticmethod
+    def _prefix_scan(values: list[str], positions: list[int], prefix: str):
+        start = bisect_left(values, prefix)
+        for index in range(start, len(values)):
+            if not values[index].startswith(prefix):
+                break
+            yield values[index], positions[index]
+
+    def _fuzzy(self, query: str) -> dict[int, float]:
+        query_trigrams = _trigrams(query)
+        counts: Counter[int] = Counter()
+        for trigram in query_trigrams:
+            counts.update(self._postings.get(trigram, ()))
+
+        threshold = max(self.min_similarity * len(query_trigrams), 1)
+        return {
+            position: count / len(query_trigrams)
+            for position, count in counts.items()
+            if count >= threshold
+        }
+
+    def search(self, query: str, *, limit: int = 25) -> list[dict]:
+        normalized = (query or "").strip()
+        if not normalized:
+            return self.rows[:limit]
+
+        upper = normalized.upper()
+        lower = normalized.lower()
+        ranks: dict[int, tuple[int, float]] = {}
+
+        def offer(position: int, rank: int, score: float = 1.0) -> None:
+            current = ranks.get(position)
+            if current is None or (rank, -score) < (current[0], -current[1]):
+                ranks[position] = (rank, score)
+
+        for key, position in self._prefix_scan(self._keys, self._key_positions, upper):
+            offer(position, EXACT if key == upper else PREFIX)
+            if len(ranks) > limit and len(self.key_fields) == 1:
+                break
+
+        query_words = WORD_PATTERN.findall(lower)
+        if query_words and len(ranks) < limit:
+            matches: set[int] | None = None
+            for word in query_words:
+                found = {position for _, position in self._prefix_scan(self._words, self._word_positions, word)}
+                matches = found if matches is None else matches & found
+            for position in matches or ():
+                offer(position, WORD_PREFIX)
+
+        if len(lower) >= 3 and len(ranks) < limit:
+            for position, score in self._fuzzy(lower).items():
+                offer(position, FUZZY, score)
+
+        ordered = sorted(ranks, key=lambda position: (ranks[position][0], -ranks[position][1], position))
+        return [self.rows[position] for position in ordered[:limit]]
+
+    def to_payload(self) -> dict:
+        return {
+            "rows": self.rows,
+            "key_fields": list(self.key_fields),
+            "text_fields": list(self.text_fields),
+        }
+
+    @classmethod
+    def from_payload(cls, payload: dict, **kwargs) -> "PrefixTrigramIndex":
+        return cls(
+            rows=payload["rows"],
+            key_fields=tuple(payload["key_fields"]),
+            text_fields=tuple(payload["text_fields"]),
+            **kwargs,
+        )
@@ -0,0 +1,169 @@
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Any, Callable
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+
+from apps.integrations.shared.provider_state import state_db_alias
+
+
+class LocalLeaseBackend:
+    def acquire(self, key: str, *, owner: str, ttl_seconds: float) -> bool:
+        return True
+
+    def release(self, key: str, *, owner: str) -> None:
+        return None
+
+
+class DatabaseLeaseBackend:
+    def __init__(self, *, clock=time.time, using: str | None = None):
+        self._clock = clock
+        self._using = using or state_db_alias()
+
+    def _objects(self):
+        from apps.integrations.models import ProviderLease
+
+        return ProviderLease.objects.using(self._using)
+
+    def acquire(self, key: str, *, owner: str, ttl_seconds: float) -> bool:
+        # Runs on the state connection so the lease is visible to other
+        # processes at once, even when the caller is inside a transaction.
+        now = self._clock()
+        if self._objects().filter(key=key, expires_at__lte=now).update(owner=owner, expires_at=now + ttl_seconds):
+            return True
+        try:
+            with transaction.atomic(using=self._using):
+                self._objects().create(key=key, owner=owner, expires_at=now + ttl_seconds)
+        except IntegrityError:
+            return False
+        return True
+
+    def release(self, key: str, *, owner: str) -> None:
+        self._objects().filter(key=key, owner=owner).delete()
+
+
+LEASE_BACKENDS = {
+    "local": LocalLeaseBackend,
+    "database": DatabaseLeaseBackend,
+}
+
+
+def get_lease_backend():
+    backend = getattr(settings, "SINGLE_FLIGHT_BACKEND", "database")
+    return LEASE_BACKENDS[backend]()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Collapse concurrent calls for the same key into one execution.
+
+    Threads share the leader's result directly; other processes wait on a lease
+    and then try ``reuse`` before running the call themselves.
+    """
+
+    LEASE_SECONDS = 30.0
+    WAIT_SECONDS = 10.0
+    POLL_SECONDS = 0.1
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        backend=None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.name = name
+        self.backend = backend or LocalLeaseBackend()
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call] = {}
+        self._counts: Counter = Counter()
+
+    def _setting(self, suffix: str, default: float) -> float:
+        return float(getattr(settings, f"SINGLE_FLIGHT_{suffix}", default))
+
+    def _count(self, metric: str) -> None:
+        with self._lock:
+            self._counts[metric] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = dict(self._counts)
+            in_flight = len(self._calls)
+        return {
+            "name": self.name,
+            "calls": counts.get("calls", 0),
+            "executed": counts.get("executed", 0),
+            "coalesced": counts.get("coalesced", 0),
+            "coalesced_remote": counts.get("coalesced_remote", 0),
+            "lease_timeouts": counts.get("lease_timeouts", 0),
+            "in_flight": in_flight,
+        }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+    def _run_with_lease(self, key: str, fn: Callable[[], Any], reuse: Callable[[], Any] | None):
+        owner = uuid.uuid4().hex
+        lease_seconds = self._setting("LEASE_SECONDS", self.LEASE_SECONDS)
+        deadline = self._clock() + self._setting("WAIT_SECONDS", self.WAIT_SECONDS)
+        poll_seconds = self._setting("POLL_SECONDS", self.POLL_SECONDS)
+
+        leased = self.backend.acquire(key, owner=owner, ttl_seconds=lease_seconds)
+        while not leased:
+            self._sleep(poll_seconds)
+            if reuse is not None:
+                value = reuse()
+                if value is not None:
+                    self._count("coalesced_remote")
+                    return value
+            if self._clock() >= deadline:
+                self._count("lease_timeouts")
+                break
+            leased = self.backend.acquire(key, owner=owner, ttl_seconds=lease_seconds)
+
+        self._count("executed")
+        try:
+            return fn()
+        finally:
+            if leased:
+                self.backend.release(key, owner=owner)
+
+    def do(self, key: str, fn: Callable[[], Any], *, reuse: Callable[[], Any] | None = None):
+        with self._lock:
+            self._counts["calls"] += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self._counts["coalesced"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = self._run_with_lease(key, fn, reuse)
+            return call.value
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
@@ -0,0 +1 @@
+from .listing_signals import *  # noqa: F401,F403
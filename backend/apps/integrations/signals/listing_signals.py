@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.integrations.models import ActiveCommodityListing, ActiveCryptoListing, ActiveEquityListing
+from apps.integrations.services.active_listing_search_service import ActiveListingSearchService
+
+
+@receiver(post_save, sender=ActiveEquityListing)
+@receiver(post_save, sender=ActiveCryptoListing)
+@receiver(post_save, sender=ActiveCommodityListing)
+@receiver(post_delete, sender=ActiveEquityListing)
+@receiver(post_delete, sender=ActiveCryptoListing)
+@receiver(post_delete, sender=ActiveCommodityListing)
+def invalidate_listing_search_index(sender, instance, **kwargs):
+    ActiveListingSearchService.invalidate(model=sender, provider=instance.provider)
@@ -6,7 +6,12 @@ from django.urls import reverse
 from rest_framework.test import APIClient
 
 from apps.assets.models import Asset, AssetMarketData, AssetType
-from apps.integrations.models import ActiveCommodityListing, ActiveCryptoListing, ActiveEquityListing
+from apps.integrations.models import (
+    ActiveCommodityListing,
+    ActiveCryptoListing,
+    ActiveEquityListing,
+    ActiveListingGeneration,
+)
 from apps.integrations.services import (
     ActiveCommodityAssetService,
     ActiveCommoditySyncService,
@@ -20,7 +25,7 @@ from apps.integrations.services import (
 
 
 class ActiveEquitySyncServiceTests(TestCase):
-    @patch("apps.integrations.services.active_equity_sync_service.FMP_PROVIDER.get_actively_traded_rows")
+    @patch("apps.integrations.services.active_equity_sync_service.FMP_PROVIDER.iter_actively_traded_rows")
     def test_refresh_rebuilds_current_active_list(self, mock_get_rows):
         mock_get_rows.return_value = [
             {"symbol": "AAPL", "name": "Apple Inc."},
@@ -40,7 +45,38 @@ class ActiveEquitySyncServiceTests(TestCase):
         self.assertTrue(ActiveEquityListing.objects.filter(symbol="NVDA").exists())
         self.assertEqual(mock_get_rows.call_count, 2)
 
-    @patch("apps.integrations.services.active_crypto_sync_service.FMP_PROVIDER.get_cryptocurrency_rows")
+    @patch("apps.integrations.services.active_equity_sync_service.FMP_PROVIDER.iter_actively_traded_rows")
+    def test_refresh_only_rewrites_changed_rows_and_flips_generation(self, mock_get_rows):
+        mock_get_rows.return_value = [
+            {"symbol": "AAPL", "name": "Apple Inc."},
+            {"symbol": "MSFT", "name": "Microsoft Corp."},
+        ]
+        ActiveEquitySyncService.refresh_from_fmp()
+        aapl_refreshed_at = ActiveEquityListing.objects.get(symbol="AAPL").last_refreshed_at
+
+        mock_get_rows.return_value = [
+            {"symbol": "AAPL", "name": "Apple Inc."},
+            {"symbol": "MSFT", "name": "Microsoft Corporation"},
+            {"symbol": "NVDA", "name": "NVIDIA Corporation"},
+        ]
+        result = ActiveEquitySyncService.refresh_from_fmp()
+
+        self.assertEqual(
+            (result["generation"], result["created"], result["updated"], result["unchanged"]),
+            (2, 1, 1, 1),
+        )
+        self.assertEqual(ActiveEquityListing.objects.get(symbol="AAPL").last_refreshed_at, aapl_refreshed_at)
+        self.assertEqual(ActiveEquityListing.objects.get(symbol="MSFT").name, "Microsoft Corporation")
+        self.assertEqual(ActiveListingGeneration.objects.get(listing="equity").active_generation, 2)
+
+        ActiveEquityListing.objects.create(symbol="TSLA", name="Tesla, Inc.", generation=3)
+        ActiveEquityListing.objects.filter(symbol="NVDA").update(retired_generation=2)
+        self.assertEqual(
+            list(ActiveEquitySyncService.get_queryset().values_list("symbol", flat=True)),
+            ["AAPL", "MSFT"],
+        )
+
+    @patch("apps.integrations.services.active_crypto_sync_service.FMP_PROVIDER.iter_cryptocurrency_rows")
     def test_crypto_refresh_rebuilds_current_crypto_list(self, mock_get_rows):
         mock_get_rows.return_value = [
             {"symbol": "BTCUSD", "name": "Bitcoin", "base_symbol": "BTC", "quote_currency": "USD"},
@@ -53,7 +89,7 @@ class ActiveEquitySyncServiceTests(TestCase):
         self.assertEqual(ActiveCryptoListing.objects.count(), 2)
         self.assertEqual(mock_get_rows.call_count, 1)
 
-    @patch("apps.integrations.services.active_commodity_sync_service.FMP_PROVIDER.get_commodity_rows")
+    @patch("apps.integrations.services.active_commodity_sync_service.FMP_PROVIDER.iter_commodity_rows")
     def test_commodity_refresh_rebuilds_current_commodity_list(self, mock_get_rows):
         mock_get_rows.return_value = [
             {"symbol": "GCUSD", "name": "Gold", "exchange": "COMEX", "trade_month": "", "currency": "USD"},
@@ -115,6 +151,44 @@ class HeldEquityReviewServiceTests(TestCase):
         self.assertEqual(result, "needs_review")
         self.assertEqual(asset.market_data.status, AssetMarketData.Status.NEEDS_REVIEW)
 
+    @patch("apps.integrations.services.held_equity_review_service.FMP_PROVIDER.search_by_isin")
+    def test_review_all_classifies_in_bulk_and_only_looks_up_unresolved(self, mock_search_by_isin):
+        ActiveEquityListing.objects.create(symbol="AAPL", name="Apple Inc.")
+        ActiveEquityListing.objects.create(symbol="META", name="Meta Platforms, Inc.")
+        specs = [
+            ("Apple Inc.", "AAPL", ""),
+            ("Twitter", "TWTR", ""),
+            ("Facebook, Inc.", "FB", "US30303M1027"),
+            ("Gone Corp", "GONE", "US0000000000"),
+        ]
+        for name, symbol, isin in specs:
+            asset = Asset.objects.create(asset_type=self.equity_type, name=name, symbol=symbol)
+            AssetMarketData.objects.create(
+                asset=asset,
+                provider=AssetMarketData.Provider.FMP,
+                provider_symbol=symbol,
+                last_seen_name=name,
+                isin=isin,
+                status=AssetMarketData.Status.TRACKED,
+            )
+        mock_search_by_isin.side_effect = lambda isin: (
+            [{"symbol": "META", "name": "Meta Platforms, Inc.", "isin": isin}]
+            if isin == "US30303M1027"
+            else []
+        )
+
+        with self.assertNumQueries(6):
+            summary = HeldEquityReviewService.review_all_tracked_equities()
+
+        self.assertEqual(summary, {"tracked": 2, "needs_review": 1, "stale": 1, "skipped": 0})
+        self.assertEqual(mock_search_by_isin.call_count, 2)
+        self.assertEqual(Asset.objects.get(symbol="META").market_data.provider_symbol, "META")
+        self.assertFalse(Asset.objects.get(symbol="GONE").is_active)
+        self.assertEqual(
+            AssetMarketData.objects.get(asset__symbol="TWTR").status,
+            AssetMarketData.Status.NEEDS_REVIEW,
+        )
+
     @patch("apps.integrations.services.held_equity_review_service.FMP_PROVIDER.search_by_cik")
     @patch("apps.integrations.services.held_equity_review_service.FMP_PROVIDER.search_by_cusip")
     @patch("apps.integrations.services.held_equity_review_service.FMP_PROVIDER.search_by_isin")
@@ -467,6 +541,41 @@ class HeldMarketAssetReviewServiceTests(TestCase):
         mock_search_by_isin.assert_not_called()
 
 
+    def test_review_precious_metal_only_matches_the_current_commodity_generation(self):
+        ActiveListingGeneration.objects.create(listing="commodity", provider="fmp", active_generation=2)
+        listing = ActiveCommodityListing.objects.create(
+            symbol="GCUSD",
+            name="Gold",
+            exchange="COMEX",
+            trade_month="",
+            currency="USD",
+            generation=1,
+            retired_generation=2,
+        )
+        asset = Asset.objects.create(
+            asset_type=self.precious_metal_type,
+            name="Gold",
+            symbol="GCUSD",
+            data={"precious_metal_profile": {"metal": "gold"}},
+        )
+        AssetMarketData.objects.create(
+            asset=asset,
+            provider=AssetMarketData.Provider.FMP,
+            provider_symbol="GCUSD",
+            status=AssetMarketData.Status.TRACKED,
+        )
+
+        self.assertEqual(HeldMarketAssetReviewService.review_asset(asset=asset), "stale")
+
+        listing.generation = 2
+        listing.retired_generation = None
+        listing.save()
+        asset.refresh_from_db()
+
+        self.assertEqual(HeldMarketAssetReviewService.review_asset(asset=asset), "tracked")
+        asset.refresh_from_db()
+        self.assertTrue(asset.is_active)
+
 class ActiveEquityApiTests(TestCase):
     def setUp(self):
         self.client = APIClient()
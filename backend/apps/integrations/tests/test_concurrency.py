@@ -0,0 +1,20 @@
+from django.test import SimpleTestCase
+
+from apps.integrations.exceptions import EmptyProviderResult
+from apps.integrations.shared.concurrency import ProviderExecutor
+
+
+class ProviderExecutorTests(SimpleTestCase):
+    def test_map_preserves_order_and_captures_errors(self):
+        def fetch(symbol):
+            if symbol == "BAD":
+                raise EmptyProviderResult("missing")
+            return symbol.lower()
+
+        results = ProviderExecutor(max_workers=4).map(fetch, ["AAPL", "BAD", "MSFT"])
+
+        self.assertEqual([result.item for result in results], ["AAPL", "BAD", "MSFT"])
+        self.assertEqual(results[0].value, "aapl")
+        self.assertFalse(results[1].ok)
+        self.assertIsInstance(results[1].error, EmptyProviderResult)
+        self.assertEqual(results[2].value, "msft")
@@ -1,6 +1,10 @@
+from decimal import Decimal
+from unittest.mock import patch
+
 from django.test import SimpleTestCase, override_settings
 
 from apps.integrations.providers.fmp.parsers import parse_company_profile_payload, parse_quote_payload
+from apps.integrations.providers.fmp.provider import FMPProvider
 from apps.integrations.providers.fmp.request import build_fmp_url
 
 
@@ -52,3 +56,31 @@ class FMPParserTests(SimpleTestCase):
         self.assertEqual(profile.name, "Apple Inc.")
         self.assertEqual(profile.exchange, "NASDAQ")
         self.assertEqual(profile.sector, "Technology")
+
+
+@override_settings(FMP_API_KEY="test-key")
+class FMPProviderBatchQuoteTests(SimpleTestCase):
+    @patch("apps.integrations.providers.fmp.provider.FMP_QUOTE_BATCH_SIZE", 2)
+    @patch("apps.integrations.providers.fmp.provider.fmp_get_json")
+    def test_get_quotes_chunks_symbols_into_batch_requests(self, mock_get_json):
+        mock_get_json.side_effect = lambda path, symbols: [
+            {"symbol": symbol, "price": "10", "volume": 5}
+            for symbol in symbols.split(",")
+        ]
+
+        quotes = FMPProvider().get_quotes(["aapl", "MSFT", "aapl", "NVDA", ""])
+
+        self.assertEqual(set(quotes), {"AAPL", "MSFT", "NVDA"})
+        self.assertEqual(mock_get_json.call_count, 2)
+        mock_get_json.assert_any_call("/batch-quote-short", symbols="AAPL,MSFT")
+        mock_get_json.assert_any_call("/batch-quote-short", symbols="NVDA")
+        self.assertEqual(quotes["NVDA"].price, Decimal("10"))
+
+    @patch("apps.integrations.providers.fmp.provider.FMP_QUOTE_BATCH_SIZE", 2)
+    @patch("apps.integrations.providers.fmp.provider.fmp_get_json")
+    def test_get_quotes_honours_an_explicit_batch_size(self, mock_get_json):
+        mock_get_json.return_value = []
+
+        FMPProvider().get_quotes(["AAPL", "MSFT", "NVDA"], batch_size=3)
+
+        mock_get_json.assert_called_once_with("/batch-quote-short", symbols="AAPL,MSFT,NVDA")
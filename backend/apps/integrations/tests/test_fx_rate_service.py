@@ -1,10 +1,12 @@
+from datetime import timedelta
 from decimal import Decimal
 from unittest.mock import patch
 
 from django.test import TestCase, override_settings
+from django.utils import timezone
 
 from apps.integrations.models import FXRateCache
-from apps.integrations.services import FXRateService
+from apps.integrations.services import FXRateMatrix, FXRateService
 from apps.integrations.shared.types import QuoteSnapshot
 
 
@@ -45,3 +47,55 @@ class FXRateServiceTests(TestCase):
 
         self.assertEqual(rate, Decimal("1.08"))
         mock_get_quote.assert_not_called()
+
+
+@override_settings(FX_RATE_CACHE_TTL_SECONDS=3600, FX_RATE_CROSS_CURRENCY="USD")
+class FXRateMatrixTests(TestCase):
+    def setUp(self):
+        FXRateMatrix.clear_process_cache()
+
+    def _cache_row(self, base: str, quote: str, rate: str) -> FXRateCache:
+        return FXRateCache.objects.create(
+            provider="fmp",
+            base_currency=base,
+            quote_currency=quote,
+            pair_symbol=f"{base}{quote}",
+            rate=Decimal(rate),
+        )
+
+    @patch("apps.integrations.services.fx_rate_service.FMP_PROVIDER.get_quote")
+    def test_matrix_derives_inverse_and_cross_rates_from_one_load(self, mock_get_quote):
+        self._cache_row("USD", "CAD", "1.25")
+        self._cache_row("EUR", "USD", "1.10")
+        matrix = FXRateMatrix(refresh_in_background=False)
+
+        with self.assertNumQueries(1):
+            inverse = matrix.get_rate(base_currency="CAD", quote_currency="USD")
+            cross = matrix.get_rate(base_currency="EUR", quote_currency="CAD")
+
+        self.assertEqual(inverse, Decimal("1") / Decimal("1.25"))
+        self.assertEqual(cross, Decimal("1.375"))
+        mock_get_quote.assert_not_called()
+
+    @patch("apps.integrations.services.fx_rate_service.FMP_PROVIDER.get_quote")
+    def test_matrix_serves_stale_rate_and_schedules_background_refresh(self, mock_get_quote):
+        row = self._cache_row("GBP", "USD", "1.30")
+        FXRateCache.objects.filter(pk=row.pk).update(as_of=timezone.now() - timedelta(hours=2))
+        matrix = FXRateMatrix(refresh_in_background=True)
+
+        with patch.object(FXRateMatrix, "_schedule_refresh") as mock_schedule:
+            rate = matrix.get_rate(base_currency="GBP", quote_currency="USD")
+
+        self.assertEqual(rate, Decimal("1.30"))
+        mock_schedule.assert_called_once_with(("GBP", "USD"))
+        mock_get_quote.assert_not_called()
+
+    @patch("apps.integrations.services.fx_rate_service.FMP_PROVIDER.get_quote")
+    def test_process_cache_skips_database_for_repeat_lookups(self, mock_get_quote):
+        self._cache_row("USD", "JPY", "150")
+        FXRateMatrix(refresh_in_background=False).get_rate(base_currency="USD", quote_currency="JPY")
+
+        with self.assertNumQueries(0):
+            rate = FXRateMatrix(refresh_in_background=False).get_rate(base_currency="USD", quote_currency="JPY")
+
+        self.assertEqual(rate, Decimal("150"))
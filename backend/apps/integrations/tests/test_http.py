@@ -0,0 +1,72 @@
+import json
+import threading
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase, override_settings
+
+from apps.integrations.exceptions import InvalidProviderResponse, ProviderRateLimited
+from apps.integrations.shared.http import HTTPSessionManager, get_json, iter_json_array
+
+
+def _response(status_code: int, payload=None, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.json.return_value = payload
+    return response
+
+
+class HTTPSessionManagerTests(SimpleTestCase):
+    @override_settings(INTEGRATIONS_HTTP_POOL_CONNECTIONS=4, INTEGRATIONS_HTTP_POOL_MAXSIZE=8)
+    def test_session_is_reused_per_thread_and_pooled_from_settings(self):
+        manager = HTTPSessionManager()
+        session = manager.get_session()
+        other_thread_sessions = []
+        thread = threading.Thread(target=lambda: other_thread_sessions.append(manager.get_session()))
+        thread.start()
+        thread.join()
+
+        self.assertIs(manager.get_session(), session)
+        self.assertIsNot(other_thread_sessions[0], session)
+        adapter = session.get_adapter("https://financialmodelingprep.com")
+        self.assertEqual(adapter._pool_connections, 4)
+        self.assertEqual(adapter._pool_maxsize, 8)
+        self.assertIn("gzip", session.headers["Accept-Encoding"])
+
+
+class GetJsonTests(SimpleTestCase):
+    @patch("apps.integrations.shared.http.time.sleep")
+    def test_get_json_retries_server_errors_on_the_shared_session(self, mock_sleep):
+        session = MagicMock()
+        session.get.side_effect = [_response(502), _response(200, [{"symbol": "AAPL"}])]
+
+        data = get_json("https://example.com/quote", session=session, max_retries=2, backoff_seconds=0.5)
+
+        self.assertEqual(data, [{"symbol": "AAPL"}])
+        self.assertEqual(session.get.call_count, 2)
+        mock_sleep.assert_called_once_with(0.5)
+
+    @patch("apps.integrations.shared.http.time.sleep")
+    def test_get_json_honours_retry_after_then_raises_rate_limited(self, mock_sleep):
+        session = MagicMock()
+        session.get.return_value = _response(429, headers={"Retry-After": "3"})
+
+        with self.assertRaises(ProviderRateLimited):
+            get_json("https://example.com/quote", session=session, max_retries=1)
+
+        mock_sleep.assert_called_once_with(3)
+
+
+class IterJsonArrayTests(SimpleTestCase):
+    def test_rows_are_parsed_across_arbitrary_chunk_boundaries(self):
+        rows = [{"symbol": f"S{index}", "name": "Caf\u00e9 \"Co\", ]"} for index in range(50)] + [12345, None]
+        raw = json.dumps(rows, ensure_ascii=False).encode("utf-8")
+
+        for size in (1, 7, 64):
+            chunks = [raw[start:start + size] for start in range(0, len(raw), size)]
+            self.assertEqual(list(iter_json_array(chunks)), rows)
+
+    def test_non_array_and_truncated_payloads_raise(self):
+        for payload in (b'{"symbol": "AAPL"}', b'[{"symbol": "AAPL"},', b"", b"[1] 2"):
+            with self.assertRaises(InvalidProviderResponse):
+                list(iter_json_array([payload]))
@@ -1,7 +1,15 @@
-from django.test import SimpleTestCase
+from django.db import transaction
+from django.test import SimpleTestCase, TransactionTestCase
 
-from apps.integrations.exceptions import InvalidProviderResponse, ProviderUnavailable
+from apps.integrations.exceptions import InvalidProviderResponse, ProviderRateLimited, ProviderUnavailable
+from apps.integrations.models import ProviderGuardState
 from apps.integrations.shared.provider_guard import ProviderGuard
+from apps.integrations.shared.provider_state import DatabaseProviderStateBackend, LocalProviderStateBackend
+
+
+class EchoProvider:
+    def echo(self, value):
+        return value
 
 
 class ProviderGuardTests(SimpleTestCase):
@@ -28,3 +36,98 @@ class ProviderGuardTests(SimpleTestCase):
             guard.fail()
 
         self.assertEqual(guard.consecutive_failures, 0)
+
+    def test_calls_wait_for_budget_and_report_queue_depth(self):
+        clock = {"now": 1000.0}
+        observed_depths = []
+        backend = LocalProviderStateBackend(clock=lambda: clock["now"])
+
+        def fake_sleep(seconds):
+            observed_depths.append(backend.state("Echo").waiting)
+            clock["now"] += seconds
+
+        guard = ProviderGuard(
+            name="Echo",
+            provider=EchoProvider(),
+            rate_per_minute=60,
+            burst=1,
+            backend=backend,
+            sleep=fake_sleep,
+        )
+
+        self.assertEqual(guard.echo(1), 1)
+        self.assertEqual(guard.echo(2), 2)
+
+        self.assertEqual(observed_depths, [1])
+        self.assertEqual(guard.status()["queue_depth"], 0)
+        self.assertEqual(guard.status()["circuit"], "closed")
+
+    def test_rate_limited_response_drains_budget_for_everyone(self):
+        class LimitedProvider:
+            def fetch(self):
+                raise ProviderRateLimited("429")
+
+        backend = LocalProviderStateBackend()
+        guard = ProviderGuard(name="Limited", provider=LimitedProvider(), rate_per_minute=600, backend=backend)
+        sibling = ProviderGuard(name="Limited", provider=EchoProvider(), rate_per_minute=600, backend=backend)
+
+        with self.settings(PROVIDER_GUARD_MAX_WAIT_SECONDS=1):
+            with self.assertRaises(ProviderRateLimited):
+                guard.fetch()
+            with self.assertRaises(ProviderRateLimited):
+                sibling.echo(1)
+
+        self.assertEqual(guard.consecutive_failures, 0)
+
+
+class DatabaseProviderStateBackendTests(TransactionTestCase):
+    databases = {"default", "integrations_state"}
+
+    def test_circuit_and_budget_are_shared_between_guards(self):
+        class BrokenProvider:
+            def explode(self):
+                raise RuntimeError("boom")
+
+        first = ProviderGuard(
+            name="Shared",
+            provider=BrokenProvider(),
+            rate_per_minute=600,
+            burst=10,
+            backend=DatabaseProviderStateBackend(),
+        )
+        second = ProviderGuard(
+            name="Shared",
+            provider=EchoProvider(),
+            rate_per_minute=600,
+            burst=10,
+            backend=DatabaseProviderStateBackend(),
+        )
+
+        for _ in range(ProviderGuard.MAX_FAILURES):
+            with self.assertRaises(ProviderUnavailable):
+                first.explode()
+
+        self.assertEqual(second.status()["circuit"], "open")
+        self.assertLess(second.status()["budget"], 10)
+        with self.assertRaises(ProviderUnavailable):
+            second.echo(1)
+        self.assertEqual(ProviderGuardState.objects.get(provider="Shared").consecutive_failures, 5)
+
+    def test_failures_survive_caller_rollback(self):
+        class BrokenProvider:
+            def explode(self):
+                raise RuntimeError("boom")
+
+        guard = ProviderGuard(
+            name="Rollback",
+            provider=BrokenProvider(),
+            backend=DatabaseProviderStateBackend(),
+        )
+
+        for _ in range(ProviderGuard.MAX_FAILURES):
+            with self.assertRaises(ProviderUnavailable):
+                with transaction.atomic():
+                    guard.explode()
+
+        self.assertEqual(guard.consecutive_failures, ProviderGuard.MAX_FAILURES)
+        self.assertFalse(guard.can_call())
@@ -0,0 +1,145 @@
+import json
+import tempfile
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase, override_settings
+
+from apps.integrations.exceptions import InvalidProviderResponse, ProviderUnavailable
+
+from apps.integrations.providers.fmp.provider import FMPProvider
+from apps.integrations.shared.provider_guard import ProviderGuard
+from apps.integrations.shared.provider_state import LocalProviderStateBackend
+from apps.integrations.shared.response_cache import ResponseCache, cache_key
+
+
+def _response(status_code: int, payload=None, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.content = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    return response
+
+
+class ResponseCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.now = 1_000.0
+        self.cache = ResponseCache(self.directory.name, clock=lambda: self.now)
+
+    def test_fresh_entries_skip_the_network(self):
+        fetch = MagicMock(return_value=_response(200, [{"symbol": "AAPL"}], {"ETag": '"v1"'}))
+
+        first = self.cache.get_json("https://example.com/stock-list", key="k", ttl_seconds=60, fetch=fetch)
+        self.now += 30
+        second = self.cache.get_json("https://example.com/stock-list", key="k", ttl_seconds=60, fetch=fetch)
+
+        self.assertEqual(first, [{"symbol": "AAPL"}])
+        self.assertEqual(second, first)
+        fetch.assert_called_once_with("https://example.com/stock-list", headers=None)
+
+    def test_expired_entries_revalidate_with_validators_and_reuse_body_on_304(self):
+        fetch = MagicMock(
+            side_effect=[
+                _response(200, [{"symbol": "AAPL"}], {"ETag": '"v1"', "Last-Modified": "Mon"}),
+                _response(304),
+            ]
+        )
+
+        self.cache.get_json("https://example.com/stock-list", key="k", ttl_seconds=60, fetch=fetch)
+        self.now += 120
+        data = self.cache.get_json("https://example.com/stock-list", key="k", ttl_seconds=60, fetch=fetch)
+
+        self.assertEqual(data, [{"symbol": "AAPL"}])
+        fetch.assert_called_with(
+            "https://example.com/stock-list",
+            headers={"If-None-Match": '"v1"', "If-Modified-Since": "Mon"},
+        )
+        self.assertEqual(self.cache.load("k").fetched_at, self.now)
+
+    def test_streamed_responses_are_written_through_and_replayed_from_disk(self):
+        response = _response(200, [{"symbol": "AAPL"}, {"symbol": "MSFT"}], {"ETag": '"v1"'})
+        response.iter_content.side_effect = lambda chunk_size: iter([response.content[:5], response.content[5:]])
+        fetch = MagicMock(return_value=response)
+
+        first = list(self.cache.iter_json("https://example.com/stock-list", key="k", ttl_seconds=60, fetch=fetch))
+        second = list(self.cache.iter_json("https://example.com/stock-list", key="k", ttl_seconds=60, fetch=fetch))
+
+        self.assertEqual(first, [{"symbol": "AAPL"}, {"symbol": "MSFT"}])
+        self.assertEqual(second, first)
+        fetch.assert_called_once_with("https://example.com/stock-list", headers=None, stream=True)
+        self.assertEqual(self.cache.load("k").etag, '"v1"')
+
+    def test_truncated_streams_are_not_cached(self):
+        truncated = _response(200, headers={"ETag": '"v1"'})
+        truncated.iter_content.side_effect = lambda chunk_size: iter([b'[{"symbol": "AAPL"}, {"sym'])
+        complete = _response(200, [{"symbol": "AAPL"}], {"ETag": '"v2"'})
+        complete.iter_content.side_effect = lambda chunk_size: iter([complete.content])
+        fetch = MagicMock(side_effect=[truncated, complete])
+
+        with self.assertRaises(InvalidProviderResponse):
+            list(self.cache.iter_json("https://example.com/stock-list", key="k", ttl_seconds=60, fetch=fetch))
+        self.assertIsNone(self.cache.load("k"))
+
+        data = list(self.cache.iter_json("https://example.com/stock-list", key="k", ttl_seconds=60, fetch=fetch))
+
+        self.assertEqual(data, [{"symbol": "AAPL"}])
+        self.assertEqual(fetch.call_count, 2)
+        self.assertEqual(self.cache.load("k").etag, '"v2"')
+
+    def test_cache_key_ignores_param_order_and_none_values(self):
+        self.assertEqual(
+            cache_key("/stock-list", {"a": 1, "b": None, "c": "x"}),
+            cache_key("/stock-list", {"c": "x", "a": 1}),
+        )
+        self.assertNotEqual(cache_key("/stock-list", {}), cache_key("/forex-list", {}))
+
+
+class FMPResponseCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    @patch("apps.integrations.shared.response_cache.get_response")
+    def test_reference_lists_are_served_from_cache_within_ttl(self, mock_get_response):
+        mock_get_response.return_value = _response(200, [{"country": "us"}, {"country": "ca"}])
+
+        with override_settings(FMP_RESPONSE_CACHE_DIR=self.directory.name):
+            provider = FMPProvider()
+            self.assertEqual(provider.get_available_countries(), ["US", "CA"])
+            self.assertEqual(provider.get_available_countries(), ["US", "CA"])
+
+        mock_get_response.assert_called_once()
+
+    @patch("apps.integrations.shared.response_cache.get_response")
+    def test_fresh_hits_bypass_the_guard_budget_and_open_circuit(self, mock_get_response):
+        mock_get_response.return_value = _response(200, [{"country": "us"}])
+
+        def no_wait(seconds):
+            raise AssertionError("cache hit waited for request budget")
+
+        guard = ProviderGuard(
+            name="FMP",
+            rate_per_minute=60,
+            burst=1,
+            backend=LocalProviderStateBackend(),
+            sleep=no_wait,
+        )
+
+        with (
+            override_settings(FMP_RESPONSE_CACHE_DIR=self.directory.name),
+            patch("apps.integrations.providers.fmp.request.FMP_GUARD", guard),
+        ):
+            provider = FMPProvider()
+            self.assertEqual(provider.get_available_countries(), ["US"])
+            self.assertEqual(provider.get_available_countries(), ["US"])
+
+            for _ in range(ProviderGuard.MAX_FAILURES):
+                guard.record_failure()
+            self.assertEqual(provider.get_available_countries(), ["US"])
+
+            with override_settings(FMP_RESPONSE_CACHE_TTLS={"/available-countries": 0.000001}):
+                with self.assertRaises(ProviderUnavailable):
+                    provider.get_available_countries()
+
+        mock_get_response.assert_called_once()
@@ -0,0 +1,78 @@
+import tempfile
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.integrations.models import ActiveEquityListing, ActiveListingGeneration
+from apps.integrations.services import ActiveListingSearchService
+from apps.integrations.services.active_listing_search_service import _SLOTS
+from apps.integrations.shared.search_index import PrefixTrigramIndex
+
+
+class PrefixTrigramIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = PrefixTrigramIndex(
+            rows=[
+                {"symbol": "METAA", "name": "Meta Holdings A"},
+                {"symbol": "AAPL", "name": "Apple Inc."},
+                {"symbol": "META", "name": "Meta Platforms, Inc."},
+                {"symbol": "AMZN", "name": "Amazon.com, Inc."},
+            ]
+        )
+
+    def test_ranks_exact_then_prefix_then_name_matches(self):
+        symbols = [row["symbol"] for row in self.index.search("meta")]
+
+        self.assertEqual(symbols, ["META", "METAA"])
+
+    def test_name_word_prefix_and_fuzzy_matches(self):
+        self.assertEqual([row["symbol"] for row in self.index.search("amaz")], ["AMZN"])
+        self.assertEqual([row["symbol"] for row in self.index.search("aple")], ["AAPL"])
+
+    def test_empty_query_returns_rows_in_symbol_order(self):
+        self.assertEqual(
+            [row["symbol"] for row in self.index.search("", limit=2)],
+            ["AAPL", "AMZN"],
+        )
+
+
+class ActiveListingSearchServiceTests(TestCase):
+    def setUp(self):
+        _SLOTS.clear()
+        ActiveEquityListing.objects.create(symbol="AAPL", name="Apple Inc.")
+
+    def test_index_reloads_from_warm_start_file_for_current_generation(self):
+        with tempfile.TemporaryDirectory() as index_dir, override_settings(ACTIVE_LISTING_INDEX_DIR=index_dir):
+            ActiveListingSearchService.build(model=ActiveEquityListing)
+            ActiveEquityListing.objects.filter(symbol="AAPL").update(name="Renamed")
+            _SLOTS.clear()
+
+            with self.assertNumQueries(1):
+                rows = ActiveListingSearchService.search(model=ActiveEquityListing, query="apple")
+
+            self.assertEqual(rows, [{"symbol": "AAPL", "name": "Apple Inc."}])
+
+            ActiveListingGeneration.objects.create(listing="equity", provider="fmp", active_generation=0)
+            ActiveListingGeneration.objects.filter(listing="equity").update(active_generation=1)
+            ActiveEquityListing.objects.filter(symbol="AAPL").update(generation=1)
+            _SLOTS.clear()
+
+            rows = ActiveListingSearchService.search(model=ActiveEquityListing, query="renamed")
+
+            self.assertEqual(rows, [{"symbol": "AAPL", "name": "Renamed"}])
+
+    def test_stale_in_memory_slot_adopts_warm_start_file_for_new_generation(self):
+        with tempfile.TemporaryDirectory() as index_dir, override_settings(ACTIVE_LISTING_INDEX_DIR=index_dir):
+            ActiveListingSearchService.build(model=ActiveEquityListing)
+            stale_slot = _SLOTS[("equity", "fmp")]
+
+            ActiveListingGeneration.objects.create(listing="equity", provider="fmp", active_generation=1)
+            ActiveEquityListing.objects.filter(symbol="AAPL").update(name="Renamed", generation=1)
+            ActiveListingSearchService.build(model=ActiveEquityListing)
+            stale_slot.checked_at = 0
+            _SLOTS[("equity", "fmp")] = stale_slot
+
+            with self.assertNumQueries(1):
+                rows = ActiveListingSearchService.search(model=ActiveEquityListing, query="renamed")
+
+            self.assertEqual(rows, [{"symbol": "AAPL", "name": "Renamed"}])
+            self.assertEqual(_SLOTS[("equity", "fmp")].generation, 1)
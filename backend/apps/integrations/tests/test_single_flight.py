@@ -0,0 +1,101 @@
+import threading
+
+from django.db import transaction
+from django.test import SimpleTestCase, TransactionTestCase
+
+from apps.integrations.models import ProviderLease
+from apps.integrations.shared.single_flight import DatabaseLeaseBackend, SingleFlight
+
+
+class SingleFlightTests(SimpleTestCase):
+    def test_concurrent_callers_share_one_execution(self):
+        flight = SingleFlight(name="quote")
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            release.wait(timeout=5)
+            return "AAPL@210"
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flight.do("quote:AAPL", fetch)))
+        leader.start()
+        while not flight.stats()["in_flight"]:
+            pass
+        followers = [
+            threading.Thread(target=lambda: results.append(flight.do("quote:AAPL", fetch)))
+            for _ in range(4)
+        ]
+        for thread in followers:
+            thread.start()
+        while flight.stats()["coalesced"] < 4:
+            pass
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(timeout=5)
+
+        self.assertEqual(results, ["AAPL@210"] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(
+            {key: flight.stats()[key] for key in ("calls", "executed", "coalesced", "in_flight")},
+            {"calls": 5, "executed": 1, "coalesced": 4, "in_flight": 0},
+        )
+
+    def test_leader_errors_are_raised_and_the_key_is_released(self):
+        flight = SingleFlight(name="quote")
+
+        def fail():
+            raise RuntimeError("provider down")
+
+        with self.assertRaises(RuntimeError):
+            flight.do("quote:AAPL", fail)
+
+        self.assertEqual(flight.do("quote:AAPL", lambda: "ok"), "ok")
+
+    def test_remote_lease_holders_are_reused_instead_of_refetching(self):
+        class BusyBackend:
+            def acquire(self, key, *, owner, ttl_seconds):
+                return False
+
+            def release(self, key, *, owner):
+                raise AssertionError("lease was never acquired")
+
+        flight = SingleFlight(name="quote", backend=BusyBackend(), sleep=lambda seconds: None)
+        reuse_results = iter([None, "fresh-from-other-process"])
+
+        value = flight.do("quote:AAPL", lambda: "refetched", reuse=lambda: next(reuse_results))
+
+        self.assertEqual(value, "fresh-from-other-process")
+        self.assertEqual(flight.stats()["coalesced_remote"], 1)
+        self.assertEqual(flight.stats()["executed"], 0)
+
+
+class DatabaseLeaseBackendTests(TransactionTestCase):
+    databases = {"default", "integrations_state"}
+
+    def test_lease_is_exclusive_until_released_or_expired(self):
+        clock = {"now": 100.0}
+        backend = DatabaseLeaseBackend(clock=lambda: clock["now"])
+
+        self.assertTrue(backend.acquire("quote:AAPL", owner="a", ttl_seconds=30))
+        self.assertFalse(backend.acquire("quote:AAPL", owner="b", ttl_seconds=30))
+
+        clock["now"] = 131.0
+        self.assertTrue(backend.acquire("quote:AAPL", owner="b", ttl_seconds=30))
+
+        backend.release("quote:AAPL", owner="a")
+        self.assertEqual(ProviderLease.objects.get(key="quote:AAPL").owner, "b")
+        backend.release("quote:AAPL", owner="b")
+        self.assertFalse(ProviderLease.objects.exists())
+
+    def test_lease_commits_independently_of_the_callers_transaction(self):
+        backend = DatabaseLeaseBackend()
+
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                self.assertTrue(backend.acquire("quote:AAPL", owner="a", ttl_seconds=30))
+                raise RuntimeError("caller rolled back")
+
+        self.assertEqual(ProviderLease.objects.get(key="quote:AAPL").owner, "a")
+        self.assertFalse(DatabaseLeaseBackend().acquire("quote:AAPL", owner="b", ttl_seconds=30))
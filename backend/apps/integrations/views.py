@@ -16,8 +16,8 @@ class ActiveEquityListView(ServiceAPIView):
 
     def get(self, request):
         query = request.query_params.get("q", "")
-        queryset = MarketDataService.search_active_equities(query=query)[:25]
-        return Response(ActiveEquityListingSerializer(queryset, many=True).data)
+        rows = MarketDataService.search_active_equities(query=query, limit=25)
+        return Response(ActiveEquityListingSerializer(rows, many=True).data)
 
 
 class ActiveCryptoListView(ServiceAPIView):
@@ -25,8 +25,8 @@ class ActiveCryptoListView(ServiceAPIView):
 
     def get(self, request):
         query = request.query_params.get("q", "")
-        queryset = MarketDataService.search_active_cryptos(query=query)[:25]
-        return Response(ActiveCryptoListingSerializer(queryset, many=True).data)
+        rows = MarketDataService.search_active_cryptos(query=query, limit=25)
+        return Response(ActiveCryptoListingSerializer(rows, many=True).data)
 
 
 class ActiveCommodityListView(ServiceAPIView):
@@ -34,8 +34,8 @@ class ActiveCommodityListView(ServiceAPIView):
 
     def get(self, request):
         query = request.query_params.get("q", "")
-        queryset = MarketDataService.search_active_commodities(query=query)[:25]
-        return Response(ActiveCommodityListingSerializer(queryset, many=True).data)
+        rows = MarketDataService.search_active_commodities(query=query, limit=25)
+        return Response(ActiveCommodityListingSerializer(rows, many=True).data)
 
 
 class ActivePreciousMetalListView(ServiceAPIView):
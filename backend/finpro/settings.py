@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 import os
 import sys
+import tempfile
 from datetime import timedelta
 from pathlib import Path
 from typing import Any
@@ -34,6 +35,45 @@ INTEGRATIONS_MAX_RETRIES = int(os.getenv("INTEGRATIONS_MAX_RETRIES", "2"))
 INTEGRATIONS_RETRY_BACKOFF_SECONDS = float(
     os.getenv("INTEGRATIONS_RETRY_BACKOFF_SECONDS", "0.5")
 )
+FMP_QUOTE_BATCH_SIZE = int(os.getenv("FMP_QUOTE_BATCH_SIZE", "100"))
+HOLDINGS_PAGE_SIZE = int(os.getenv("HOLDINGS_PAGE_SIZE", "100"))
+HOLDINGS_MAX_PAGE_SIZE = int(os.getenv("HOLDINGS_MAX_PAGE_SIZE", "1000"))
+ASSET_DIRECTORY_SYNC_BATCH_SIZE = int(os.getenv("ASSET_DIRECTORY_SYNC_BATCH_SIZE", "1000"))
+ASSET_DIVIDEND_SYNC_BATCH_SIZE = int(os.getenv("ASSET_DIVIDEND_SYNC_BATCH_SIZE", "500"))
+ASSET_DIVIDEND_INCREMENTAL_LIMIT = int(os.getenv("ASSET_DIVIDEND_INCREMENTAL_LIMIT", "8"))
+ASSET_PRICE_HISTORY_BATCH_SIZE = int(os.getenv("ASSET_PRICE_HISTORY_BATCH_SIZE", "5000"))
+ASSET_PRICE_HISTORY_LOOKBACK_DAYS = int(os.getenv("ASSET_PRICE_HISTORY_LOOKBACK_DAYS", "1825"))
+ACTIVE_LISTING_REFRESH_BATCH_SIZE = int(os.getenv("ACTIVE_LISTING_REFRESH_BATCH_SIZE", "1000"))
+ACTIVE_LISTING_INDEX_CHECK_SECONDS = float(os.getenv("ACTIVE_LISTING_INDEX_CHECK_SECONDS", "5"))
+ACTIVE_LISTING_INDEX_DIR = (
+    None
+    if TESTING
+    else os.getenv(
+        "ACTIVE_LISTING_INDEX_DIR",
+        os.path.join(tempfile.gettempdir(), "finpro-search-index"),
+    )
+)
+FMP_RESPONSE_CACHE_DIR = (
+    None
+    if TESTING
+    else os.getenv(
+        "FMP_RESPONSE_CACHE_DIR",
+        os.path.join(tempfile.gettempdir(), "finpro-fmp-cache"),
+    )
+)
+FMP_MAX_CONCURRENCY = int(os.getenv("FMP_MAX_CONCURRENCY", "8"))
+FMP_REQUESTS_PER_MINUTE = int(os.getenv("FMP_REQUESTS_PER_MINUTE", "300"))
+FMP_REQUEST_BURST = float(os.getenv("FMP_REQUEST_BURST", "10"))
+PROVIDER_GUARD_BACKEND = os.getenv("PROVIDER_GUARD_BACKEND", "local" if TESTING else "database")
+PROVIDER_GUARD_MAX_WAIT_SECONDS = float(os.getenv("PROVIDER_GUARD_MAX_WAIT_SECONDS", "30"))
+PROVIDER_GUARD_RATE_LIMIT_PENALTY_SECONDS = float(
+    os.getenv("PROVIDER_GUARD_RATE_LIMIT_PENALTY_SECONDS", "60")
+)
+SINGLE_FLIGHT_BACKEND = os.getenv("SINGLE_FLIGHT_BACKEND", "local" if TESTING else "database")
+SINGLE_FLIGHT_LEASE_SECONDS = float(os.getenv("SINGLE_FLIGHT_LEASE_SECONDS", "30"))
+SINGLE_FLIGHT_WAIT_SECONDS = float(os.getenv("SINGLE_FLIGHT_WAIT_SECONDS", "10"))
+INTEGRATIONS_HTTP_POOL_CONNECTIONS = int(os.getenv("INTEGRATIONS_HTTP_POOL_CONNECTIONS", "10"))
+INTEGRATIONS_HTTP_POOL_MAXSIZE = int(os.getenv("INTEGRATIONS_HTTP_POOL_MAXSIZE", "20"))
 
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = os.getenv("DJANGO_DEBUG", "True").lower() == "true"
@@ -117,6 +157,14 @@ elif DB_ENGINE == 'django.db.backends.sqlite3':
         'NAME': os.getenv('DB_NAME', str(BASE_DIR / 'db.sqlite3')),
     }
 
+# Provider guard / lease state is written on a separate connection to the same
+# database so it commits independently of the caller's transaction.
+INTEGRATIONS_STATE_DB_ALIAS = 'integrations_state'
+DATABASES[INTEGRATIONS_STATE_DB_ALIAS] = {
+    **DATABASES['default'],
+    'TEST': {'MIRROR': 'default'},
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -207,4 +255,14 @@ DEFAULT_FROM_EMAIL = "no-reply@finpro.local"
 # Integrations / External Providers
 
 ASSET_PRICE_CACHE_TTL_SECONDS = int(os.getenv("ASSET_PRICE_CACHE_TTL_SECONDS", "600"))
+ASSET_PRICE_REFRESH_WORKERS = int(os.getenv("ASSET_PRICE_REFRESH_WORKERS", "4"))
+ASSET_PRICE_BACKGROUND_REFRESH = (
+    os.getenv("ASSET_PRICE_BACKGROUND_REFRESH", "True").lower() == "true" and not TESTING
+)
 FX_RATE_CACHE_TTL_SECONDS = int(os.getenv("FX_RATE_CACHE_TTL_SECONDS", "3600"))
+FX_RATE_PROCESS_CACHE_TTL_SECONDS = int(os.getenv("FX_RATE_PROCESS_CACHE_TTL_SECONDS", "300"))
+FX_RATE_PROCESS_CACHE_SIZE = int(os.getenv("FX_RATE_PROCESS_CACHE_SIZE", "1024"))
+FX_RATE_CROSS_CURRENCY = os.getenv("FX_RATE_CROSS_CURRENCY", "USD")
+FX_RATE_BACKGROUND_REFRESH = (
+    os.getenv("FX_RATE_BACKGROUND_REFRESH", "True").lower() == "true" and not TESTING
+)
@@ -15,6 +15,15 @@ def _notify_holding_changed(holding):
     SchemaOrchestrationService.holding_changed(holding)
 
 
+def _notify_holding_fields_changed(holding):
+    try:
+        from schemas.services.orchestration import SchemaOrchestrationService
+        from schemas.services.plan import SchemaInput
+    except Exception:
+        return
+    SchemaOrchestrationService.holding_changed(holding, inputs=(SchemaInput.HOLDING,))
+
+
 class HoldingService:
     @staticmethod
     @transaction.atomic
@@ -117,7 +126,7 @@ class HoldingService:
             holding.price_source_mode = price_source_mode
 
         holding.save()
-        _notify_holding_changed(holding)
+        _notify_holding_fields_changed(holding)
         AccountAuditService.log(
             account=holding.account,
             action="holding.updated",
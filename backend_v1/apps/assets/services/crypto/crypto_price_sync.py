@@ -1,3 +1,5 @@
+from contextlib import nullcontext
+
 from django.db import transaction
 
 from assets.models.core import AssetPrice
@@ -9,9 +11,18 @@ from external_data.providers.fmp.client import FMP_PROVIDER
 def _notify_asset_changed(asset):
     try:
         from schemas.services.orchestration import SchemaOrchestrationService
+        from schemas.services.plan import SchemaInput
     except Exception:
         return
-    SchemaOrchestrationService.asset_changed(asset)
+    SchemaOrchestrationService.asset_changed(asset, inputs=(SchemaInput.PRICE,))
+
+
+def _deferred_schema_recompute():
+    try:
+        from schemas.services.orchestration import SchemaOrchestrationService
+    except Exception:
+        return nullcontext()
+    return SchemaOrchestrationService.deferred()
 
 
 class CryptoPriceSyncService:
@@ -36,29 +47,31 @@ class CryptoPriceSyncService:
         updated = 0
         skipped = 0
 
-        for crypto in qs.select_related("asset"):
-            try:
-                quote = FMP_PROVIDER.get_crypto_quote(crypto.pair_symbol)
-            except ExternalDataError:
-                skipped += 1
-                continue
-
-            price = quote.get("price")
-            if price is None:
-                skipped += 1
-                continue
-
-            AssetPrice.objects.update_or_create(
-                asset=crypto.asset,
-                defaults={
-                    "price": price,
-                    "source": FMP_PROVIDER.name,
-                },
-            )
-
-            _notify_asset_changed(crypto.asset)
-
-            updated += 1
+        # Price changes are coalesced and recomputed once the sync commits.
+        with _deferred_schema_recompute():
+            for crypto in qs.select_related("asset"):
+                try:
+                    quote = FMP_PROVIDER.get_crypto_quote(crypto.pair_symbol)
+                except ExternalDataError:
+                    skipped += 1
+                    continue
+
+                price = quote.get("price")
+                if price is None:
+                    skipped += 1
+                    continue
+
+                AssetPrice.objects.update_or_create(
+                    asset=crypto.asset,
+                    defaults={
+                        "price": price,
+                        "source": FMP_PROVIDER.name,
+                    },
+                )
+
+                _notify_asset_changed(crypto.asset)
+
+                updated += 1
 
         return {
             "updated": updated,
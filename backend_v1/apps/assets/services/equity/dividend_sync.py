@@ -12,9 +12,10 @@ from external_data.providers.fmp.client import FMP_PROVIDER
 def _notify_asset_changed(asset):
     try:
         from schemas.services.orchestration import SchemaOrchestrationService
+        from schemas.services.plan import SchemaInput
     except Exception:
         return
-    SchemaOrchestrationService.asset_changed(asset)
+    SchemaOrchestrationService.asset_changed(asset, inputs=(SchemaInput.ASSET,))
 
 
 # ============================================================
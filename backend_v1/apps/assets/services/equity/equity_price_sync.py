@@ -1,3 +1,5 @@
+from contextlib import nullcontext
+
 from django.db import transaction
 
 from assets.models.core import AssetPrice
@@ -9,9 +11,18 @@ from external_data.providers.fmp.client import FMP_PROVIDER
 def _notify_asset_changed(asset):
     try:
         from schemas.services.orchestration import SchemaOrchestrationService
+        from schemas.services.plan import SchemaInput
     except Exception:
         return
-    SchemaOrchestrationService.asset_changed(asset)
+    SchemaOrchestrationService.asset_changed(asset, inputs=(SchemaInput.PRICE,))
+
+
+def _deferred_schema_recompute():
+    try:
+        from schemas.services.orchestration import SchemaOrchestrationService
+    except Exception:
+        return nullcontext()
+    return SchemaOrchestrationService.deferred()
 
 
 class EquityPriceSyncService:
@@ -32,28 +43,30 @@ class EquityPriceSyncService:
         updated = 0
         skipped = 0
 
-        for equity in qs.select_related("asset"):
-            try:
-                quote = FMP_PROVIDER.get_equity_quote(equity.ticker)
-            except ExternalDataError:
-                skipped += 1
-                continue
+        # Price changes are coalesced and recomputed once the sync commits.
+        with _deferred_schema_recompute():
+            for equity in qs.select_related("asset"):
+                try:
+                    quote = FMP_PROVIDER.get_equity_quote(equity.ticker)
+                except ExternalDataError:
+                    skipped += 1
+                    continue
 
-            if not quote or quote.price is None:
-                skipped += 1
-                continue
+                if not quote or quote.price is None:
+                    skipped += 1
+                    continue
 
-            AssetPrice.objects.update_or_create(
-                asset=equity.asset,
-                defaults={
-                    "price": quote.price,
-                    "source": FMP_PROVIDER.name,
-                },
-            )
+                AssetPrice.objects.update_or_create(
+                    asset=equity.asset,
+                    defaults={
+                        "price": quote.price,
+                        "source": FMP_PROVIDER.name,
+                    },
+                )
 
-            _notify_asset_changed(equity.asset)
+                _notify_asset_changed(equity.asset)
 
-            updated += 1
+                updated += 1
 
         return {
             "updated": updated,
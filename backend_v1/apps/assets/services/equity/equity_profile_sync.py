@@ -9,9 +9,10 @@ from assets.models.equity.exchange import Exchange
 def _notify_asset_changed(asset):
     try:
         from schemas.services.orchestration import SchemaOrchestrationService
+        from schemas.services.plan import SchemaInput
     except Exception:
         return
-    SchemaOrchestrationService.asset_changed(asset)
+    SchemaOrchestrationService.asset_changed(asset, inputs=(SchemaInput.ASSET,))
 
 
 class EquityProfileSyncService:
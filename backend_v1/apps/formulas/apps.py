@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class FormulasConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = 'formulas'
+
+    def ready(self):
+        from .models import Formula
+        from .signals import invalidate_compiled_formula
+
+        post_save.connect(invalidate_compiled_formula, sender=Formula)
+        post_delete.connect(invalidate_compiled_formula, sender=Formula)
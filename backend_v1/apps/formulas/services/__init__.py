@@ -1,3 +1,4 @@
+from .formula_compiler import CompiledFormula, FormulaCompiler
 from .formula_definition_service import FormulaDefinitionService
 from .formula_evaluator import FormulaEvaluator
 from .formula_resolver import FormulaResolver
@@ -9,5 +10,7 @@ __all__ = [
     "FormulaDefinitionService",
     "FormulaResolver",
     "FormulaEvaluator",
+    "FormulaCompiler",
+    "CompiledFormula",
     "SystemFormulaRegistry",
 ]
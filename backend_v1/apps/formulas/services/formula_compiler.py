@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import ast
+import hashlib
+import operator
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Callable, Dict
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+
+
+_BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Pow: operator.pow,
+}
+
+
+@dataclass(frozen=True)
+class CompiledFormula:
+    """
+    A formula expression validated once and compiled into a closure tree.
+
+    ``evaluate`` only performs lookups and Decimal arithmetic; the AST is
+    never parsed or walked again.
+    """
+
+    identifier: str
+    identifiers: frozenset[str]
+    decimal_places: int | None
+    tree: ast.Expression
+    _fn: Callable[[Dict[str, Decimal]], Decimal]
+
+    def evaluate(self, context: Dict[str, Decimal]) -> Decimal:
+        result = self._fn(context)
+
+        if self.decimal_places is not None:
+            quantizer = Decimal("1").scaleb(-self.decimal_places)
+            result = result.quantize(quantizer, rounding=ROUND_HALF_UP)
+
+        return result
+
+
+class FormulaCompiler:
+    """
+    Compiles formula expressions and keeps them in a process-local LRU.
+
+    Entries are keyed by (identifier, expression hash, decimal_places) and are
+    dropped whenever a Formula with that identifier is saved or deleted.
+    """
+
+    _cache: OrderedDict[tuple, CompiledFormula] = OrderedDict()
+    _lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def max_size() -> int:
+        return max(int(getattr(settings, "FORMULA_COMPILED_CACHE_SIZE", 1024)), 1)
+
+    @staticmethod
+    def cache_key(formula) -> tuple:
+        expression_hash = hashlib.sha256(formula.expression.encode("utf-8")).hexdigest()
+        return (formula.identifier, expression_hash, formula.decimal_places)
+
+    @classmethod
+    def get(cls, formula) -> CompiledFormula:
+        key = cls.cache_key(formula)
+        with cls._lock:
+            compiled = cls._cache.get(key)
+            if compiled is not None:
+                cls._cache.move_to_end(key)
+                return compiled
+
+        # Compile outside the lock; a racing compile of the same key is harmless.
+        compiled = cls.compile(
+            identifier=formula.identifier,
+            expression=formula.expression,
+            decimal_places=formula.decimal_places,
+        )
+
+        with cls._lock:
+            cls._cache[key] = compiled
+            cls._cache.move_to_end(key)
+            while len(cls._cache) > cls.max_size():
+                cls._cache.popitem(last=False)
+        return compiled
+
+    @classmethod
+    def invalidate(cls, identifier: str | None = None) -> None:
+        with cls._lock:
+            if identifier is None:
+                cls._cache.clear()
+                return
+            for key in [key for key in cls._cache if key[0] == identifier]:
+                del cls._cache[key]
+
+    @classmethod
+    def cache_info(cls) -> dict:
+        with cls._lock:
+            return {"size": len(cls._cache), "max_size": cls.max_size()}
+
+    # ------------------------------------------------------------------
+    # Compilation
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def compile(*, identifier: str, expression: str, decimal_places: int | None = None) -> CompiledFormula:
+        try:
+            tree = ast.parse(expression, mode="eval")
+        except SyntaxError as exc:
+            raise ValidationError(
+                f"Invalid formula syntax for '{identifier}': {exc}"
+            ) from exc
+
+        identifiers = frozenset(
+            node.id for node in ast.walk(tree) if isinstance(node, ast.Name)
+        )
+
+        return CompiledFormula(
+            identifier=identifier,
+            identifiers=identifiers,
+            decimal_places=decimal_places,
+            tree=tree,
+            _fn=FormulaCompiler._compile_node(tree.body),
+        )
+
+    @staticmethod
+    def _compile_node(node) -> Callable[[Dict[str, Decimal]], Decimal]:
+        if isinstance(node, ast.BinOp):
+            left = FormulaCompiler._compile_node(node.left)
+            right = FormulaCompiler._compile_node(node.right)
+
+            if isinstance(node.op, ast.Div):
+                def divide(context):
+                    numerator = left(context)
+                    denominator = right(context)
+                    if denominator == 0:
+                        raise ValidationError("Division by zero.")
+                    return numerator / denominator
+
+                return divide
+
+            op = _BINARY_OPERATORS.get(type(node.op))
+            if op is None:
+                raise ValidationError(
+                    f"Unsupported binary operator: {type(node.op).__name__}"
+                )
+            return lambda context: op(left(context), right(context))
+
+        if isinstance(node, ast.UnaryOp):
+            operand = FormulaCompiler._compile_node(node.operand)
+            if isinstance(node.op, ast.UAdd):
+                return operand
+            if isinstance(node.op, ast.USub):
+                return lambda context: -operand(context)
+            raise ValidationError(
+                f"Unsupported unary operator: {type(node.op).__name__}"
+            )
+
+        if isinstance(node, ast.Name):
+            name = node.id
+
+            def lookup(context):
+                if name not in context:
+                    raise ValidationError(f"Missing variable '{name}' in evaluation context.")
+                value = context[name]
+                if type(value) is Decimal:
+                    return value
+                try:
+                    return Decimal(str(value))
+                except Exception as exc:
+                    raise ValidationError(
+                        f"Variable '{name}' has non-numeric value '{value}'."
+                    ) from exc
+
+            return lookup
+
+        if isinstance(node, ast.Constant):
+            if isinstance(node.value, (int, float, Decimal)):
+                constant = Decimal(str(node.value))
+                return lambda context: constant
+            raise ValidationError(
+                f"Unsupported constant type: {type(node.value).__name__}"
+            )
+
+        raise ValidationError(f"Unsupported expression node: {type(node).__name__}")
@@ -4,8 +4,7 @@ from typing import Dict, Any
 from django.core.exceptions import ValidationError
 
 from formulas.models.formula import Formula
-
-import ast
+from formulas.services.formula_compiler import FormulaCompiler
 
 
 class FormulaResolver:
@@ -96,14 +95,4 @@ class FormulaResolver:
         Example: "quantity * price" -> {"quantity", "price"}
         """
 
-        tree = ast.parse(formula.expression, mode="eval")
-
-        identifiers = set()
-
-        class Visitor(ast.NodeVisitor):
-            def visit_Name(self, node):
-                identifiers.add(node.id)
-
-        Visitor().visit(tree)
-
-        return identifiers
+        return set(FormulaCompiler.get(formula).identifiers)
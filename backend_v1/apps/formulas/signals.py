@@ -0,0 +1,16 @@
+"""
+formulas.signals
+~~~~~~~~~~~~~~~~
+
+Keeps the compiled formula cache in step with stored formulas.
+
+- Connected to Formula ``post_save`` / ``post_delete`` in `apps.py`.
+- Drops every compiled entry for the formula's identifier so the next
+  evaluation recompiles from the current expression.
+"""
+
+from formulas.services.formula_compiler import FormulaCompiler
+
+
+def invalidate_compiled_formula(sender, instance, **kwargs):
+    FormulaCompiler.invalidate(instance.identifier)
@@ -4,8 +4,10 @@ from decimal import Decimal
 from django.core.exceptions import ValidationError
 from django.test import SimpleTestCase
 
+from formulas.services.formula_compiler import FormulaCompiler
 from formulas.services.formula_evaluator import FormulaEvaluator
 from formulas.services.formula_resolver import FormulaResolver
+from formulas.services.vector_evaluator import VectorFormulaEvaluator, VectorMode
 from formulas.services.system_registry import SystemFormulaRegistry
 
 
@@ -53,6 +55,80 @@ class FormulaEvaluatorTests(SimpleTestCase):
             FormulaEvaluator.evaluate(formula=formula, context={})
 
 
+class FormulaCompilerTests(SimpleTestCase):
+    def setUp(self):
+        FormulaCompiler.invalidate()
+
+    def test_compiled_formula_is_reused_until_invalidated(self):
+        formula = DummyFormula(
+            identifier="market_value",
+            expression="quantity * price",
+            dependencies=["quantity", "price"],
+        )
+        compiled = FormulaCompiler.get(formula)
+
+        self.assertIs(FormulaCompiler.get(formula), compiled)
+        self.assertEqual(compiled.identifiers, frozenset({"quantity", "price"}))
+        self.assertEqual(
+            FormulaResolver.required_identifiers(formula),
+            {"quantity", "price"},
+        )
+
+        formula.expression = "quantity * price * 2"
+        self.assertIsNot(FormulaCompiler.get(formula), compiled)
+
+        FormulaCompiler.invalidate("market_value")
+        self.assertEqual(FormulaCompiler.cache_info()["size"], 0)
+
+    def test_compiled_formula_matches_evaluator_semantics(self):
+        compiled = FormulaCompiler.compile(
+            identifier="gain_pct",
+            expression="-(value - cost) / cost * 100 + 2 ** 2",
+            decimal_places=3,
+        )
+        self.assertEqual(
+            compiled.evaluate({"value": Decimal("90"), "cost": "80"}),
+            Decimal("-8.500"),
+        )
+        with self.assertRaises(ValidationError):
+            compiled.evaluate({"value": Decimal("1"), "cost": Decimal("0")})
+        with self.assertRaises(ValidationError):
+            compiled.evaluate({"value": Decimal("1")})
+
+
+class VectorFormulaEvaluatorTests(SimpleTestCase):
+    def setUp(self):
+        self.compiled = FormulaCompiler.compile(
+            identifier="current_value",
+            expression="quantity * price / fx_rate",
+            decimal_places=2,
+        )
+        self.columns = {
+            "quantity": [Decimal("2"), None, "3", Decimal("1")],
+            "price": [Decimal("10.125"), Decimal("5"), Decimal("4"), Decimal("1")],
+            "fx_rate": [Decimal("1"), Decimal("1"), Decimal("2"), Decimal("0")],
+        }
+
+    def test_exact_mode_matches_scalar_evaluator(self):
+        result = VectorFormulaEvaluator.evaluate(
+            compiled=self.compiled,
+            columns=self.columns,
+            size=4,
+        )
+        self.assertEqual(list(result), [Decimal("20.25"), None, Decimal("6.00"), None])
+
+    def test_missing_inputs_follow_dependency_policy(self):
+        result = VectorFormulaEvaluator.evaluate(
+            compiled=self.compiled,
+            columns=self.columns,
+            size=4,
+            mode=VectorMode.FLOAT,
+            dependency_policy="auto_expand",
+        )
+        self.assertEqual(result[:3].tolist(), [20.25, 0.0, 6.0])
+        self.assertNotEqual(result[3], result[3])
+
+
 class FormulaResolverTests(SimpleTestCase):
     def test_resolve_inputs_missing_dependency_strict(self):
         formula = DummyFormula(
@@ -47,3 +47,23 @@ class SchemaColumnAssetBehaviourAdmin(admin.ModelAdmin):
                     "formula_identifier", "is_override")
     list_filter = ("asset_type", "source", "is_override")
     search_fields = ("column__identifier", "formula_identifier")
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        SchemaMutationService.update_column(column=obj.column, changed_fields=[])
+
+    def delete_model(self, request, obj):
+        column = obj.column
+        super().delete_model(request, obj)
+        SchemaMutationService.update_column(column=column, changed_fields=[])
+
+    def delete_queryset(self, request, queryset):
+        # With no changed fields update_column just bumps the schema version
+        # and recomputes, so one column per affected schema is enough.
+        columns = {
+            behaviour.column.schema_id: behaviour.column
+            for behaviour in queryset.select_related("column__schema")
+        }
+        super().delete_queryset(request, queryset)
+        for column in columns.values():
+            SchemaMutationService.update_column(column=column, changed_fields=[])
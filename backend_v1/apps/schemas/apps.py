@@ -1,6 +1,19 @@
-from django.apps import AppConfig
+from django.apps import AppConfig, apps
+from django.db.models.signals import post_delete, post_save
 
 
 class SchemasConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = 'schemas'
+
+    def ready(self):
+        from .signals import formula_changed, formula_definition_changed
+
+        if not apps.is_installed("formulas"):
+            return
+
+        Formula = apps.get_model("formulas", "Formula")
+        FormulaDefinition = apps.get_model("formulas", "FormulaDefinition")
+        post_save.connect(formula_changed, sender=Formula)
+        post_save.connect(formula_definition_changed, sender=FormulaDefinition)
+        post_delete.connect(formula_definition_changed, sender=FormulaDefinition)
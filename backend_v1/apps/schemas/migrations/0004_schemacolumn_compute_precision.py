@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-17 01:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schemas', '0003_cleanup_asset_type_scoped_schemas'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='schemacolumn',
+            name='compute_precision',
+            field=models.CharField(choices=[('exact', 'Exact (Decimal)'), ('float', 'Fast (float64)')], default='exact', help_text="Arithmetic used when this column's formula is evaluated across holdings.", max_length=10),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-17 01:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schemas', '0004_schemacolumn_compute_precision'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='schema',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Bumped on structural changes; keys the cached compute plan.'),
+        ),
+    ]
@@ -31,6 +31,12 @@ class Schema(models.Model):
         blank=True,
     )
 
+    version = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Bumped on structural changes; keys the cached compute plan.",
+    )
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
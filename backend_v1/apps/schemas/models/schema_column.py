@@ -10,6 +10,10 @@ class SchemaColumn(models.Model):
     Concrete column inside a schema.
     """
 
+    class ComputePrecision(models.TextChoices):
+        EXACT = "exact", "Exact (Decimal)"
+        FLOAT = "float", "Fast (float64)"
+
     schema = models.ForeignKey(
         Schema,
         on_delete=models.CASCADE,
@@ -39,6 +43,13 @@ class SchemaColumn(models.Model):
 
     display_order = models.PositiveIntegerField(default=0)
 
+    compute_precision = models.CharField(
+        max_length=10,
+        choices=ComputePrecision.choices,
+        default=ComputePrecision.EXACT,
+        help_text="Arithmetic used when this column's formula is evaluated across holdings.",
+    )
+
     class Meta:
         unique_together = ("schema", "identifier")
         ordering = ["display_order", "id"]
@@ -4,6 +4,7 @@ from .bootstrap import SchemaBootstrapService
 from .mutations import SchemaMutationService
 from .queries import SchemaQueryService
 from .maintenance import SchemaMaintenanceService
+from .plan import SchemaInput, SchemaPlan, SchemaPlanService
 from .formula_bridge import (
     evaluate_formula,
     formula_dependencies,
@@ -20,6 +21,9 @@ __all__ = [
     "SchemaMutationService",
     "SchemaQueryService",
     "SchemaMaintenanceService",
+    "SchemaInput",
+    "SchemaPlan",
+    "SchemaPlanService",
     "is_formulas_available",
     "is_implicit_identifier",
     "resolve_formula_definition",
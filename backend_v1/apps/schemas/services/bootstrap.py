@@ -20,6 +20,7 @@ from schemas.services.formula_bridge import (
     formula_dependencies,
     is_implicit_identifier,
 )
+from schemas.services.plan import SchemaPlanService
 from assets.models.core import AssetType
 
 
@@ -219,6 +220,7 @@ class SchemaBootstrapService:
             column=column,
             overrides=template_column.constraint_overrides or {},
         )
+        SchemaPlanService.bump_version(schema)
         SchemaBootstrapService.ensure_scvs_for_column(column)
 
         from schemas.services.mutations import SchemaMutationService
@@ -1,18 +1,40 @@
 from __future__ import annotations
 
-from collections import defaultdict, deque
+from collections import defaultdict
 from decimal import Decimal
-from typing import Any
+from typing import Any, Iterable
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import prefetch_related_objects
+from django.utils import timezone
 
 from fx.models.fx import FXCurrency, FXRate
 from schemas.models import Schema, SchemaColumnValue
 from schemas.services.formula_bridge import (
     evaluate_formula,
-    formula_dependencies,
+    evaluate_formula_vector,
     is_implicit_identifier,
-    resolve_formula_definition,
+    is_vector_evaluation_available,
     resolve_inputs,
 )
+from schemas.services.plan import SchemaPlan, SchemaPlanService
+
+
+# Relations the engine reads per holding: the valuation currency, the asset
+# price and every reverse one-to-one Asset.extension can resolve to, with its
+# currency. Prefetching them turns per-holding lazy loads into one query each.
+HOLDING_PREFETCH = (
+    "account__portfolio__profile__currency",
+    "asset__asset_type",
+    "asset__price",
+    "asset__equity__currency",
+    "asset__crypto__currency",
+    "asset__commodity__currency",
+    "asset__precious_metal__commodity__currency",
+    "asset__real_estate__currency",
+    "asset__custom__currency",
+)
 
 
 class SchemaEngine:
@@ -25,11 +47,16 @@ class SchemaEngine:
     - Preserve valid user overrides
     - Revert invalid enum overrides
     - Execute formula columns with dependency-aware ordering
+    - Batch recompute many holdings with one load and one write pass
+    - Reuse the cached SchemaPlan instead of re-planning per sync
+    - Evaluate formula columns column-wise across holdings when numpy is available
     """
 
+    BULK_BATCH_SIZE = 500
+
     def __init__(self, schema: Schema):
         self.schema = schema
-        self._columns_cache = None
+        self._plan = None
 
     @classmethod
     def for_account(cls, account) -> "SchemaEngine":
@@ -45,28 +72,146 @@ class SchemaEngine:
             raise ValueError(f"No active schema for holding '{holding}'.")
         return cls(schema)
 
+    @property
+    def plan(self) -> SchemaPlan:
+        if self._plan is None:
+            self._plan = SchemaPlanService.get(self.schema)
+        return self._plan
+
     @property
     def columns(self):
-        if self._columns_cache is None:
-            self._columns_cache = list(
-                self.schema.columns.prefetch_related(
-                    "asset_behaviors", "constraints")
-            )
-        return self._columns_cache
+        return list(self.plan.columns)
 
     def sync_scvs_for_holding(self, holding) -> None:
-        ordered_columns = self._topologically_ordered_columns()
-
+        self.sync_scvs_for_holdings([holding])
+
+    def sync_scvs_for_holdings(self, holdings: Iterable, *, identifiers: set[str] | None = None) -> None:
+        """
+        Recompute SCVs for many holdings of this schema.
+
+        Behaviours, constraints, formula definitions, existing SCVs and FX
+        rates are loaded once; columns are computed in topological order in
+        memory and only values that actually changed are written back.
+
+        ``identifiers`` limits the pass to those columns (see
+        SchemaPlan.columns_for_inputs); other columns keep their stored
+        values, except where a holding has no SCV for them yet.
+        """
+        holdings = [holding for holding in holdings if holding is not None]
+        if not holdings:
+            return
+        prefetch_related_objects(holdings, *HOLDING_PREFETCH)
+
+        all_columns = self._topologically_ordered_columns()
+        existing = self._existing_scvs(holdings)
+        ordered_columns = all_columns
+        if identifiers is not None:
+            ordered_columns = [
+                column
+                for column in all_columns
+                if column.identifier in identifiers
+                or any((holding.pk, column.pk) not in existing for holding in holdings)
+            ]
+            if not ordered_columns:
+                return
+
+        fx_rates = self._fx_rates_for(holdings)
+        caches = {"enum_allowed": {}}
+
+        vectorize = is_vector_evaluation_available()
+        values = {
+            holding.pk: {
+                column.identifier: existing[(holding.pk, column.pk)].value
+                for column in all_columns
+                if (holding.pk, column.pk) in existing
+            }
+            for holding in holdings
+        }
+
+        to_create: list[SchemaColumnValue] = []
+        to_update: list[SchemaColumnValue] = []
+        tracked: list[tuple[SchemaColumnValue, bool, tuple]] = []
+
+        # Column-major: every holding's value for a column is known before
+        # any dependent column is computed, so formula columns can be
+        # evaluated for all holdings sharing a definition in one call.
         for column in ordered_columns:
-            scv, _ = SchemaColumnValue.objects.get_or_create(
-                column=column,
-                holding=holding,
-                defaults={
-                    "value": None,
-                    "source": SchemaColumnValue.Source.SYSTEM,
-                },
-            )
-            self._recompute_scv(scv, column)
+            batches = defaultdict(list)
+            for holding in holdings:
+                scv = existing.get((holding.pk, column.pk))
+                created = scv is None
+                if created:
+                    scv = SchemaColumnValue(
+                        column=column,
+                        holding=holding,
+                        value=None,
+                        source=SchemaColumnValue.Source.SYSTEM,
+                    )
+                tracked.append((scv, created, (scv.value, scv.source)))
+
+                self._revert_invalid_override(scv, column, caches=caches)
+                behavior = self._vector_behavior_for(column, holding, scv) if vectorize else None
+                if behavior is not None:
+                    batches[(behavior.formula_identifier, behavior.asset_type_id)].append(
+                        (holding, scv, behavior)
+                    )
+                    continue
+
+                self._recompute_scv(
+                    scv,
+                    column,
+                    holding=holding,
+                    values=values[holding.pk],
+                    fx_rates=fx_rates,
+                    caches=caches,
+                )
+                values[holding.pk][column.identifier] = scv.value
+
+            for rows in batches.values():
+                self._recompute_formula_batch(
+                    column,
+                    rows,
+                    values=values,
+                    fx_rates=fx_rates,
+                    caches=caches,
+                )
+
+        for scv, created, before in tracked:
+            if created:
+                to_create.append(scv)
+            elif (scv.value, scv.source) != before:
+                to_update.append(scv)
+
+        self._persist(to_create=to_create, to_update=to_update)
+
+    def _existing_scvs(self, holdings) -> dict[tuple[int, int], SchemaColumnValue]:
+        scvs = SchemaColumnValue.objects.filter(
+            holding_id__in=[holding.pk for holding in holdings],
+            column__schema=self.schema,
+        )
+        return {(scv.holding_id, scv.column_id): scv for scv in scvs}
+
+    def _persist(self, *, to_create, to_update) -> None:
+        if not to_create and not to_update:
+            return
+
+        now = timezone.now()
+        for scv in to_update:
+            # bulk_update does not apply auto_now.
+            scv.updated_at = now
+
+        with transaction.atomic():
+            if to_create:
+                SchemaColumnValue.objects.bulk_create(
+                    to_create,
+                    batch_size=self.BULK_BATCH_SIZE,
+                )
+            if to_update:
+                SchemaColumnValue.objects.bulk_update(
+                    to_update,
+                    ["value", "source", "updated_at"],
+                    batch_size=self.BULK_BATCH_SIZE,
+                )
 
     def resequence(self) -> None:
         for i, col in enumerate(
@@ -76,25 +221,24 @@ class SchemaEngine:
             if col.display_order != i:
                 col.display_order = i
                 col.save(update_fields=["display_order"])
+        # Display order breaks ties in the plan's column order.
+        SchemaPlanService.bump_version(self.schema)
+        self._plan = None
 
     # ---------------------------------------------------------
     # Core recompute
     # ---------------------------------------------------------
 
-    def _recompute_scv(self, scv: SchemaColumnValue, column) -> None:
-        # 0) If user override is now invalid enum, revert it then continue recompute.
+    def _revert_invalid_override(self, scv: SchemaColumnValue, column, *, caches) -> None:
         if scv.source == SchemaColumnValue.Source.USER:
-            enum_constraint = column.constraints.filter(name="enum").first()
-            if enum_constraint:
-                allowed = self._resolve_enum_allowed_values(
-                    enum_constraint,
-                    column=column,
-                    holding=scv.holding,
-                )
-                if allowed and scv.value not in allowed:
-                    scv.value = None
-                    scv.source = SchemaColumnValue.Source.SYSTEM
-                    scv.save(update_fields=["value", "source"])
+            allowed = self._enum_allowed_for(column, caches=caches)
+            if allowed and scv.value not in allowed:
+                scv.value = None
+                scv.source = SchemaColumnValue.Source.SYSTEM
+
+    def _recompute_scv(self, scv: SchemaColumnValue, column, *, holding, values, fx_rates, caches) -> None:
+        # 0) If user override is now invalid enum, revert it then continue recompute.
+        self._revert_invalid_override(scv, column, caches=caches)
 
         # 1) Respect valid user overrides.
         if scv.source == SchemaColumnValue.Source.USER:
@@ -102,24 +246,46 @@ class SchemaEngine:
 
         # 2) Compute fresh value.
         raw_value, computed_source = self._compute_raw_value_and_source(
-            scv, column)
+            column,
+            holding=holding,
+            values=values,
+            fx_rates=fx_rates,
+            caches=caches,
+        )
 
         scv.value = self._serialize_value(raw_value)
         scv.source = computed_source
-        scv.save(update_fields=["value", "source"])
 
-    def _compute_raw_value_and_source(self, scv: SchemaColumnValue, column):
-        holding = scv.holding
+    def _enum_allowed_for(self, column, *, caches) -> list[str]:
+        cache = caches["enum_allowed"]
+        if column.pk not in cache:
+            enum_constraint = self.plan.enum_constraints.get(column.pk)
+            cache[column.pk] = (
+                self._resolve_enum_allowed_values(enum_constraint, column=column)
+                if enum_constraint
+                else []
+            )
+        return cache[column.pk]
+
+    def _behavior_for(self, column, asset_type):
+        return self.plan.behavior_for(column, asset_type)
+
+    def _compute_raw_value_and_source(self, column, *, holding, values, fx_rates, caches):
         asset = holding.asset if holding else None
         asset_type = asset.asset_type if asset else None
 
-        behavior = column.behavior_for(asset_type) if asset_type else None
+        behavior = self._behavior_for(column, asset_type) if asset_type else None
         if not behavior:
             return None, SchemaColumnValue.Source.SYSTEM
 
         if behavior.source == "formula":
             result = self._compute_formula_raw_value(
-                scv=scv, behavior=behavior)
+                holding=holding,
+                behavior=behavior,
+                values=values,
+                fx_rates=fx_rates,
+                caches=caches,
+            )
             return result, SchemaColumnValue.Source.FORMULA
 
         if behavior.source == "holding" and behavior.source_field:
@@ -137,14 +303,14 @@ class SchemaEngine:
     # Formula execution
     # ---------------------------------------------------------
 
-    def _compute_formula_raw_value(self, *, scv: SchemaColumnValue, behavior):
+    def _definition_for(self, behavior):
+        return self.plan.definition_for(behavior)
+
+    def _compute_formula_raw_value(self, *, holding, behavior, values, fx_rates, caches):
         if not behavior.formula_identifier:
             return None
 
-        definition = resolve_formula_definition(
-            identifier=behavior.formula_identifier,
-            asset_type=behavior.asset_type,
-        )
+        definition = self._definition_for(behavior)
         if not definition:
             return None
 
@@ -152,15 +318,22 @@ class SchemaEngine:
 
         context = self._build_formula_context(
             formula=formula,
-            holding=scv.holding,
+            holding=holding,
+            values=values,
+            fx_rates=fx_rates,
         )
 
-        resolved = resolve_inputs(
-            formula=formula,
-            context=context,
-            allow_missing=(definition.dependency_policy == "auto_expand"),
-            default_missing=Decimal("0"),
-        )
+        # A holding missing a strict dependency yields None, as in the vector
+        # path, instead of aborting the whole batch.
+        try:
+            resolved = resolve_inputs(
+                formula=formula,
+                context=context,
+                allow_missing=(definition.dependency_policy == "auto_expand"),
+                default_missing=Decimal("0"),
+            )
+        except ValidationError:
+            return None
 
         try:
             result = evaluate_formula(
@@ -178,24 +351,77 @@ class SchemaEngine:
         except Exception:
             return None
 
-    def _build_formula_context(self, *, formula, holding) -> dict[str, Decimal]:
-        context: dict[str, Decimal] = {}
+    def _vector_behavior_for(self, column, holding, scv: SchemaColumnValue):
+        if scv.source == SchemaColumnValue.Source.USER:
+            return None
+        asset = holding.asset if holding else None
+        asset_type = asset.asset_type if asset else None
+        behavior = self._behavior_for(column, asset_type) if asset_type else None
+        if not behavior or behavior.source != "formula" or not behavior.formula_identifier:
+            return None
+        return behavior
+
+    def _recompute_formula_batch(self, column, rows, *, values, fx_rates, caches) -> None:
+        holdings = [holding for holding, _, _ in rows]
+        results = self._evaluate_formula_batch(
+            column,
+            definition=self._definition_for(rows[0][2]),
+            holdings=holdings,
+            values=values,
+            fx_rates=fx_rates,
+        )
 
-        # Pull already-computed SCVs for this holding in this schema.
-        scvs = (
-            SchemaColumnValue.objects.filter(
-                holding=holding,
-                column__schema=self.schema,
+        for (holding, scv, _), raw_value in zip(rows, results):
+            scv.value = self._serialize_value(raw_value)
+            scv.source = SchemaColumnValue.Source.FORMULA
+            values[holding.pk][column.identifier] = scv.value
+
+    def _evaluate_formula_batch(self, column, *, definition, holdings, values, fx_rates) -> list[Decimal | None]:
+        if not definition:
+            return [None] * len(holdings)
+
+        formula = definition.formula
+        inputs: dict[str, list[Any]] = {}
+        for identifier in formula.dependencies:
+            if identifier == "fx_rate":
+                inputs[identifier] = [self._resolve_fx_rate(holding, fx_rates=fx_rates) for holding in holdings]
+            elif not is_implicit_identifier(identifier):
+                inputs[identifier] = [values[holding.pk].get(identifier) for holding in holdings]
+
+        try:
+            results = evaluate_formula_vector(
+                formula=formula,
+                columns=inputs,
+                size=len(holdings),
+                mode=column.compute_precision,
+                dependency_policy=definition.dependency_policy,
+                default_missing=Decimal("0"),
             )
-            .select_related("column")
-        )
-        scv_by_identifier = {scv.column.identifier: scv.value for scv in scvs}
+        except Exception:
+            return [None] * len(holdings)
 
+        return [self._vector_result(value) for value in results]
+
+    @staticmethod
+    def _vector_result(value) -> Decimal | None:
+        if value is None:
+            return None
+        if isinstance(value, Decimal):
+            return value
+        value = float(value)
+        if value != value:
+            return None
+        return Decimal(str(value))
+
+    def _build_formula_context(self, *, formula, holding, values, fx_rates) -> dict[str, Decimal]:
+        context: dict[str, Decimal] = {}
+
+        # ``values`` holds this holding's SCVs, already recomputed up to this column.
         for identifier in formula.dependencies:
             if is_implicit_identifier(identifier):
                 continue
 
-            raw = scv_by_identifier.get(identifier)
+            raw = values.get(identifier)
             if raw in (None, "", "None"):
                 continue
 
@@ -206,14 +432,15 @@ class SchemaEngine:
                 continue
 
         if "fx_rate" in formula.dependencies:
-            context["fx_rate"] = self._resolve_fx_rate(holding)
+            context["fx_rate"] = self._resolve_fx_rate(holding, fx_rates=fx_rates)
 
         return context
 
-    def _resolve_fx_rate(self, holding) -> Decimal:
+    @staticmethod
+    def _currency_pair(holding) -> tuple[str | None, str | None]:
         asset = getattr(holding, "asset", None)
         if not asset:
-            return Decimal("1")
+            return None, None
 
         extension = getattr(asset, "extension", None)
         asset_currency = getattr(
@@ -223,7 +450,32 @@ class SchemaEngine:
             "currency",
             None,
         )
-        profile_currency_code = getattr(profile_currency, "code", None)
+        return asset_currency, getattr(profile_currency, "code", None)
+
+    def _fx_rates_for(self, holdings) -> dict[tuple[str, str], Decimal]:
+        pairs = set()
+        for holding in holdings:
+            asset_currency, profile_currency_code = self._currency_pair(holding)
+            if asset_currency and profile_currency_code and asset_currency != profile_currency_code:
+                pairs.add((asset_currency, profile_currency_code))
+        if not pairs:
+            return {}
+
+        rates: dict[tuple[str, str], Decimal] = {}
+        for from_code, to_code, rate in (
+            FXRate.objects.filter(
+                from_currency__code__in={pair[0] for pair in pairs},
+                to_currency__code__in={pair[1] for pair in pairs},
+            )
+            .order_by("-updated_at")
+            .values_list("from_currency__code", "to_currency__code", "rate")
+        ):
+            if (from_code, to_code) in pairs:
+                rates.setdefault((from_code, to_code), Decimal(str(rate)))
+        return rates
+
+    def _resolve_fx_rate(self, holding, *, fx_rates) -> Decimal:
+        asset_currency, profile_currency_code = self._currency_pair(holding)
 
         if not asset_currency or not profile_currency_code:
             return Decimal("1")
@@ -231,82 +483,14 @@ class SchemaEngine:
         if asset_currency == profile_currency_code:
             return Decimal("1")
 
-        fx = (
-            FXRate.objects.filter(
-                from_currency__code=asset_currency,
-                to_currency__code=profile_currency_code,
-            )
-            .order_by("-updated_at")
-            .first()
-        )
-        if not fx:
-            return Decimal("1")
-
-        return Decimal(str(fx.rate))
+        return fx_rates.get((asset_currency, profile_currency_code), Decimal("1"))
 
     # ---------------------------------------------------------
     # Dependency ordering
     # ---------------------------------------------------------
 
     def _topologically_ordered_columns(self):
-        columns = self.columns
-        index = {c.identifier: i for i, c in enumerate(columns)}
-        by_identifier = {c.identifier: c for c in columns}
-
-        indegree = {c.identifier: 0 for c in columns}
-        graph = defaultdict(set)
-
-        for column in columns:
-            behaviors = list(column.asset_behaviors.select_related(
-                "asset_type"))
-            for behavior in behaviors:
-                if behavior.source != "formula" or not behavior.formula_identifier:
-                    continue
-
-                deps = formula_dependencies(
-                    identifier=behavior.formula_identifier,
-                    asset_type=behavior.asset_type,
-                )
-                for dep in deps:
-                    if is_implicit_identifier(dep):
-                        continue
-                    if dep not in by_identifier:
-                        continue
-                    # dep -> column
-                    if column.identifier not in graph[dep]:
-                        graph[dep].add(column.identifier)
-                        indegree[column.identifier] += 1
-
-        queue = deque(
-            sorted(
-                [identifier for identifier, deg in indegree.items() if deg == 0],
-                key=lambda ident: (
-                    by_identifier[ident].display_order, index[ident]),
-            )
-        )
-
-        ordered_ids = []
-        while queue:
-            ident = queue.popleft()
-            ordered_ids.append(ident)
-
-            for nxt in sorted(
-                graph.get(ident, set()),
-                key=lambda x: (by_identifier[x].display_order, index[x]),
-            ):
-                indegree[nxt] -= 1
-                if indegree[nxt] == 0:
-                    queue.append(nxt)
-
-        # Cycle fallback: keep deterministic order.
-        if len(ordered_ids) != len(columns):
-            remaining = [
-                c.identifier for c in sorted(columns, key=lambda c: (c.display_order, c.id))
-                if c.identifier not in set(ordered_ids)
-            ]
-            ordered_ids.extend(remaining)
-
-        return [by_identifier[i] for i in ordered_ids]
+        return list(self.plan.columns)
 
     # ---------------------------------------------------------
     # Helpers
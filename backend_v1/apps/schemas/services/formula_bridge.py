@@ -102,3 +102,35 @@ def evaluate_formula(*, formula, context: dict[str, Decimal]) -> Decimal:
     except Exception as exc:
         raise ValidationError("Formula evaluator is unavailable.") from exc
     return FormulaEvaluator.evaluate(formula=formula, context=context)
+
+
+def is_vector_evaluation_available() -> bool:
+    try:
+        from formulas.services.vector_evaluator import VectorFormulaEvaluator  # noqa: F401
+    except Exception:
+        return False
+    return True
+
+
+def evaluate_formula_vector(
+    *,
+    formula,
+    columns: dict[str, list[Any]],
+    size: int,
+    mode: str,
+    dependency_policy: str,
+    default_missing: Decimal | int | float = Decimal("0"),
+):
+    try:
+        from formulas.services.formula_compiler import FormulaCompiler
+        from formulas.services.vector_evaluator import VectorFormulaEvaluator
+    except Exception as exc:
+        raise ValidationError("Vector formula evaluator is unavailable.") from exc
+    return VectorFormulaEvaluator.evaluate(
+        compiled=FormulaCompiler.get(formula),
+        columns=columns,
+        size=size,
+        mode=mode,
+        dependency_policy=dependency_policy,
+        default_missing=default_missing,
+    )
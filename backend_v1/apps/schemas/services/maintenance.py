@@ -6,6 +6,7 @@ from django.db import transaction
 from schemas.models import SchemaColumn, SchemaColumnTemplate
 from schemas.policies.default_schema_policy import DefaultSchemaPolicy
 from schemas.services.engine import SchemaEngine
+from schemas.services.plan import SchemaPlanService
 
 
 class SchemaMaintenanceService:
@@ -28,6 +29,7 @@ class SchemaMaintenanceService:
         )
 
         SchemaColumn.objects.filter(schema=schema).delete()
+        SchemaPlanService.bump_version(schema)
 
         if not identifiers:
             SchemaOrchestrationService.schema_changed(schema)
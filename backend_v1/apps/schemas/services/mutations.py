@@ -15,6 +15,7 @@ from schemas.models import (
 )
 from schemas.models.account_column_visibility import AccountColumnVisibility
 from schemas.policies.schema_column_deletion_policy import SchemaColumnDeletionPolicy
+from schemas.services.plan import SchemaPlanService
 from schemas.services.queries import SchemaQueryService
 
 
@@ -82,6 +83,7 @@ class SchemaMutationService:
         SchemaBootstrapService.ensure_scvs_for_column(column)
         SchemaMutationService.initialize_visibility_for_schema_column(
             column=column)
+        SchemaPlanService.bump_version(schema)
         SchemaOrchestrationService.schema_changed(schema)
 
         return column
@@ -97,6 +99,7 @@ class SchemaMutationService:
                 source=SchemaColumnValue.Source.USER,
             ).update(value=None, source=SchemaColumnValue.Source.SYSTEM)
 
+        SchemaPlanService.bump_version(column.schema)
         SchemaOrchestrationService.schema_changed(column.schema)
         return column
 
@@ -108,6 +111,7 @@ class SchemaMutationService:
         SchemaColumnDeletionPolicy.assert_deletable(column=column)
         schema = column.schema
         column.delete()
+        SchemaPlanService.bump_version(schema)
         SchemaOrchestrationService.schema_changed(schema)
 
     @staticmethod
@@ -144,6 +148,7 @@ class SchemaMutationService:
 
         constraint.full_clean()
         constraint.save()
+        SchemaPlanService.bump_version(constraint.column.schema)
         SchemaOrchestrationService.schema_changed(constraint.column.schema)
         return constraint
 
@@ -181,7 +186,7 @@ class SchemaMutationService:
             scv.source = SchemaColumnValue.Source.USER
             scv.save(update_fields=["value", "source"])
 
-        SchemaOrchestrationService.holding_changed(holding)
+        SchemaOrchestrationService.holding_changed(holding, inputs=(column.identifier,))
         return scv
 
     @staticmethod
@@ -197,7 +202,10 @@ class SchemaMutationService:
         scv.save(update_fields=["value", "source"])
 
         if scv.holding:
-            SchemaOrchestrationService.holding_changed(scv.holding)
+            SchemaOrchestrationService.holding_changed(
+                scv.holding,
+                inputs=(scv.column.identifier,),
+            )
 
         return scv
 
@@ -1,47 +1,207 @@
 from __future__ import annotations
 
+import logging
+import threading
+from collections import defaultdict
 from collections.abc import Iterable
+from contextlib import contextmanager
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
 
 from accounts.models import Holding
 from schemas.services.engine import SchemaEngine
+from schemas.services.plan import SchemaInput
+
+
+logger = logging.getLogger(__name__)
+
+_state = threading.local()
+
+
+class DirtySet:
+    """
+    Deduplicated pending recomputes.
+
+    Maps holding / asset ids to the inputs that changed for them. ``None``
+    means "recompute everything" and absorbs any later input names.
+    """
+
+    def __init__(self):
+        self.holdings: dict[int, frozenset[str] | None] = {}
+        self.assets: dict[int, frozenset[str] | None] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.holdings or self.assets)
+
+    @staticmethod
+    def _merge(target: dict, key, inputs) -> None:
+        if key in target and target[key] is None:
+            return
+        if inputs is None:
+            target[key] = None
+            return
+        target[key] = target.get(key, frozenset()) | frozenset(inputs)
+
+    def add_holding(self, holding_id, inputs) -> None:
+        self._merge(self.holdings, holding_id, inputs)
+
+    def add_asset(self, asset_id, inputs) -> None:
+        self._merge(self.assets, asset_id, inputs)
 
 
 class SchemaOrchestrationService:
     """
     Single entrypoint for recomputation events.
+
+    Events may name the inputs that changed (SchemaInput values and/or column
+    identifiers); only those columns and their transitive dependents are
+    recomputed. Inside ``deferred()`` events are coalesced into a DirtySet
+    and flushed in batches once the block (and its transaction) completes.
     """
 
     @staticmethod
-    def _recompute_holdings(holdings: Iterable):
+    def batch_size() -> int:
+        return max(int(getattr(settings, "SCHEMA_RECOMPUTE_BATCH_SIZE", 500)), 1)
+
+    # ---------------------------------------------------------
+    # Deferral
+    # ---------------------------------------------------------
+
+    @staticmethod
+    def _pending() -> DirtySet | None:
+        return getattr(_state, "pending", None)
+
+    @staticmethod
+    @contextmanager
+    def deferred():
+        outermost = SchemaOrchestrationService._pending() is None
+        if outermost:
+            _state.pending = DirtySet()
+
+        try:
+            yield
+        except BaseException:
+            if outermost:
+                _state.pending = None
+            raise
+
+        if not outermost:
+            return
+
+        dirty, _state.pending = _state.pending, None
+        if not dirty:
+            return
+
+        # Recompute after the surrounding transaction commits so the sync
+        # itself stays short; each flushed batch writes in its own transaction.
+        transaction.on_commit(lambda: SchemaOrchestrationService.flush(dirty))
+
+    @staticmethod
+    def flush(dirty: DirtySet) -> None:
+        holdings = dict(dirty.holdings)
+        if dirty.assets:
+            for holding_id, asset_id in Holding.objects.filter(
+                asset_id__in=list(dirty.assets),
+            ).values_list("id", "asset_id"):
+                DirtySet._merge(holdings, holding_id, dirty.assets[asset_id])
+
+        by_inputs = defaultdict(list)
+        for holding_id, inputs in holdings.items():
+            by_inputs[inputs].append(holding_id)
+
+        batch_size = SchemaOrchestrationService.batch_size()
+        for inputs, holding_ids in by_inputs.items():
+            iterator = iter(holding_ids)
+            while chunk := list(islice(iterator, batch_size)):
+                # Runs from on_commit, so a failing batch must not skip the rest.
+                try:
+                    with transaction.atomic():
+                        SchemaOrchestrationService._recompute_holdings(
+                            SchemaOrchestrationService._load_holdings(chunk),
+                            inputs=inputs,
+                        )
+                except Exception:
+                    logger.exception(
+                        "Schema recompute failed for %d holdings (inputs=%s).",
+                        len(chunk),
+                        sorted(inputs) if inputs is not None else "all",
+                    )
+
+    @staticmethod
+    def _load_holdings(holding_ids):
+        return Holding.objects.filter(pk__in=holding_ids).select_related(
+            "account__portfolio__profile__currency",
+            "asset__asset_type",
+        )
+
+    # ---------------------------------------------------------
+    # Recompute
+    # ---------------------------------------------------------
+
+    @staticmethod
+    def _recompute_holdings(holdings: Iterable, *, inputs=None):
+        schemas = {}
+        resolved = {}
+        grouped = defaultdict(list)
         for holding in holdings:
-            schema = getattr(holding, "active_schema", None)
+            # Holdings in one account with the same asset type share a schema.
+            key = (holding.account_id, holding.asset.asset_type_id if holding.asset_id else None)
+            if key not in resolved:
+                resolved[key] = getattr(holding, "active_schema", None)
+            schema = resolved[key]
             if not schema:
                 continue
 
-            engine = SchemaEngine(schema)
-            engine.sync_scvs_for_holding(holding)
+            schemas.setdefault(schema.pk, schema)
+            grouped[schema.pk].append(holding)
+
+        for schema_id, schema_holdings in grouped.items():
+            engine = SchemaEngine(schemas[schema_id])
+            engine.sync_scvs_for_holdings(
+                schema_holdings,
+                identifiers=engine.plan.columns_for_inputs(inputs),
+            )
+
+    # ---------------------------------------------------------
+    # Events
+    # ---------------------------------------------------------
 
     @staticmethod
-    def holding_changed(holding):
-        SchemaOrchestrationService._recompute_holdings([holding])
+    def holding_changed(holding, *, inputs=None):
+        SchemaOrchestrationService.holdings_changed([holding], inputs=inputs)
 
     @staticmethod
-    def holdings_changed(holdings: Iterable):
-        SchemaOrchestrationService._recompute_holdings(holdings)
+    def holdings_changed(holdings: Iterable, *, inputs=None):
+        pending = SchemaOrchestrationService._pending()
+        if pending is not None:
+            for holding in holdings:
+                pending.add_holding(holding.pk, inputs)
+            return
+        SchemaOrchestrationService._recompute_holdings(holdings, inputs=inputs)
 
     @staticmethod
-    def asset_changed(asset):
-        holdings = asset.holdings.select_related("account").all()
-        SchemaOrchestrationService._recompute_holdings(holdings)
+    def asset_changed(asset, *, inputs=None):
+        pending = SchemaOrchestrationService._pending()
+        if pending is not None:
+            pending.add_asset(asset.pk, inputs)
+            return
+
+        holdings = asset.holdings.select_related(
+            "account__portfolio__profile__currency",
+            "asset__asset_type",
+        ).all()
+        SchemaOrchestrationService._recompute_holdings(holdings, inputs=inputs)
 
     @staticmethod
-    def fx_changed(holdings: Iterable):
-        SchemaOrchestrationService._recompute_holdings(holdings)
+    def fx_changed(holdings: Iterable, *, inputs=(SchemaInput.FX,)):
+        SchemaOrchestrationService.holdings_changed(holdings, inputs=inputs)
 
     @staticmethod
     def schema_changed(schema):
         holdings = Holding.objects.filter(account__portfolio=schema.portfolio).select_related(
-            "account",
+            "account__portfolio__profile",
             "asset",
             "asset__asset_type",
         )
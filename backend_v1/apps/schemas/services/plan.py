@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict, defaultdict, deque
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.db.models import F, Q
+
+from schemas.models import Schema
+from schemas.services.formula_bridge import (
+    is_implicit_identifier,
+    resolve_formula_definition,
+)
+
+
+class SchemaInput:
+    """
+    Inputs a change event can name instead of (or as well as) column identifiers.
+    """
+
+    PRICE = "price"
+    FX = "fx"
+    QUANTITY = "quantity"
+    HOLDING = "holding"
+    ASSET = "asset"
+
+    SOURCES = (PRICE, QUANTITY, HOLDING, ASSET)
+
+    @classmethod
+    def matches(cls, input_name: str, behavior) -> bool:
+        source_field = behavior.source_field or ""
+        if input_name == cls.PRICE:
+            return behavior.source == "asset" and source_field.split("__")[0] == "price"
+        if input_name == cls.ASSET:
+            return behavior.source == "asset"
+        if input_name == cls.QUANTITY:
+            return behavior.source == "holding" and source_field == "quantity"
+        if input_name == cls.HOLDING:
+            return behavior.source == "holding"
+        return False
+
+
+@dataclass(frozen=True)
+class SchemaPlan:
+    """
+    Everything the engine needs to know about a schema's structure.
+
+    - ``columns``: columns in dependency (topological) order
+    - ``dependents``: identifier -> formula columns that read it
+    - ``dependencies``: formula column -> identifiers it reads
+    - ``behaviors``: (column_id, asset_type_id) -> behaviour
+    - ``definitions``: (formula_identifier, asset_type_id) -> FormulaDefinition
+    - ``enum_constraints``: column_id -> enum constraint
+    - ``implicit_dependents``: implicit input (e.g. fx_rate) -> formula columns
+    - ``source_columns``: SchemaInput source -> columns fed directly by it
+    """
+
+    schema_id: int
+    version: int
+    columns: tuple
+    dependents: dict[str, frozenset[str]]
+    dependencies: dict[str, frozenset[str]]
+    behaviors: dict[tuple[int, int], object]
+    definitions: dict[tuple[str, int], object]
+    enum_constraints: dict[int, object]
+    implicit_dependents: dict[str, frozenset[str]] = field(default_factory=dict)
+    source_columns: dict[str, frozenset[str]] = field(default_factory=dict)
+
+    @property
+    def order(self) -> list[str]:
+        return [column.identifier for column in self.columns]
+
+    def behavior_for(self, column, asset_type):
+        if asset_type is None:
+            return None
+        return self.behaviors.get((column.pk, asset_type.pk))
+
+    def definition_for(self, behavior):
+        return self.definitions.get((behavior.formula_identifier, behavior.asset_type_id))
+
+    def transitive_dependents(self, identifiers) -> set[str]:
+        """
+        Return every column identifier that (transitively) reads from
+        ``identifiers``.
+        """
+        seen: set[str] = set()
+        queue = deque(identifiers)
+        while queue:
+            for dependent in self.dependents.get(queue.popleft(), ()):
+                if dependent not in seen:
+                    seen.add(dependent)
+                    queue.append(dependent)
+        return seen
+
+    def columns_for_inputs(self, inputs) -> set[str] | None:
+        """
+        Resolve changed inputs (SchemaInput names and/or column identifiers)
+        to the columns that must be recomputed. ``None`` means everything.
+        """
+        if inputs is None:
+            return None
+
+        seeds: set[str] = set()
+        for input_name in inputs:
+            if input_name == SchemaInput.FX:
+                seeds |= self.implicit_dependents.get("fx_rate", frozenset())
+            elif input_name in SchemaInput.SOURCES:
+                seeds |= self.source_columns.get(input_name, frozenset())
+            else:
+                seeds.add(input_name)
+        return seeds | self.transitive_dependents(seeds)
+
+
+class SchemaPlanService:
+    """
+    Builds and caches SchemaPlans.
+
+    Plans are cached in-process per schema and tagged with ``Schema.version``.
+    Structural changes (columns, behaviours, constraints, formulas) bump the
+    version, so every process rebuilds its plan on next use.
+    """
+
+    _plans: OrderedDict[int, SchemaPlan] = OrderedDict()
+    _lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def max_size() -> int:
+        return max(int(getattr(settings, "SCHEMA_PLAN_CACHE_SIZE", 512)), 1)
+
+    @classmethod
+    def get(cls, schema) -> SchemaPlan:
+        version = (
+            Schema.objects.filter(pk=schema.pk).values_list("version", flat=True).first()
+            or 0
+        )
+
+        with cls._lock:
+            plan = cls._plans.get(schema.pk)
+            if plan is not None and plan.version == version:
+                cls._plans.move_to_end(schema.pk)
+                return plan
+
+        plan = cls.build(schema, version=version)
+
+        with cls._lock:
+            cls._plans[schema.pk] = plan
+            cls._plans.move_to_end(schema.pk)
+            while len(cls._plans) > cls.max_size():
+                cls._plans.popitem(last=False)
+        return plan
+
+    @classmethod
+    def bump_version(cls, schema) -> None:
+        Schema.objects.filter(pk=schema.pk).update(version=F("version") + 1)
+        with cls._lock:
+            cls._plans.pop(schema.pk, None)
+
+    @classmethod
+    def bump_for_asset_types(cls, asset_type_ids) -> None:
+        """
+        Formula edits invalidate schemas for the affected asset types, plus
+        legacy account-type schemas which may hold any asset type.
+        """
+        asset_type_ids = {pk for pk in asset_type_ids if pk is not None}
+        if not asset_type_ids:
+            return
+        Schema.objects.filter(
+            Q(asset_type_id__in=asset_type_ids) | Q(asset_type__isnull=True)
+        ).update(version=F("version") + 1)
+        cls.clear()
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._plans.clear()
+
+    # ------------------------------------------------------------------
+    # Build
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def build(schema, *, version: int = 0) -> SchemaPlan:
+        columns = list(
+            schema.columns.prefetch_related(
+                "asset_behaviors__asset_type", "constraints")
+        )
+
+        behaviors = {}
+        definitions = {}
+        enum_constraints = {}
+        dependents: dict[str, set[str]] = defaultdict(set)
+        dependencies: dict[str, set[str]] = defaultdict(set)
+        implicit_dependents: dict[str, set[str]] = defaultdict(set)
+        source_columns: dict[str, set[str]] = defaultdict(set)
+
+        for column in columns:
+            enum_constraint = next(
+                (constraint for constraint in column.constraints.all() if constraint.name == "enum"),
+                None,
+            )
+            if enum_constraint is not None:
+                enum_constraints[column.pk] = enum_constraint
+
+            for behavior in column.asset_behaviors.all():
+                behaviors[(column.pk, behavior.asset_type_id)] = behavior
+                for input_name in SchemaInput.SOURCES:
+                    if SchemaInput.matches(input_name, behavior):
+                        source_columns[input_name].add(column.identifier)
+                if behavior.source != "formula" or not behavior.formula_identifier:
+                    continue
+
+                key = (behavior.formula_identifier, behavior.asset_type_id)
+                if key not in definitions:
+                    definition = resolve_formula_definition(
+                        identifier=behavior.formula_identifier,
+                        asset_type=behavior.asset_type,
+                    )
+                    if definition is not None:
+                        # Load the formula now so cached plans never hit the DB.
+                        definition.formula
+                    definitions[key] = definition
+
+                definition = definitions[key]
+                if definition is None:
+                    continue
+                for dep in getattr(definition.formula, "dependencies", []):
+                    if is_implicit_identifier(dep):
+                        implicit_dependents[dep].add(column.identifier)
+                        continue
+                    dependents[dep].add(column.identifier)
+                    dependencies[column.identifier].add(dep)
+
+        return SchemaPlan(
+            schema_id=schema.pk,
+            version=version,
+            columns=tuple(SchemaPlanService._topological_order(columns, dependents)),
+            dependents={key: frozenset(value) for key, value in dependents.items()},
+            dependencies={key: frozenset(value) for key, value in dependencies.items()},
+            behaviors=behaviors,
+            definitions=definitions,
+            enum_constraints=enum_constraints,
+            implicit_dependents={key: frozenset(value) for key, value in implicit_dependents.items()},
+            source_columns={key: frozenset(value) for key, value in source_columns.items()},
+        )
+
+    @staticmethod
+    def _topological_order(columns, dependents) -> list:
+        index = {c.identifier: i for i, c in enumerate(columns)}
+        by_identifier = {c.identifier: c for c in columns}
+
+        indegree = {c.identifier: 0 for c in columns}
+        graph = defaultdict(set)
+        for dep, targets in dependents.items():
+            if dep not in by_identifier:
+                continue
+            for target in targets:
+                # dep -> column
+                graph[dep].add(target)
+                indegree[target] += 1
+
+        queue = deque(
+            sorted(
+                [identifier for identifier, deg in indegree.items() if deg == 0],
+                key=lambda ident: (
+                    by_identifier[ident].display_order, index[ident]),
+            )
+        )
+
+        ordered_ids = []
+        while queue:
+            ident = queue.popleft()
+            ordered_ids.append(ident)
+
+            for nxt in sorted(
+                graph.get(ident, set()),
+                key=lambda x: (by_identifier[x].display_order, index[x]),
+            ):
+                indegree[nxt] -= 1
+                if indegree[nxt] == 0:
+                    queue.append(nxt)
+
+        # Cycle fallback: keep deterministic order.
+        if len(ordered_ids) != len(columns):
+            placed = set(ordered_ids)
+            ordered_ids.extend(
+                c.identifier for c in sorted(columns, key=lambda c: (c.display_order, c.id))
+                if c.identifier not in placed
+            )
+
+        return [by_identifier[i] for i in ordered_ids]
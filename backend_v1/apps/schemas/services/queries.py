@@ -8,13 +8,9 @@ from django.db.models import Prefetch
 
 from assets.models.core import AssetType
 from fx.models.fx import FXCurrency
-from schemas.models.schema_column_asset_behaviour import SchemaColumnAssetBehaviour
 from schemas.models.schema_column_template import SchemaColumnTemplate
 from schemas.models.schema_column_template_behaviour import SchemaColumnTemplateBehaviour
-from schemas.services.formula_bridge import (
-    formula_dependencies,
-    is_implicit_identifier,
-)
+from schemas.services.plan import SchemaPlanService
 
 
 class SchemaQueryService:
@@ -37,46 +33,22 @@ class SchemaQueryService:
 
     @staticmethod
     def dependency_graph(*, schema) -> dict[str, set[str]]:
-        graph: dict[str, set[str]] = defaultdict(set)
-
-        behaviors = SchemaColumnAssetBehaviour.objects.filter(
-            column__schema=schema,
-            source="formula",
-        ).select_related("column", "asset_type")
-
-        for behavior in behaviors:
-            if not behavior.formula_identifier:
-                continue
-
-            dependent = behavior.column.identifier
-
-            deps = formula_dependencies(
-                identifier=behavior.formula_identifier,
-                asset_type=behavior.asset_type,
-            )
-
-            for dep in deps:
-                if is_implicit_identifier(dep):
-                    continue
-                graph[dep].add(dependent)
-
-        return graph
+        plan = SchemaPlanService.get(schema)
+        return defaultdict(
+            set,
+            {identifier: set(dependents) for identifier, dependents in plan.dependents.items()},
+        )
 
     # old-name compatibility
     build = dependency_graph
 
     @staticmethod
     def dependents_of(*, schema, identifier: str) -> set[str]:
-        return SchemaQueryService.dependency_graph(schema=schema).get(identifier, set())
+        return set(SchemaPlanService.get(schema).dependents.get(identifier, ()))
 
     @staticmethod
     def dependencies_of(*, schema, identifier: str) -> set[str]:
-        graph = SchemaQueryService.dependency_graph(schema=schema)
-        deps = set()
-        for src, targets in graph.items():
-            if identifier in targets:
-                deps.add(src)
-        return deps
+        return set(SchemaPlanService.get(schema).dependencies.get(identifier, ()))
 
     @staticmethod
     def is_dependency(*, schema, identifier: str) -> bool:
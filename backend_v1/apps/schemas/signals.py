@@ -0,0 +1,23 @@
+"""
+schemas.signals
+~~~~~~~~~~~~~~~
+
+Keeps cached schema plans in step with formula edits.
+
+- Connected to Formula / FormulaDefinition saves and deletes in `apps.py`
+  (only when the formulas app is installed).
+- Bumps the version of every schema that may resolve the edited
+  definition, so each process rebuilds its SchemaPlan on next use.
+"""
+
+from schemas.services.plan import SchemaPlanService
+
+
+def formula_changed(sender, instance, **kwargs):
+    SchemaPlanService.bump_for_asset_types(
+        instance.definitions.values_list("asset_type_id", flat=True)
+    )
+
+
+def formula_definition_changed(sender, instance, **kwargs):
+    SchemaPlanService.bump_for_asset_types([instance.asset_type_id])
@@ -1,7 +1,25 @@
-from django.test import SimpleTestCase
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest import mock
 
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import Account, AccountType, Holding
+from assets.models import AssetPrice, AssetType
+from assets.services import CustomAssetService
+from fx.models import Country, FXCurrency
+from portfolios.models import Portfolio
+from profiles.services import ProfileBootstrapService
+from schemas.models import Schema, SchemaColumn, SchemaColumnAssetBehaviour, SchemaColumnValue
 from schemas.policies.default_schema_policy import DefaultSchemaPolicy
+from schemas.services.engine import SchemaEngine
+from schemas.services.orchestration import DirtySet, SchemaOrchestrationService
+from schemas.services.plan import SchemaInput, SchemaPlan, SchemaPlanService
 from schemas.services.formula_bridge import is_implicit_identifier
+from subscriptions.models import Plan
+from users.models import User
 
 
 class SchemaPolicyTests(SimpleTestCase):
@@ -60,3 +78,306 @@ class SchemaPolicyTests(SimpleTestCase):
     def test_implicit_formula_identifier_registry(self):
         self.assertTrue(is_implicit_identifier("fx_rate"))
         self.assertFalse(is_implicit_identifier("quantity"))
+
+
+class SchemaEngineBulkTests(SimpleTestCase):
+    def _holding(self, asset_currency, profile_currency):
+        currency = lambda code: SimpleNamespace(code=code)
+        return SimpleNamespace(
+            asset=SimpleNamespace(extension=SimpleNamespace(currency=currency(asset_currency))),
+            account=SimpleNamespace(
+                portfolio=SimpleNamespace(profile=SimpleNamespace(currency=currency(profile_currency)))
+            ),
+        )
+
+    def test_fx_rate_is_resolved_from_the_preloaded_rate_map(self):
+        engine = SchemaEngine(schema=None)
+        fx_rates = {("USD", "CAD"): Decimal("1.35")}
+
+        self.assertEqual(engine._resolve_fx_rate(self._holding("USD", "CAD"), fx_rates=fx_rates), Decimal("1.35"))
+        self.assertEqual(engine._resolve_fx_rate(self._holding("USD", "USD"), fx_rates=fx_rates), Decimal("1"))
+        self.assertEqual(engine._resolve_fx_rate(self._holding("EUR", "CAD"), fx_rates=fx_rates), Decimal("1"))
+
+    def test_empty_holding_batches_do_not_touch_the_schema(self):
+        SchemaEngine(schema=None).sync_scvs_for_holdings([])
+
+    def test_formula_columns_are_evaluated_for_all_holdings_in_one_call(self):
+        engine = SchemaEngine(schema=None)
+        holdings = [SimpleNamespace(pk=pk, asset=None, account=None) for pk in (1, 2, 3)]
+        values = {
+            1: {"quantity": "2", "price": "10.125"},
+            2: {"quantity": "None", "price": "5"},
+            3: {"quantity": "4", "price": "1.5"},
+        }
+        definition = SimpleNamespace(
+            formula=SimpleNamespace(
+                identifier="market_value",
+                expression="quantity * price",
+                dependencies=["price", "quantity"],
+                decimal_places=2,
+            ),
+            dependency_policy="strict",
+        )
+
+        exact = engine._evaluate_formula_batch(
+            SimpleNamespace(compute_precision="exact"),
+            definition=definition,
+            holdings=holdings,
+            values=values,
+            fx_rates={},
+        )
+        fast = engine._evaluate_formula_batch(
+            SimpleNamespace(compute_precision="float"),
+            definition=definition,
+            holdings=holdings,
+            values=values,
+            fx_rates={},
+        )
+
+        self.assertEqual(exact, [Decimal("20.25"), None, Decimal("6.00")])
+        self.assertEqual(fast, [Decimal("20.25"), None, Decimal("6.0")])
+
+
+    def test_scalar_path_skips_holdings_missing_a_strict_dependency(self):
+        engine = SchemaEngine(schema=None)
+        definition = SimpleNamespace(
+            formula=SimpleNamespace(
+                identifier="market_value",
+                expression="quantity * price",
+                dependencies=["price", "quantity"],
+                decimal_places=2,
+            ),
+            dependency_policy="strict",
+        )
+        behavior = SimpleNamespace(formula_identifier="market_value")
+        values = {
+            1: {"quantity": "2", "price": "10.125"},
+            2: {"quantity": None, "price": "5"},
+            3: {"price": "5"},
+            4: {"quantity": "4", "price": "1.5"},
+        }
+
+        with mock.patch.object(SchemaEngine, "_definition_for", return_value=definition):
+            results = [
+                engine._compute_formula_raw_value(
+                    holding=SimpleNamespace(pk=pk, asset=None, account=None),
+                    behavior=behavior,
+                    values=values[pk],
+                    fx_rates={},
+                    caches={},
+                )
+                for pk in (1, 2, 3, 4)
+            ]
+
+        self.assertEqual(results, [Decimal("20.25"), None, None, Decimal("6.00")])
+
+
+class SchemaPlanTests(SimpleTestCase):
+    def _column(self, pk, identifier, display_order):
+        return SimpleNamespace(pk=pk, id=pk, identifier=identifier, display_order=display_order)
+
+    def test_plan_orders_columns_after_their_dependencies(self):
+        columns = [
+            self._column(1, "current_value", 1),
+            self._column(2, "quantity", 2),
+            self._column(3, "price", 3),
+            self._column(4, "unrealized_gain", 4),
+            self._column(5, "cost_basis", 5),
+        ]
+        dependents = {
+            "quantity": {"current_value", "cost_basis"},
+            "price": {"current_value"},
+            "current_value": {"unrealized_gain"},
+            "cost_basis": {"unrealized_gain"},
+            "not_a_column": {"price"},
+        }
+
+        ordered = SchemaPlanService._topological_order(columns, dependents)
+
+        self.assertEqual(
+            [column.identifier for column in ordered],
+            ["quantity", "price", "cost_basis", "current_value", "unrealized_gain"],
+        )
+
+    def test_transitive_dependents_follow_the_reverse_dependency_map(self):
+        plan = SchemaPlan(
+            schema_id=1,
+            version=3,
+            columns=(),
+            dependents={
+                "price": frozenset({"current_value"}),
+                "current_value": frozenset({"unrealized_gain", "unrealized_gain_pct"}),
+                "unrealized_gain": frozenset({"unrealized_gain_pct"}),
+            },
+            dependencies={},
+            behaviors={},
+            definitions={},
+            enum_constraints={},
+        )
+
+        self.assertEqual(
+            plan.transitive_dependents(["price"]),
+            {"current_value", "unrealized_gain", "unrealized_gain_pct"},
+        )
+        self.assertEqual(plan.transitive_dependents(["quantity"]), set())
+
+    def test_changed_inputs_resolve_to_their_dependent_columns(self):
+        plan = SchemaPlan(
+            schema_id=1,
+            version=1,
+            columns=(),
+            dependents={
+                "price": frozenset({"market_value"}),
+                "quantity": frozenset({"market_value", "cost_basis"}),
+                "market_value": frozenset({"current_value"}),
+            },
+            dependencies={},
+            behaviors={},
+            definitions={},
+            enum_constraints={},
+            implicit_dependents={"fx_rate": frozenset({"current_value"})},
+            source_columns={
+                SchemaInput.PRICE: frozenset({"price"}),
+                SchemaInput.HOLDING: frozenset({"quantity"}),
+            },
+        )
+
+        self.assertEqual(
+            plan.columns_for_inputs([SchemaInput.PRICE]),
+            {"price", "market_value", "current_value"},
+        )
+        self.assertEqual(plan.columns_for_inputs([SchemaInput.FX]), {"current_value"})
+        self.assertEqual(
+            plan.columns_for_inputs(["cost_basis", SchemaInput.HOLDING]),
+            {"quantity", "market_value", "cost_basis", "current_value"},
+        )
+        self.assertIsNone(plan.columns_for_inputs(None))
+
+
+class SchemaOrchestrationDeferredTests(TestCase):
+    def test_dirty_set_merges_inputs_and_full_recompute_wins(self):
+        dirty = DirtySet()
+        dirty.add_holding(1, [SchemaInput.PRICE])
+        dirty.add_holding(1, [SchemaInput.FX])
+        dirty.add_holding(2, [SchemaInput.PRICE])
+        dirty.add_holding(2, None)
+        dirty.add_holding(2, [SchemaInput.FX])
+
+        self.assertEqual(dirty.holdings, {1: frozenset({"price", "fx"}), 2: None})
+
+    def test_events_inside_deferred_block_are_flushed_once_per_input_set(self):
+        holdings = [SimpleNamespace(pk=pk) for pk in (1, 2, 3)]
+
+        with mock.patch.object(SchemaOrchestrationService, "_recompute_holdings") as recompute, \
+                mock.patch.object(SchemaOrchestrationService, "_load_holdings", side_effect=lambda ids: ids):
+            with self.captureOnCommitCallbacks(execute=True), SchemaOrchestrationService.deferred():
+                SchemaOrchestrationService.holdings_changed(holdings[:2], inputs=[SchemaInput.PRICE])
+                with SchemaOrchestrationService.deferred():
+                    SchemaOrchestrationService.holding_changed(holdings[0], inputs=[SchemaInput.PRICE])
+                    SchemaOrchestrationService.holding_changed(holdings[2])
+                recompute.assert_not_called()
+
+        self.assertEqual(
+            sorted((call.kwargs["inputs"] or frozenset(), call.args[0]) for call in recompute.call_args_list),
+            [(frozenset(), [3]), (frozenset({"price"}), [1, 2])],
+        )
+
+    @override_settings(SCHEMA_RECOMPUTE_BATCH_SIZE=1)
+    def test_a_failing_batch_does_not_skip_the_remaining_batches(self):
+        dirty = DirtySet()
+        for pk in (1, 2, 3):
+            dirty.add_holding(pk, None)
+
+        with mock.patch.object(
+            SchemaOrchestrationService,
+            "_recompute_holdings",
+            side_effect=[RuntimeError("boom"), None, None],
+        ) as recompute, mock.patch.object(
+            SchemaOrchestrationService, "_load_holdings", side_effect=lambda ids: ids
+        ), self.assertLogs("schemas.services.orchestration", level="ERROR"):
+            SchemaOrchestrationService.flush(dirty)
+
+        self.assertEqual([call.args[0] for call in recompute.call_args_list], [[1], [2], [3]])
+
+
+class SchemaEngineQueryTests(TestCase):
+    def setUp(self):
+        FXCurrency.objects.get_or_create(code="USD", defaults={"name": "US Dollar", "is_active": True})
+        Country.objects.get_or_create(code="US", defaults={"name": "United States", "is_active": True})
+        Plan.objects.get_or_create(slug="free", defaults={"name": "Free", "tier": Plan.Tier.FREE, "is_active": True})
+        equity_type, _ = AssetType.objects.get_or_create(name="Equity", created_by=None)
+
+        user = User.objects.create_user(email="schema-engine-queries@example.com", password="StrongPass123!")
+        ProfileBootstrapService.bootstrap(user=user)
+        portfolio = Portfolio.objects.get(profile=user.profile, kind=Portfolio.Kind.PERSONAL)
+        account_type = AccountType.objects.create(
+            name="Schema Engine Brokerage",
+            slug="schema-engine-brokerage",
+            is_system=True,
+        )
+        account_type.allowed_asset_types.add(equity_type)
+        account = Account.objects.create(portfolio=portfolio, name="Main", account_type=account_type)
+
+        self.holding_ids = []
+        for index in range(6):
+            asset = CustomAssetService.create(
+                profile=user.profile,
+                name=f"Asset {index}",
+                asset_type_slug="equity",
+                currency_code="USD",
+            ).asset
+            AssetPrice.objects.create(asset=asset, price=Decimal(10 + index))
+            self.holding_ids.append(Holding.objects.create(account=account, asset=asset, quantity="2").pk)
+
+        # Built by hand: the bootstrap master constraints do not load on sqlite.
+        self.schema, _ = Schema.objects.get_or_create(portfolio=portfolio, asset_type=equity_type)
+        for order, (identifier, source, source_field) in enumerate(
+            [
+                ("quantity", "holding", "quantity"),
+                ("price", "asset", "price__price"),
+                ("currency", "asset", "extension__currency__code"),
+            ],
+            start=1,
+        ):
+            column = SchemaColumn.objects.create(
+                schema=self.schema,
+                identifier=identifier,
+                title=identifier.title(),
+                data_type="string" if identifier == "currency" else "decimal",
+                display_order=order,
+            )
+            SchemaColumnAssetBehaviour.objects.create(
+                column=column,
+                asset_type=equity_type,
+                source=source,
+                source_field=source_field,
+            )
+
+    def _sync(self, holding_ids):
+        holdings = list(SchemaOrchestrationService._load_holdings(holding_ids))
+        SchemaEngine(self.schema).sync_scvs_for_holdings(holdings)
+
+    def test_bulk_sync_query_count_does_not_grow_with_holdings(self):
+        self._sync(self.holding_ids)
+
+        with CaptureQueriesContext(connection) as two:
+            self._sync(self.holding_ids[:2])
+        with CaptureQueriesContext(connection) as six:
+            self._sync(self.holding_ids)
+
+        self.assertEqual(len(six), len(two))
+
+    def test_unchanged_values_are_not_rewritten(self):
+        self._sync(self.holding_ids)
+        stamps = dict(
+            SchemaColumnValue.objects.filter(holding_id__in=self.holding_ids).values_list("pk", "updated_at")
+        )
+
+        with self.assertNumQueries(11):
+            self._sync(self.holding_ids)
+
+        self.assertTrue(stamps)
+        self.assertEqual(
+            dict(SchemaColumnValue.objects.filter(holding_id__in=self.holding_ids).values_list("pk", "updated_at")),
+            stamps,
+        )